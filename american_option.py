@@ -1,5 +1,7 @@
+import numpy as np
 import QuantLib as ql
 from european_option import EuropeanOption
+from hedging.lattice import BinomialLatticeEngine
 
 
 class AmericanOption(EuropeanOption):
@@ -25,3 +27,45 @@ class AmericanOption(EuropeanOption):
     def model(self):
         return ql.BinomialVanillaEngine(self.process, "crr", 200)
 
+    @classmethod
+    def price_many(cls, options, spot=100, vol=0.1, rfr=0.02, div=0, steps=200, tree='crr'):
+        """Price a book of American options, e.g. a strike ladder, in one
+        batched lattice pass instead of one QuantLib engine per option."""
+        today = ql.Date().todaysDate()
+        day_count = ql.Actual365Fixed()
+        earliest_times = [
+            max(day_count.yearFraction(today, option.earliest_date), 0)
+            for option in options
+        ]
+        return batch_lattice_prices(
+            options, spot, vol, rfr, div, steps, tree,
+            earliest_times=earliest_times
+        )
+
+
+def batch_lattice_prices(options, spot, vol, rfr, div, steps, tree, **exercise):
+    """Lattice prices of root options, batching vanilla and binary payoffs
+    separately as they need different terminal payoffs."""
+    today = ql.Date().todaysDate()
+    day_count = ql.Actual365Fixed()
+    rights = np.array([option.right for option in options])
+    strikes = np.array([option.strike for option in options], dtype=float)
+    taus = np.array([
+        day_count.yearFraction(today, option.maturity) for option in options
+    ])
+    binary = np.array([
+        isinstance(option.payoff, ql.CashOrNothingPayoff) for option in options
+    ], dtype=bool)
+    engine = BinomialLatticeEngine(steps=steps, tree=tree)
+
+    prices = np.empty(len(options))
+    for is_binary in (False, True):
+        idx = np.flatnonzero(binary == is_binary)
+        if not idx.size:
+            continue
+        prices[idx] = engine.price_many(
+            rights[idx], spot, strikes[idx], vol, rfr, div, taus[idx],
+            cash=1 if is_binary else None,
+            **{name: np.asarray(value)[idx] for name, value in exercise.items()}
+        )
+    return prices
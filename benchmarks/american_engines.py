@@ -0,0 +1,89 @@
+"""
+Speed against accuracy of the American option engines.
+
+Prices a strip of one year American puts across spots and vols with each
+engine and reports the time per price and the largest and mean absolute
+error against a 2000 x 2000 finite difference reference.
+
+Run from the repository root with:
+    python -m benchmarks.american_engines
+"""
+import datetime
+import logging
+import time
+import numpy as np
+from hedging.options import AmericanOption
+from hedging.options import AmericanPutOption
+
+logger = logging.getLogger(__name__)
+
+SPOTS = [80., 90., 100., 110., 120.]
+VOLS = [0.1, 0.2, 0.4]
+RFR = 0.05
+DIV = 0.01
+REFERENCE_GRID = {'time_steps': 2000, 'spot_steps': 2000, 'tree': 'crr'}
+
+# (label, engine, grid_params, mc_params)
+ENGINES = [
+    ('MC 10k paths', AmericanOption.MONTE_CARLO, None,
+     {'steps': 50, 'num_paths': 10000, 'rng': 'pseudorandom', 'seed': 42}),
+    ('FD 100x100', AmericanOption.FINITE_DIFFERENCE,
+     {'time_steps': 100, 'spot_steps': 100, 'tree': 'crr'}, None),
+    ('FD 200x200', AmericanOption.FINITE_DIFFERENCE, None, None),
+    ('CRR 200', AmericanOption.BINOMIAL, None, None),
+    ('CRR 1000', AmericanOption.BINOMIAL,
+     {'time_steps': 1000, 'spot_steps': 200, 'tree': 'crr'}, None),
+    ('LR 201', AmericanOption.BINOMIAL,
+     {'time_steps': 201, 'spot_steps': 200, 'tree': 'lr'}, None),
+    ('NumPy CRR 200', AmericanOption.NUMPY_BINOMIAL, None, None),
+    ('NumPy LR 201', AmericanOption.NUMPY_BINOMIAL,
+     {'time_steps': 201, 'spot_steps': 200, 'tree': 'lr'}, None),
+    ('BAW', AmericanOption.BARONE_ADESI_WHALEY, None, None),
+    ('BjS', AmericanOption.BJERKSUND_STENSLAND, None, None),
+]
+
+
+def put(engine, grid_params=None, mc_params=None):
+    return AmericanPutOption(
+        asset_name='Asset',
+        strike=100,
+        maturity=datetime.date.today() + datetime.timedelta(days=365),
+        pricing_engine=engine,
+        earliest_date=datetime.date.today(),
+        mc_params=mc_params,
+        grid_params=grid_params
+    )
+
+
+def strip_prices(option):
+    """Prices over the spot x vol strip and seconds per price."""
+    spots, vols = np.meshgrid(SPOTS, VOLS, indexing='ij')
+    start = time.perf_counter()
+    prices = option.price_many(spots, vols, RFR, DIV)
+    return prices, (time.perf_counter() - start) / prices.size
+
+
+def engine_table():
+    """{label: (seconds per price, max abs error, mean abs error)}"""
+    reference, _ = strip_prices(put(
+        AmericanOption.FINITE_DIFFERENCE, grid_params=REFERENCE_GRID
+    ))
+    table = {}
+    for label, engine, grid_params, mc_params in ENGINES:
+        prices, seconds = strip_prices(put(engine, grid_params, mc_params))
+        errors = np.abs(prices - reference)
+        table[label] = (seconds, errors.max(), errors.mean())
+    return table
+
+
+def main():
+    logger.info(f"{'engine':>14} {'ms/price':>10} {'max error':>10} {'mean error':>11}")
+    for label, (seconds, max_error, mean_error) in engine_table().items():
+        logger.info(
+            f"{label:>14} {seconds * 1e3:>10.3f} {max_error:>10.5f} {mean_error:>11.5f}"
+        )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmarks registered with the suite, see benchmarks.suite.
+
+Option pricing benchmarks time the per-scenario _price path over a fixed set
+of spots, the engines people call in the overnight run. Sizes are kept small
+enough for the whole suite to run in about a minute.
+"""
+import datetime
+import numpy as np
+from benchmarks.import_time import cold_import
+from benchmarks.suite import register
+from hedging import hedge_using_classes
+from hedging import pla_stats
+from hedging import scenario_generator
+from hedging.options import AmericanOption
+from hedging.options import AmericanPutOption
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+
+VOL = 0.2
+RFR = 0.03
+DIV = 0.01
+MC_PARAMS = {'steps': 10, 'num_paths': 2000, 'rng': 'pseudorandom', 'seed': 42}
+SHOCK_COUNTS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+COLD_IMPORTS = ['hedging.options', 'hedging.batch']
+
+# (engine, scenarios priced per call)
+EUROPEAN_ENGINES = [
+    (EuropeanOption.ANALYTICAL, 500),
+    (EuropeanOption.MONTE_CARLO, 10),
+    (EuropeanOption.NUMPY_MONTE_CARLO, 100),
+]
+AMERICAN_ENGINES = [
+    (AmericanOption.MONTE_CARLO, 2),
+    (AmericanOption.FINITE_DIFFERENCE, 50),
+    (AmericanOption.BINOMIAL, 50),
+    (AmericanOption.BARONE_ADESI_WHALEY, 500),
+    (AmericanOption.BJERKSUND_STENSLAND, 500),
+    (AmericanOption.NUMPY_BINOMIAL, 50),
+]
+
+
+def one_year():
+    return datetime.date.today() + datetime.timedelta(days=365)
+
+
+def spots(n_scenarios, seed=0):
+    return 100 * np.exp(0.1 * np.random.default_rng(seed).standard_normal(n_scenarios))
+
+
+def price_loop(option, n_scenarios):
+    scenario_spots = spots(n_scenarios).tolist()
+
+    def run():
+        for spot in scenario_spots:
+            option._price(spot, VOL, RFR, DIV)
+    return run
+
+
+def register_european(engine, n_scenarios):
+    @register(f'european_price.{engine}', items=n_scenarios)
+    def setup():
+        return price_loop(EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=one_year(),
+            pricing_engine=engine,
+            mc_params=dict(MC_PARAMS)
+        ), n_scenarios)
+
+
+def register_american(engine, n_scenarios):
+    @register(f'american_price.{engine}', items=n_scenarios, repeat=1)
+    def setup():
+        return price_loop(AmericanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=one_year(),
+            pricing_engine=engine,
+            earliest_date=datetime.date.today(),
+            mc_params={'steps': 50, 'num_paths': 2000, 'rng': 'pseudorandom', 'seed': 42}
+        ), n_scenarios)
+
+
+def register_shocks(num_shocks):
+    @register(
+        f'log_normal_shocks.{num_shocks:.0e}', items=num_shocks,
+        repeat=1 if num_shocks >= 10 ** 6 else 3
+    )
+    def setup():
+        return lambda: scenario_generator.generate_log_normal_shocks(
+            VOL, num_shocks=num_shocks
+        )
+
+
+for _engine, _n_scenarios in EUROPEAN_ENGINES:
+    register_european(_engine, _n_scenarios)
+for _engine, _n_scenarios in AMERICAN_ENGINES:
+    register_american(_engine, _n_scenarios)
+for _num_shocks in SHOCK_COUNTS:
+    register_shocks(_num_shocks)
+
+
+def register_cold_import(module):
+    # Times a fresh interpreter importing module, a worker's start-up cost
+    @register(f'import_time.{module}')
+    def setup():
+        return lambda: cold_import(module, repeat=1)
+
+
+for _module in COLD_IMPORTS:
+    register_cold_import(_module)
+
+
+@register('pla_stats.single', items=1)
+def pla_stats_single():
+    rng = np.random.default_rng(0)
+    fo_pnl = rng.standard_normal(780)
+    risk_pnl = fo_pnl + 0.1 * rng.standard_normal(780)
+    return lambda: pla_stats.pla_stats(fo_pnl, risk_pnl)
+
+
+@register('pla_stats.many', items=1000)
+def pla_stats_many():
+    rng = np.random.default_rng(0)
+    fo_pnl = rng.standard_normal((1000, 780))
+    risk_pnl = fo_pnl + 0.1 * rng.standard_normal((1000, 780))
+    return lambda: pla_stats.pla_stats_many(fo_pnl, risk_pnl)
+
+
+@register('hedging_example.sensitivities', items=1000)
+def hedging_example_sensitivities():
+    return lambda: hedge_using_classes.hedge_ratio_stats(
+        risk_model=hedge_using_classes.SENSITIVITIES,
+        num_shocks=1000,
+        maturity=one_year()
+    )
+
+
+@register('hedging_example.full_revaluation', items=10, repeat=1)
+def hedging_example_full_revaluation():
+    return lambda: hedge_using_classes.hedge_ratio_stats(
+        risk_model=hedge_using_classes.FULL_REVALUATION,
+        num_shocks=10,
+        maturity=one_year(),
+        n_workers=1
+    )
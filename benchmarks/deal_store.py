@@ -0,0 +1,115 @@
+"""
+Memory and throughput of the columnar deal store against the object book.
+
+Builds books of 1M and 10M deals, reporting traced memory, bulk load time,
+per-instrument aggregation and counterparty lookup times, plus snapshot save
+and memory-mapped startup times for the columnar book. The object based
+Portfolio is only built at the smaller sizes, its memory grows past a few GB
+at 10M deals.
+
+Run from the repository root with:
+    python -m benchmarks.deal_store [n_deals ...]
+"""
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from hedging.deal_store import CompactPortfolio
+from hedging.portfolio_object import Deal
+from hedging.portfolio_object import Portfolio
+
+logger = logging.getLogger(__name__)
+
+DEAL_COUNTS = [1000000, 10000000]
+OBJECT_BOOK_LIMIT = 1000000
+N_INSTRUMENTS = 500
+N_COUNTERPARTIES = 2000
+
+
+def random_deals(n_deals, seed=0):
+    rng = np.random.default_rng(seed)
+    instruments = np.char.add('INSTR', rng.integers(N_INSTRUMENTS, size=n_deals).astype(str))
+    counterparties = np.char.add('CPTY', rng.integers(N_COUNTERPARTIES, size=n_deals).astype(str))
+    quantities = rng.integers(-100, 100, size=n_deals).astype(float)
+    creation_times = np.sort(rng.integers(
+        1.6e15, 1.7e15, size=n_deals, dtype=np.int64
+    ))
+    return instruments, quantities, counterparties, creation_times
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_compact(deals):
+    tracemalloc.start()
+    compact = CompactPortfolio()
+    _, load_time = timed(compact.store.extend, *deals)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _, positions_time = timed(compact.positions)
+    timed(compact.store.ids_with_counterparty, 'CPTY0')
+    _, lookup_time = timed(compact.store.ids_with_counterparty, 'CPTY1')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'book.snap')
+        _, save_time = timed(compact.save_snapshot, path)
+        loaded, startup_time = timed(CompactPortfolio.load_snapshot, path)
+        _, positions_time_loaded = timed(loaded.positions)
+        del loaded
+    logger.info(
+        f"snapshot {compact.deal_counter:>9} deals: save {save_time * 1e3:8.1f} ms, "
+        f"startup {startup_time * 1e3:6.2f} ms, "
+        f"first positions after startup {positions_time_loaded * 1e3:8.1f} ms"
+    )
+    return memory, load_time, positions_time, lookup_time
+
+
+def bench_objects(deals):
+    instruments, quantities, counterparties, creation_times = deals
+    epoch = datetime.datetime(1970, 1, 1)
+    tracemalloc.start()
+    start = time.perf_counter()
+    portfolio = Portfolio()
+    for instrument, quantity, counterparty, timestamp in zip(
+            instruments.tolist(), quantities.tolist(),
+            counterparties.tolist(), creation_times.tolist()
+    ):
+        portfolio.add_deal(Deal(
+            instrument=instrument,
+            quantity=quantity,
+            counterparty=counterparty,
+            creation_time=epoch + datetime.timedelta(microseconds=timestamp)
+        ))
+    load_time = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _, positions_time = timed(portfolio.positions)
+    _, lookup_time = timed(portfolio.deals_with_counterparty, 'CPTY1')
+    return memory, load_time, positions_time, lookup_time
+
+
+def main(deal_counts):
+    for n_deals in deal_counts:
+        deals = random_deals(n_deals)
+        books = [('compact', bench_compact)]
+        if n_deals <= OBJECT_BOOK_LIMIT:
+            books.append(('objects', bench_objects))
+        for name, bench in books:
+            memory, load_time, positions_time, lookup_time = bench(deals)
+            logger.info(
+                f"{name:>8} {n_deals:>9} deals: {memory / n_deals:7.1f} bytes/deal, "
+                f"load {n_deals / load_time:12,.0f} deals/s, "
+                f"positions {positions_time * 1e3:8.1f} ms, "
+                f"counterparty lookup {lookup_time * 1e3:7.2f} ms"
+            )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    main([int(arg) for arg in sys.argv[1:]] or DEAL_COUNTS)
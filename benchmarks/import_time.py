@@ -0,0 +1,80 @@
+"""
+Cold start cost of the hedging modules.
+
+Each module is imported in a fresh interpreter, as a newly spawned pricing
+worker would, and the best of a few runs is reported along with the whole
+process wall time and which heavy optional packages the import pulled in.
+
+Run from the repository root with:
+    python -m benchmarks.import_time
+"""
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+MODULES = [
+    'numpy',
+    'QuantLib',
+    'hedging.options',
+    'hedging.scenario_generator',
+    'hedging.pla_stats',
+    'hedging.hedge_using_classes',
+    'hedging.batch',
+    'hedging.plotting',
+]
+HEAVY_PACKAGES = ['scipy', 'matplotlib', 'pandas']
+REPEAT = 5
+
+ImportTime = namedtuple(
+    'ImportTime', ['module', 'import_time', 'process_time', 'heavy_packages']
+)
+
+_IMPORT_SCRIPT = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, *[p for p in {heavy!r} if p in sys.modules])\n"
+)
+
+
+def cold_import(module, repeat=REPEAT):
+    """Best import and process wall times of module over fresh interpreters."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = _IMPORT_SCRIPT.format(module=module, heavy=HEAVY_PACKAGES)
+    import_time = process_time = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=root, check=True,
+            capture_output=True, text=True
+        ).stdout.split()
+        process_time = min(process_time, time.perf_counter() - start)
+        import_time = min(import_time, float(output[0]))
+    return ImportTime(
+        module=module,
+        import_time=import_time,
+        process_time=process_time,
+        heavy_packages=output[1:]
+    )
+
+
+def main():
+    logger.info(f"{'module':<30} {'import ms':>10} {'process ms':>11}  heavy imports")
+    for module in MODULES:
+        result = cold_import(module)
+        logger.info(
+            f"{module:<30} {result.import_time * 1e3:>10.1f} "
+            f"{result.process_time * 1e3:>11.1f}  "
+            f"{', '.join(result.heavy_packages) or '-'}"
+        )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark repricing through a PricingSession against the per-call _price path.
+
+Run from the repository root with:
+    python -m benchmarks.pricing_session
+"""
+import datetime
+import logging
+import time
+import numpy as np
+from hedging.options import AmericanCallOption
+from hedging.options import AmericanOption
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+
+logger = logging.getLogger(__name__)
+
+
+def time_per_scenario(price_func, spots, vol, rfr, div):
+    """Average seconds per scenario for price_func(spot, vol, rfr, div)."""
+    start = time.perf_counter()
+    for spot in spots:
+        price_func(spot, vol, rfr, div)
+    return (time.perf_counter() - start) / len(spots)
+
+
+def compare(option, spots, vol=0.1, rfr=0.02, div=0):
+    session = option.pricing_session(spot=spots[0], vol=vol, rfr=rfr, div=div)
+    per_call = time_per_scenario(option._price, spots, vol, rfr, div)
+    per_session = time_per_scenario(session.price, spots, vol, rfr, div)
+    logger.info(
+        f'{type(option).__name__} {option.pricing_engine}: '
+        f'_price {per_call * 1e3:.3f} ms, session {per_session * 1e3:.3f} ms '
+        f'per scenario ({per_call / per_session:.1f}x).'
+    )
+    return per_call, per_session
+
+
+def main():
+    maturity = datetime.date.today() + datetime.timedelta(days=365)
+    mc_params = {'steps': 10, 'num_paths': 2000, 'rng': 'pseudorandom'}
+    spots = 100 * np.exp(0.1 * np.random.normal(size=2000))
+
+    compare(
+        EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=maturity,
+            pricing_engine=EuropeanOption.ANALYTICAL
+        ),
+        spots
+    )
+    compare(
+        EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=maturity,
+            pricing_engine=EuropeanOption.MONTE_CARLO,
+            mc_params=mc_params
+        ),
+        spots[:100]
+    )
+    compare(
+        AmericanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=maturity,
+            pricing_engine=AmericanOption.MONTE_CARLO,
+            earliest_date=datetime.date.today(),
+            mc_params=mc_params
+        ),
+        spots[:20]
+    )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    main()
@@ -0,0 +1,105 @@
+"""
+Convergence of the shock sampling methods for VaR and mean estimates.
+
+The portfolio is a long one year ATM call revalued analytically under each
+shock. The call is increasing in spot, so its 99% VaR is the P&L at the 1%
+spot quantile and is known exactly, as is the mean shock exp(vol**2 / 2).
+The RMSE of each estimate over repeated seeds is reported per method and
+shock count, along with how many fewer shocks each method needs to match
+pseudorandom accuracy at the largest count.
+
+Run from the repository root with:
+    python -m benchmarks.shock_convergence
+"""
+import logging
+import numpy as np
+from scipy.special import ndtri
+from hedging import black_scholes
+from hedging import scenario_generator
+
+logger = logging.getLogger(__name__)
+
+SPOT = 100
+VOL = 0.2
+RFR = 0.02
+CONFIDENCE = 0.99
+SHOCK_COUNTS = [256, 1024, 4096, 16384]
+REPEATS = 200
+
+
+def call_pnl(shocks):
+    base_npv = black_scholes.vanilla_price(1, SPOT, SPOT, VOL, RFR, 0, 1)
+    return black_scholes.vanilla_price(
+        1, SPOT * shocks, SPOT, VOL, RFR, 0, 1
+    ) - base_npv
+
+
+def convergence_table(methods=None, shock_counts=None, repeats=REPEATS):
+    """RMSE of the VaR and mean shock estimates per (method, shock count).
+
+    :return dict: {(method, num_shocks): (var_rmse, mean_rmse)}
+    """
+    methods = methods or scenario_generator.SHOCK_METHODS
+    shock_counts = shock_counts or SHOCK_COUNTS
+    true_var = -call_pnl(np.exp(VOL * ndtri(1 - CONFIDENCE)))
+    true_mean = np.exp(0.5 * VOL ** 2)
+
+    table = {}
+    for method in methods:
+        for num_shocks in shock_counts:
+            var_errors = np.empty(repeats)
+            mean_errors = np.empty(repeats)
+            for seed in range(repeats):
+                if method == scenario_generator.PSEUDORANDOM:
+                    np.random.seed(seed)
+                shocks = scenario_generator.generate_log_normal_shocks(
+                    VOL, num_shocks=num_shocks, method=method, seed=seed
+                )
+                var_errors[seed] = -np.quantile(
+                    call_pnl(shocks), 1 - CONFIDENCE
+                ) - true_var
+                mean_errors[seed] = shocks.mean() - true_mean
+            table[method, num_shocks] = (
+                np.sqrt(np.mean(var_errors ** 2)),
+                np.sqrt(np.mean(mean_errors ** 2))
+            )
+    return table
+
+
+def shock_reduction(table, shock_counts=None, metric=0):
+    """Shock count reduction at equal accuracy versus pseudorandom.
+
+    Error is assumed to fall as a power law between measured counts; the
+    pseudorandom error at the largest count is the target.
+    """
+    shock_counts = shock_counts or SHOCK_COUNTS
+    target = table[scenario_generator.PSEUDORANDOM, shock_counts[-1]][metric]
+    methods = sorted({method for method, _ in table})
+    methods.remove(scenario_generator.PSEUDORANDOM)
+    reductions = {}
+    for method in methods:
+        errors = np.array([table[method, n][metric] for n in shock_counts])
+        slope, intercept = np.polyfit(np.log(shock_counts), np.log(errors), 1)
+        needed = np.exp((np.log(target) - intercept) / slope)
+        reductions[method] = shock_counts[-1] / needed
+    return reductions
+
+
+def main():
+    table = convergence_table()
+    logger.info(f"{'method':>16} {'shocks':>7} {'VaR RMSE':>10} {'mean RMSE':>10}")
+    for (method, num_shocks), (var_rmse, mean_rmse) in table.items():
+        logger.info(
+            f"{method:>16} {num_shocks:>7} {var_rmse:>10.5f} {mean_rmse:>10.6f}"
+        )
+    for metric, name in [(0, 'VaR'), (1, 'mean')]:
+        for method, reduction in shock_reduction(table, metric=metric).items():
+            logger.info(
+                f"{name}: {method} needs {reduction:.1f}x fewer shocks than "
+                f"pseudorandom for equal accuracy."
+            )
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    main()
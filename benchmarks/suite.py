@@ -0,0 +1,231 @@
+"""
+Benchmark suite with stored baselines.
+
+Every registered benchmark returns the callable to time, so set-up is left
+out of the measurement. Each callable is timed over a few repeats, keeping
+the best wall time, then run once more under tracemalloc for its peak
+Python heap. tracemalloc does not see QuantLib's C++ or other native
+allocations, so the process's peak resident set size is recorded alongside;
+it is a high-water mark over the whole run and only grows from one
+benchmark to the next, so it is reported but not compared.
+
+Results are saved to a JSON baseline and later runs are compared against
+it, flagging any wall time or Python heap peak that grew by more than the
+threshold and by more than the metric's noise floor. The reference baseline
+is committed as benchmarks/baseline.json together with the machine, Python
+and NumPy versions it was taken on. Timings only compare on like hardware,
+so refresh it with --save on the machine that gates releases and commit it
+with the change that moved the numbers; use --baseline for a local one.
+
+Run from the repository root with:
+    python -m benchmarks.suite [--filter NAME] [--save] [--baseline PATH]
+        [--threshold 0.2] [--repeat 3]
+
+The exit status is 1 when a regression is flagged, so the suite can gate a
+release.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from collections import namedtuple
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, max RSS is then not recorded
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+THRESHOLD = 0.2
+METRICS = ['wall_time', 'peak_memory']
+# Absolute changes below these are noise, whatever their relative size
+NOISE_FLOORS = {'wall_time': 0.005, 'peak_memory': 2 ** 20}
+
+Benchmark = namedtuple('Benchmark', ['setup', 'items', 'repeat'])
+BenchmarkResult = namedtuple(
+    'BenchmarkResult',
+    ['name', 'wall_time', 'peak_memory', 'throughput', 'max_rss']
+)
+Regression = namedtuple(
+    'Regression', ['name', 'metric', 'baseline', 'current', 'change']
+)
+
+BENCHMARKS = OrderedDict()
+
+
+def register(name, items=1, repeat=3):
+    """Register a set-up function returning the zero argument callable to time.
+
+    :param str name: Dotted benchmark name
+    :param int items: Units of work per call, throughput is items / second
+    :param int repeat: Timed calls, the fastest is kept
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(setup=setup, items=items, repeat=repeat)
+        return setup
+    return decorator
+
+
+def max_rss():
+    """Peak resident set size of this process in bytes, None if unknown."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def run_benchmark(name, repeat=None):
+    benchmark = BENCHMARKS[name]
+    func = benchmark.setup()
+    wall_time = np.inf
+    for _ in range(repeat or benchmark.repeat):
+        start = time.perf_counter()
+        func()
+        wall_time = min(wall_time, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(
+        name=name,
+        wall_time=wall_time,
+        peak_memory=peak_memory,
+        throughput=benchmark.items / wall_time,
+        max_rss=max_rss()
+    )
+
+
+def run_suite(name_filter=None, repeat=None):
+    results = []
+    for name in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        result = run_benchmark(name, repeat=repeat)
+        logger.info(
+            f"{name:<45} {result.wall_time * 1e3:>11.3f} ms "
+            f"{result.peak_memory / 2 ** 20:>9.2f} MiB "
+            f"{result.throughput:>14,.1f} items/s "
+            f"{(result.max_rss or 0) / 2 ** 20:>9.1f} MiB"
+        )
+        results.append(result)
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Write results, merged into any existing baseline, to path as JSON."""
+    baseline = load_baseline(path) if os.path.exists(path) else {}
+    baseline.update({
+        result.name: result._asdict() for result in results
+    })
+    document = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'benchmarks': baseline
+    }
+    with open(path, 'w') as baseline_file:
+        json.dump(document, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """{name: {metric: value}} from a baseline file."""
+    with open(path) as baseline_file:
+        return json.load(baseline_file)['benchmarks']
+
+
+def compare(results, baseline, threshold=THRESHOLD, floors=None):
+    """Regressions of results against a baseline.
+
+    :param float threshold: Relative increase in wall time or peak Python
+        heap that counts as a regression
+    :param dict floors: {metric: absolute increase below which a change is
+        noise}, NOISE_FLOORS by default
+    :return list: Regression tuples, empty when nothing regressed
+    """
+    floors = NOISE_FLOORS if floors is None else floors
+    regressions = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        for metric in METRICS:
+            previous = baseline[result.name][metric]
+            current = getattr(result, metric)
+            if previous > 0 and current > previous * (1 + threshold) \
+                    and current - previous > floors.get(metric, 0):
+                regressions.append(Regression(
+                    name=result.name,
+                    metric=metric,
+                    baseline=previous,
+                    current=current,
+                    change=current / previous - 1
+                ))
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', help='Only run benchmarks containing this')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true',
+                        help='Store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--repeat', type=int, default=None)
+    parser.add_argument('--list', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    # Importing the cases registers them
+    from benchmarks import cases  # noqa: F401
+
+    args = parse_args(argv)
+    if args.list:
+        for name in BENCHMARKS:
+            logger.info(name)
+        return 0
+    logger.info(
+        f"{'benchmark':<45} {'wall time':>14} {'py heap peak':>13} "
+        f"{'throughput':>22} {'max rss':>13}"
+    )
+    results = run_suite(name_filter=args.filter, repeat=args.repeat)
+
+    status = 0
+    if os.path.exists(args.baseline):
+        regressions = compare(
+            results, load_baseline(args.baseline), args.threshold
+        )
+        for regression in regressions:
+            logger.warning(
+                f"REGRESSION {regression.name} {regression.metric}: "
+                f"{regression.baseline:.6g} -> {regression.current:.6g} "
+                f"(+{regression.change:.0%})"
+            )
+        if regressions and not args.save:
+            status = 1
+        elif not regressions:
+            logger.info(f"No regressions over {args.threshold:.0%} against {args.baseline}.")
+    if args.save:
+        save_baseline(results, args.baseline)
+        logger.info(f"Baseline saved to {args.baseline}.")
+    return status
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    # Run from the importable module, the registry benchmarks.cases fills
+    from benchmarks import suite
+    sys.exit(suite.main())
@@ -1,9 +1,16 @@
+import numpy as np
 import QuantLib as ql
 from european_option import EuropeanOption
+from american_option import batch_lattice_prices
+from hedging.longstaff_schwartz import LongstaffSchwartzEngine
+
+LATTICE = 'lattice'
+LONGSTAFF_SCHWARTZ = 'longstaff_schwartz'
 
 
 class BermudanOption(EuropeanOption):
-    def __init__(self, asset_name, strike, maturity, right, payoff, start_date=ql.Date().todaysDate()):
+    def __init__(self, asset_name, strike, maturity, right, payoff, start_date=ql.Date().todaysDate(),
+                 exercise_dates=None):
         super().__init__(
             asset_name=asset_name,
             strike=strike,
@@ -12,15 +19,79 @@ class BermudanOption(EuropeanOption):
             payoff=payoff
         )
         self.start_date = start_date
+        self._exercise_dates = exercise_dates
 
     @property
     def starting_date(self):
         return self.start_date or ql.Date().todaysDate()
 
+    @property
+    def exercise_dates(self):
+        """Explicit exercise dates, or quarterly from the start date to maturity."""
+        if self._exercise_dates is not None:
+            return sorted(self._exercise_dates)
+        dates = []
+        date = self.starting_date
+        while date < self.maturity:
+            dates.append(date)
+            date = date + ql.Period(3, ql.Months)
+        return dates + [self.maturity]
+
     @property
     def exercise_type(self):
-        return ql.BermudanExercise(self.starting_date, self.maturity)
+        return ql.BermudanExercise(self.exercise_dates)
 
     @property
     def model(self):
-        return ql.BinomialVanillaEngine(self.process, "crr", 200)
\ No newline at end of file
+        return ql.BinomialVanillaEngine(self.process, "crr", 200)
+
+    def price(self, num_paths=100000, seed=42):
+        """Longstaff-Schwartz price on the exercise date schedule."""
+        return self.price_many(
+            [self], engine=LONGSTAFF_SCHWARTZ, num_paths=num_paths, seed=seed
+        )[0]
+
+    @classmethod
+    def price_many(cls, options, spot=100, vol=0.1, rfr=0.02, div=0, steps=200, tree='crr',
+                   engine=LATTICE, num_paths=100000, seed=42):
+        """Price a book of Bermudan options on one underlying in one pass.
+
+        The lattice engine rolls every option back in one batched tree, the
+        Longstaff-Schwartz engine prices them all on one set of simulated
+        paths. Options with fewer exercise dates have their rows padded with
+        NaN.
+        """
+        today = ql.Date().todaysDate()
+        day_count = ql.Actual365Fixed()
+        schedules = [
+            [day_count.yearFraction(today, date) for date in option.exercise_dates]
+            for option in options
+        ]
+        exercise_times = np.full(
+            (len(options), max(len(times) for times in schedules)), np.nan
+        )
+        for row, times in enumerate(schedules):
+            exercise_times[row, :len(times)] = times
+
+        if engine == LONGSTAFF_SCHWARTZ:
+            lsm_engine = LongstaffSchwartzEngine(num_paths=num_paths, seed=seed)
+            prices = np.empty(len(options))
+            binary = np.array([
+                isinstance(option.payoff, ql.CashOrNothingPayoff) for option in options
+            ], dtype=bool)
+            for is_binary in (False, True):
+                idx = np.flatnonzero(binary == is_binary)
+                if idx.size:
+                    prices[idx] = lsm_engine.price_many(
+                        [options[i].right for i in idx],
+                        [options[i].strike for i in idx],
+                        spot, vol, rfr, div, exercise_times[idx],
+                        cash=1 if is_binary else None
+                    )
+            return prices
+        elif engine != LATTICE:
+            raise RuntimeError(f"Engine must be either '{LATTICE}' or '{LONGSTAFF_SCHWARTZ}', not {engine}.")
+        return batch_lattice_prices(
+            options, spot, vol, rfr, div, steps, tree,
+            exercise_times=exercise_times
+        )
@@ -0,0 +1,157 @@
+"""
+Headless batch pricing for short lived workers.
+
+Prices one option over a file of market scenarios and writes the prices
+out. Only NumPy, QuantLib and the pricing modules are imported: plotting
+lives in hedging.plotting and scipy is only loaded by the code paths that
+need it, so a cold worker starts in a fraction of a second and never
+touches a GUI backend.
+
+Scenarios are rows of spot, vol, rfr, div, as a .npy array or a comma
+separated file with an optional header row. Run with:
+    python -m hedging.batch scenarios.csv prices.csv --option european_call
+        --strike 100 --maturity 2027-06-30 --engine ANALYTICAL
+"""
+import argparse
+import datetime
+import logging
+import sys
+import time
+import numpy as np
+from hedging import options
+from hedging import tracing
+
+logger = logging.getLogger(__name__)
+
+OPTION_TYPES = {
+    'european_call': options.EuropeanCallOption,
+    'european_put': options.EuropeanPutOption,
+    'binary_call': options.EuropeanBinaryCallOption,
+    'binary_put': options.EuropeanBinaryPutOption,
+    'american_call': options.AmericanCallOption,
+    'american_put': options.AmericanPutOption,
+}
+SCENARIO_COLUMNS = ['spot', 'vol', 'rfr', 'div']
+
+
+def load_scenarios(path):
+    """(n_scenarios, 4) array of spot, vol, rfr, div rows from .npy or csv."""
+    if path.endswith('.npy'):
+        scenarios = np.load(path)
+    else:
+        scenarios = np.genfromtxt(path, delimiter=',', ndmin=2)
+        # A header row reads as NaNs
+        if scenarios.size and np.all(np.isnan(scenarios[0])):
+            scenarios = scenarios[1:]
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype=float))
+    if scenarios.shape[1] != len(SCENARIO_COLUMNS):
+        raise ValueError(
+            f"Scenarios need the columns {SCENARIO_COLUMNS}, "
+            f"got {scenarios.shape[1]} columns in {path}."
+        )
+    return scenarios
+
+
+def save_prices(path, prices):
+    if path.endswith('.npy'):
+        np.save(path, prices)
+    else:
+        np.savetxt(path, prices, delimiter=',', header='price', comments='')
+
+
+def create_option(
+        option_type,
+        strike,
+        maturity,
+        pricing_engine,
+        mc_params=None,
+        earliest_date=None,
+        cash_payoff=1
+):
+    """Build one of OPTION_TYPES from batch arguments.
+
+    :param str option_type: Key of OPTION_TYPES
+    :param datetime.date earliest_date: First American exercise date,
+        defaults to today
+    :param float cash_payoff: Binary option cash amount
+    """
+    if option_type not in OPTION_TYPES:
+        raise KeyError(
+            f"Unknown option type {option_type}, use one of {list(OPTION_TYPES)}."
+        )
+    option_class = OPTION_TYPES[option_type]
+    kwargs = dict(
+        asset_name='Asset',
+        strike=strike,
+        maturity=maturity,
+        pricing_engine=pricing_engine,
+        mc_params=mc_params
+    )
+    if issubclass(option_class, options.AmericanOption):
+        kwargs['earliest_date'] = earliest_date or datetime.date.today()
+    elif issubclass(option_class, options.EuropeanBinaryOption):
+        kwargs['cash_payoff'] = cash_payoff
+    return option_class(**kwargs)
+
+
+def price_scenarios(option, scenarios):
+    """Price the option over (n_scenarios, 4) spot, vol, rfr, div rows."""
+    spots, vols, rfrs, divs = np.asarray(scenarios, dtype=float).T
+    return option.price_many(spots, vols, rfrs, divs)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('scenarios', help='.npy or csv of spot, vol, rfr, div')
+    parser.add_argument('output', help='.npy or csv file for the prices')
+    parser.add_argument('--option', choices=sorted(OPTION_TYPES), required=True)
+    parser.add_argument('--strike', type=float, required=True)
+    parser.add_argument('--maturity', type=datetime.date.fromisoformat,
+                        required=True, help='YYYY-MM-DD')
+    parser.add_argument('--engine', required=True)
+    parser.add_argument('--earliest-date', type=datetime.date.fromisoformat)
+    parser.add_argument('--cash', type=float, default=1)
+    parser.add_argument('--num-paths', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--trace', help='Write collapsed span stacks here')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.trace:
+        tracing.enable()
+    option = create_option(
+        args.option,
+        strike=args.strike,
+        maturity=args.maturity,
+        pricing_engine=args.engine,
+        mc_params={
+            'steps': args.steps,
+            'num_paths': args.num_paths,
+            'rng': 'pseudorandom',
+            'seed': args.seed
+        },
+        earliest_date=args.earliest_date,
+        cash_payoff=args.cash
+    )
+    scenarios = load_scenarios(args.scenarios)
+    start = time.perf_counter()
+    prices = price_scenarios(option, scenarios)
+    logger.info(
+        f"Priced {len(prices)} scenarios with {args.engine} in "
+        f"{time.perf_counter() - start:.3f} seconds."
+    )
+    save_prices(args.output, prices)
+    if args.trace:
+        tracing.write_collapsed(args.trace)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Vectorised closed form Black-Scholes-Merton prices and Greeks.
+
+Every function broadcasts over NumPy arrays, so a whole set of scenarios is
+priced in one pass instead of building a QuantLib process per spot.
+
+Greeks follow QuantLib's conventions: vega and rho are per unit (not per
+percent) change in vol and rate, theta is the change in value per year as
+the valuation date moves forward.
+"""
+from collections import namedtuple
+import numpy as np
+
+Greeks = namedtuple('Greeks', ['delta', 'gamma', 'vega', 'theta', 'rho'])
+
+
+def norm_cdf(x):
+    # Imported on first use, scipy.special is slow to import
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x ** 2) / np.sqrt(2 * np.pi)
+
+
+def forward_and_discount(spot, rfr, div, tau):
+    """Forward price and risk free discount factor to time tau.
+
+    :param spot: Spot price(s)
+    :param rfr: Continuously compounded risk free rate(s)
+    :param div: Continuously compounded dividend yield(s)
+    :param tau: Time to maturity in years
+    :return: Tuple of (forward, discount factor) arrays
+    """
+    discount = np.exp(-np.asarray(rfr, dtype=float) * tau)
+    forward = np.asarray(spot, dtype=float) * np.exp(
+        -np.asarray(div, dtype=float) * tau
+    ) / discount
+    return forward, discount
+
+
+def d1_d2(forward, strike, vol, tau):
+    """Black d1 and d2 terms, robust to zero vol or zero time.
+
+    With no variance left d1 and d2 collapse to +/-inf (or zero at the money)
+    which makes the normal cdf terms equal to the intrinsic payoff.
+    """
+    std_dev = np.asarray(vol, dtype=float) * np.sqrt(tau)
+    log_moneyness = np.log(forward / strike)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = np.where(
+            std_dev > 0,
+            (log_moneyness + 0.5 * std_dev ** 2) / std_dev,
+            np.sign(log_moneyness) * np.inf
+        )
+    d2 = np.where(std_dev > 0, d1 - std_dev, d1)
+    return d1, d2
+
+
+def vanilla_price(call_or_put, spot, strike, vol, rfr, div, tau):
+    """Price plain vanilla European calls or puts.
+
+    :param int call_or_put: 1 for a call, -1 for a put (ql.Option.Call/Put)
+    :param spot: Spot price(s)
+    :param float strike: Strike price
+    :param vol: Black volatility(ies)
+    :param rfr: Risk free rate(s)
+    :param div: Dividend yield(s)
+    :param float tau: Time to maturity in years
+    :return np.ndarray: Option prices
+    """
+    forward, discount = forward_and_discount(spot, rfr, div, tau)
+    d1, d2 = d1_d2(forward, strike, vol, tau)
+    phi = call_or_put
+    return phi * discount * (
+        forward * norm_cdf(phi * d1) - strike * norm_cdf(phi * d2)
+    )
+
+
+def cash_or_nothing_price(call_or_put, spot, strike, vol, rfr, div, tau, cash=1):
+    """Price European cash-or-nothing (binary) calls or puts.
+
+    :param int call_or_put: 1 for a call, -1 for a put (ql.Option.Call/Put)
+    :param float cash: Amount paid if the option finishes in the money
+    :return np.ndarray: Option prices
+    """
+    forward, discount = forward_and_discount(spot, rfr, div, tau)
+    _, d2 = d1_d2(forward, strike, vol, tau)
+    return cash * discount * norm_cdf(call_or_put * d2)
+
+
+def _std_dev_terms(spot, vol, tau):
+    """sigma * sqrt(tau) and the spot and vol terms dividing by it.
+
+    Where no variance is left the divisions are replaced by infinity, which
+    the normal density terms multiplying them send to zero.
+    """
+    vol = np.asarray(vol, dtype=float)
+    std_dev = vol * np.sqrt(tau)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spot_std_dev = np.where(
+            std_dev > 0, np.asarray(spot, dtype=float) * std_dev, np.inf
+        )
+    return std_dev, spot_std_dev
+
+
+def vanilla_greeks(call_or_put, spot, strike, vol, rfr, div, tau):
+    """Delta, gamma, vega, theta and rho of European calls or puts.
+
+    Takes the same arguments as vanilla_price.
+
+    :return Greeks: Named tuple of Greek arrays
+    """
+    forward, discount = forward_and_discount(spot, rfr, div, tau)
+    d1, d2 = d1_d2(forward, strike, vol, tau)
+    spot = np.asarray(spot, dtype=float)
+    rfr = np.asarray(rfr, dtype=float)
+    div = np.asarray(div, dtype=float)
+    std_dev, spot_std_dev = _std_dev_terms(spot, vol, tau)
+    phi = call_or_put
+    div_discount = np.exp(-div * tau)
+    density = norm_pdf(d1)
+    asset_prob = norm_cdf(phi * d1)
+    strike_prob = norm_cdf(phi * d2)
+
+    delta = phi * div_discount * asset_prob
+    gamma = div_discount * density / spot_std_dev
+    vega = spot * div_discount * density * np.sqrt(tau)
+    with np.errstate(invalid='ignore'):
+        time_decay = np.where(
+            std_dev > 0, vega * np.asarray(vol, dtype=float) / (2 * tau), 0.0
+        )
+    theta = (
+        -time_decay
+        - phi * rfr * strike * discount * strike_prob
+        + phi * div * spot * div_discount * asset_prob
+    )
+    rho = phi * strike * tau * discount * strike_prob
+    return Greeks(delta, gamma, vega, theta, rho)
+
+
+def cash_or_nothing_greeks(
+        call_or_put, spot, strike, vol, rfr, div, tau, cash=1
+):
+    """Delta, gamma, vega, theta and rho of European cash-or-nothing options.
+
+    Takes the same arguments as cash_or_nothing_price.
+
+    :return Greeks: Named tuple of Greek arrays
+    """
+    forward, discount = forward_and_discount(spot, rfr, div, tau)
+    d1, d2 = d1_d2(forward, strike, vol, tau)
+    spot = np.asarray(spot, dtype=float)
+    vol = np.asarray(vol, dtype=float)
+    rfr = np.asarray(rfr, dtype=float)
+    div = np.asarray(div, dtype=float)
+    std_dev, spot_std_dev = _std_dev_terms(spot, vol, tau)
+    phi = call_or_put
+    price = cash * discount * norm_cdf(phi * d2)
+    # Sensitivity of the price to d2
+    d2_weight = phi * cash * discount * norm_pdf(d2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        live = std_dev > 0
+        delta = d2_weight / spot_std_dev
+        gamma = np.where(live, -d2_weight * d1 / (spot_std_dev * spot * std_dev), 0.0)
+        vega = np.where(live, -d2_weight * d1 / vol, 0.0)
+        d2_dtau = np.where(
+            live,
+            ((rfr - div - 0.5 * vol ** 2) * tau - np.log(spot / strike))
+            / (2 * std_dev * tau),
+            0.0
+        )
+        d2_drfr = np.where(live, np.sqrt(tau) / vol, 0.0)
+    theta = rfr * price - d2_weight * d2_dtau
+    rho = -tau * price + d2_weight * d2_drfr
+    return Greeks(delta, gamma, vega, theta, rho)
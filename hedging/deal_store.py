@@ -0,0 +1,651 @@
+"""
+Struct-of-arrays deal storage for very large books.
+
+Deals live in NumPy columns: interned instrument and counterparty codes as
+int32, quantities as float64 and creation times as int64 microseconds since
+the epoch. CompactPortfolio exposes the same API as portfolio_object.Portfolio
+but hands out lightweight DealView objects instead of storing Deals.
+
+Books persist as a columnar snapshot file plus an append-only journal:
+
+    snapshot = MAGIC | uint32 version | uint32 header length | JSON header |
+               columns, each aligned to COLUMN_ALIGNMENT bytes
+    journal  = JSON lines, a 'base' record naming the snapshot deal count
+               and generation followed by 'add' and 'remove' records
+
+Every checkpoint bumps the generation stored in the snapshot header. A
+journal from an older generation is already contained in the snapshot, as
+after a crash between writing a checkpoint and resetting its journal, and
+is skipped on replay and restarted when attached.
+
+Snapshots are memory-mapped copy-on-write on load, so startup does not
+depend on the number of deals beyond reading the intern tables.
+"""
+import datetime
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from contextlib import contextmanager
+import numpy as np
+from hedging.portfolio import npv_many
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+SNAPSHOT_MAGIC = b'DEALBOOK'
+SNAPSHOT_VERSION = 1
+COLUMN_ALIGNMENT = 64
+
+
+def to_timestamp(creation_time):
+    return (creation_time - EPOCH) // MICROSECOND
+
+
+def from_timestamp(timestamp):
+    return EPOCH + datetime.timedelta(microseconds=int(timestamp))
+
+
+class Interner:
+    """Two way mapping between hashable values and dense integer codes."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code_many(self, values):
+        """Codes for a sequence of values, interning once per distinct value.
+
+        Sorting out the distinct values with np.unique is only safe for a
+        flat array of scalars of one type; tuples, mixed types and objects
+        are interned per value so every key keeps its own type.
+        """
+        if isinstance(values, np.ndarray) and values.ndim == 1 \
+                and values.dtype != object:
+            array = values
+        else:
+            values = list(values)
+            array = None
+            if values and len({type(value) for value in values}) == 1:
+                array = np.asarray(values)
+                if array.ndim != 1 or array.dtype == object \
+                        or array.size != len(values):
+                    array = None
+        if array is not None:
+            uniques, inverse = np.unique(array, return_inverse=True)
+            unique_codes = np.array(
+                [self.code(value) for value in uniques.tolist()], dtype=np.int32
+            )
+            return unique_codes[inverse.ravel()]
+        distinct = {value: self.code(value) for value in dict.fromkeys(values)}
+        return np.array([distinct[value] for value in values], dtype=np.int32)
+
+
+class _SortedIndex:
+    """Lazily built argsort of a column, extended by scanning new rows.
+
+    Rows appended after the sort was built are kept as an unsorted tail and
+    scanned linearly; the sort is rebuilt once the tail grows past a fraction
+    of the indexed rows.
+    """
+
+    REBUILD_FRACTION = 0.1
+
+    def __init__(self, column_getter):
+        self.column_getter = column_getter
+        self.order = np.empty(0, dtype=np.int64)
+        self.sorted_values = np.empty(0)
+
+    def _refresh(self, size):
+        tail = size - self.order.size
+        if self.order.size == 0 or tail > self.REBUILD_FRACTION * self.order.size:
+            column = self.column_getter()[:size]
+            self.order = np.argsort(column, kind='stable')
+            self.sorted_values = column[self.order]
+
+    def rows_between(self, size, lower, upper):
+        """Row ids with lower <= value < upper, indexed rows first."""
+        self._refresh(size)
+        # Matching the column dtype stops searchsorted copying the column
+        lower, upper = np.array([lower, upper], dtype=self.sorted_values.dtype)
+        start = np.searchsorted(self.sorted_values, lower, side='left')
+        stop = np.searchsorted(self.sorted_values, upper, side='left')
+        rows = self.order[start:stop]
+        tail = self.column_getter()[self.order.size:size]
+        tail_rows = np.flatnonzero((tail >= lower) & (tail < upper)) + self.order.size
+        return np.concatenate([rows, tail_rows]) if tail_rows.size else rows
+
+
+class DealStore:
+    """Growable columnar deal table with tombstoned removals."""
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.instruments = Interner()
+        self.counterparties = Interner()
+        self.instrument_codes = np.empty(capacity, dtype=np.int32)
+        self.counterparty_codes = np.empty(capacity, dtype=np.int32)
+        self.quantities = np.empty(capacity, dtype=np.float64)
+        self.creation_times = np.empty(capacity, dtype=np.int64)
+        self.active = np.empty(capacity, dtype=bool)
+        self.n_active = 0
+        # Checkpoint count of the snapshot lineage, see CompactPortfolio
+        self.generation = 0
+        self._instrument_index = _SortedIndex(lambda: self.instrument_codes)
+        self._counterparty_index = _SortedIndex(lambda: self.counterparty_codes)
+        self._creation_index = _SortedIndex(lambda: self.creation_times)
+
+    COLUMNS = [
+        'instrument_codes', 'counterparty_codes', 'quantities',
+        'creation_times', 'active'
+    ]
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        capacity = len(self.quantities)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def append(self, instrument, quantity, counterparty, creation_time):
+        """Store one deal and return its id."""
+        self._reserve(1)
+        deal_id = self.size
+        self.instrument_codes[deal_id] = self.instruments.code(instrument)
+        self.counterparty_codes[deal_id] = self.counterparties.code(counterparty)
+        self.quantities[deal_id] = quantity
+        self.creation_times[deal_id] = to_timestamp(creation_time)
+        self.active[deal_id] = True
+        self.size += 1
+        self.n_active += 1
+        return deal_id
+
+    def extend(self, instruments, quantities, counterparties, creation_times):
+        """Bulk append deals; creation_times are datetimes or int64
+        microseconds since the epoch.
+
+        :return np.ndarray: Ids of the new deals
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        count = quantities.size
+        creation_times = np.asarray(creation_times)
+        if creation_times.dtype == object:
+            creation_times = np.array(
+                [to_timestamp(value) for value in creation_times], dtype=np.int64
+            )
+        self._reserve(count)
+        rows = slice(self.size, self.size + count)
+        self.instrument_codes[rows] = self.instruments.code_many(instruments)
+        self.counterparty_codes[rows] = self.counterparties.code_many(counterparties)
+        self.quantities[rows] = quantities
+        self.creation_times[rows] = creation_times
+        self.active[rows] = True
+        self.size += count
+        self.n_active += count
+        return np.arange(rows.start, rows.stop)
+
+    def remove(self, deal_id):
+        if not 0 <= deal_id < self.size or not self.active[deal_id]:
+            raise KeyError(f"No deal with id {deal_id} in store.")
+        self.active[deal_id] = False
+        self.n_active -= 1
+
+    def __contains__(self, deal_id):
+        return isinstance(deal_id, (int, np.integer)) and 0 <= deal_id < self.size \
+            and bool(self.active[deal_id])
+
+    def active_ids(self):
+        return np.flatnonzero(self.active[:self.size])
+
+    def _active_only(self, rows):
+        rows = np.sort(rows)
+        return rows[self.active[rows]]
+
+    def ids_with_counterparty(self, counterparty):
+        code = self.counterparties.codes.get(counterparty)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self._active_only(
+            self._counterparty_index.rows_between(self.size, code, code + 1)
+        )
+
+    def ids_on_instrument(self, instrument):
+        code = self.instruments.codes.get(instrument)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self._active_only(
+            self._instrument_index.rows_between(self.size, code, code + 1)
+        )
+
+    def ids_created_between(self, start=None, end=None):
+        """Ids with start <= creation_time < end, oldest first."""
+        lower = np.iinfo(np.int64).min if start is None else to_timestamp(start)
+        upper = np.iinfo(np.int64).max if end is None else to_timestamp(end)
+        rows = self._creation_index.rows_between(self.size, lower, upper)
+        rows = rows[np.argsort(self.creation_times[rows], kind='stable')]
+        return rows[self.active[rows]]
+
+    def quantity_by_instrument(self):
+        """Net quantity and active deal count per instrument code."""
+        active = self.active[:self.size]
+        codes = self.instrument_codes[:self.size][active]
+        quantities = np.bincount(
+            codes,
+            weights=self.quantities[:self.size][active],
+            minlength=len(self.instruments)
+        )
+        return quantities, np.bincount(codes, minlength=len(self.instruments))
+
+    def view(self, deal_id):
+        return DealView(self, deal_id)
+
+    def save(self, path):
+        """Write a versioned columnar snapshot of every row to path.
+
+        The snapshot is written to a temporary file beside path, synced and
+        then renamed over path, so a crash never leaves a partial snapshot
+        and a store memory-mapped from path keeps reading the old file.
+        Instruments and counterparties must be JSON serialisable, e.g. names.
+        """
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'n_deals': self.size,
+            'n_active': self.n_active,
+            'generation': self.generation,
+            'instruments': self.instruments.values,
+            'counterparties': self.counterparties.values,
+            'columns': {}
+        }
+        offset = 0
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            header['columns'][name] = {'dtype': column.dtype.str, 'offset': offset}
+            offset += _aligned(self.size * column.dtype.itemsize)
+        try:
+            header_bytes = json.dumps(header).encode('utf-8')
+        except TypeError as error:
+            raise TypeError(
+                f"Snapshot intern tables must be JSON serialisable: {error}"
+            ) from error
+
+        prefix_size = len(SNAPSHOT_MAGIC) + 8
+        data_start = _aligned(prefix_size + len(header_bytes))
+        with _atomic_file(path) as file:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(np.array([SNAPSHOT_VERSION, len(header_bytes)], dtype='<u4').tobytes())
+            file.write(header_bytes)
+            file.write(b'\0' * (data_start - prefix_size - len(header_bytes)))
+            for name in self.COLUMNS:
+                data = getattr(self, name)[:self.size].tobytes()
+                file.write(data)
+                file.write(b'\0' * (_aligned(len(data)) - len(data)))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a snapshot, memory-mapping the columns copy-on-write.
+
+        Removals on the loaded store never touch the file; the first append
+        copies the columns into memory.
+        """
+        with open(path, 'rb') as file:
+            magic = file.read(len(SNAPSHOT_MAGIC))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a deal book snapshot.")
+            version, header_size = np.frombuffer(file.read(8), dtype='<u4')
+            if version > SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Snapshot version {version} is newer than supported "
+                    f"version {SNAPSHOT_VERSION}."
+                )
+            header = json.loads(file.read(int(header_size)).decode('utf-8'))
+        data_start = _aligned(len(SNAPSHOT_MAGIC) + 8 + int(header_size))
+
+        store = cls(capacity=0)
+        store.size = header['n_deals']
+        store.n_active = header['n_active']
+        store.generation = header.get('generation', 0)
+        store.instruments = Interner(_hashable(header['instruments']))
+        store.counterparties = Interner(_hashable(header['counterparties']))
+        for name, column in header['columns'].items():
+            dtype = np.dtype(column['dtype'])
+            offset = data_start + column['offset']
+            if store.size == 0:
+                data = np.empty(0, dtype=dtype)
+            elif mmap:
+                data = np.memmap(
+                    path, dtype=dtype, mode='c', offset=offset, shape=(store.size,)
+                )
+            else:
+                data = np.fromfile(path, dtype=dtype, count=store.size, offset=offset)
+            setattr(store, name, data)
+        return store
+
+
+@contextmanager
+def _atomic_file(path):
+    """Binary file that replaces path only once it is fully written and synced."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=f'.{os.path.basename(path)}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _aligned(size):
+    return -(-size // COLUMN_ALIGNMENT) * COLUMN_ALIGNMENT
+
+
+def _hashable(values):
+    # JSON turns tuples into lists, turn them back so they can be interned
+    return [tuple(value) if isinstance(value, list) else value for value in values]
+
+
+class DealJournal:
+    """Append-only JSON lines log of deals added or removed since a snapshot."""
+
+    def __init__(self, path, base_deals, generation=0):
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0 \
+            or self.base_generation(path) < generation
+        self.file = open(path, 'w' if is_new else 'a', encoding='utf-8')
+        if is_new:
+            self.write({
+                'op': 'base', 'n_deals': base_deals, 'generation': generation
+            })
+
+    @staticmethod
+    def base_generation(path):
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.loads(file.readline()).get('generation', 0)
+
+    def write(self, record):
+        try:
+            line = json.dumps(record) + '\n'
+        except TypeError as error:
+            raise TypeError(
+                f"Journal records must be JSON serialisable: {error}"
+            ) from error
+        self.file.write(line)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def replay(path, store):
+        """Apply a journal to the snapshot store it was started from.
+
+        A journal from an earlier generation than the snapshot is already
+        contained in it and is skipped.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                record = json.loads(line)
+                if record['op'] == 'base':
+                    generation = record.get('generation', 0)
+                    if generation < store.generation:
+                        return
+                    if generation > store.generation:
+                        raise ValueError(
+                            f"Journal is from generation {generation} but the "
+                            f"snapshot is from generation {store.generation}."
+                        )
+                    if record['n_deals'] != store.size:
+                        raise ValueError(
+                            f"Journal starts at {record['n_deals']} deals but the "
+                            f"snapshot holds {store.size}."
+                        )
+                elif record['op'] == 'add':
+                    store.append(
+                        instrument=_hashable([record['instrument']])[0],
+                        quantity=record['quantity'],
+                        counterparty=_hashable([record['counterparty']])[0],
+                        creation_time=from_timestamp(record['creation_time'])
+                    )
+                elif record['op'] == 'remove':
+                    store.remove(record['deal_id'])
+                else:
+                    raise ValueError(f"Unknown journal record {record}.")
+
+
+class DealView:
+    """Read-only Deal backed by one row of a DealStore."""
+
+    __slots__ = ('store', 'deal_id')
+
+    def __init__(self, store, deal_id):
+        self.store = store
+        self.deal_id = int(deal_id)
+
+    @property
+    def instrument(self):
+        return self.store.instruments.values[self.store.instrument_codes[self.deal_id]]
+
+    @property
+    def counterparty(self):
+        return self.store.counterparties.values[
+            self.store.counterparty_codes[self.deal_id]
+        ]
+
+    @property
+    def quantity(self):
+        return float(self.store.quantities[self.deal_id])
+
+    @property
+    def creation_time(self):
+        return from_timestamp(self.store.creation_times[self.deal_id])
+
+    def __eq__(self, other):
+        return isinstance(other, DealView) and other.store is self.store \
+            and other.deal_id == self.deal_id
+
+    def __hash__(self):
+        return hash((id(self.store), self.deal_id))
+
+    def __repr__(self):
+        return f'Deal(instrument={self.instrument}, ' \
+               f'quantity={self.quantity}, ' \
+               f'counterparty={self.counterparty}, ' \
+               f'creation_time={self.creation_time})'
+
+
+class DealMapping(Mapping):
+    """deal_id -> DealView mapping over the active deals of a store."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, deal_id):
+        if deal_id not in self.store:
+            raise KeyError(deal_id)
+        return DealView(self.store, deal_id)
+
+    def __iter__(self):
+        return (int(deal_id) for deal_id in self.store.active_ids())
+
+    def __len__(self):
+        return self.store.n_active
+
+
+class CompactPortfolio:
+    """Deal book with the portfolio_object.Portfolio API on a DealStore."""
+
+    def __init__(self, store=None):
+        self.store = store or DealStore()
+        self.journal = None
+
+    @classmethod
+    def load_snapshot(cls, path, journal_path=None, mmap=True):
+        """Open a snapshot and replay any intraday journal on top of it."""
+        compact = cls(DealStore.load(path, mmap=mmap))
+        if journal_path is not None and os.path.exists(journal_path):
+            DealJournal.replay(journal_path, compact.store)
+        return compact
+
+    def save_snapshot(self, path):
+        self.store.save(path)
+
+    def attach_journal(self, path):
+        """Log every later add and remove to an append-only journal.
+
+        The journal must belong to the snapshot this book was loaded from,
+        or be new.
+        """
+        self.journal = DealJournal(
+            path, base_deals=self.store.size, generation=self.store.generation
+        )
+
+    def detach_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def checkpoint(self, path):
+        """Write a fresh snapshot and start an empty journal after it.
+
+        path may be the snapshot this book was loaded from. The snapshot is
+        written with the next generation and the journal is only reset once
+        it is safely in place. A crash while writing the snapshot leaves the
+        old snapshot and journal intact; a crash before the journal is reset
+        leaves an older generation journal that replay skips.
+        """
+        self.store.generation += 1
+        try:
+            self.save_snapshot(path)
+        except BaseException:
+            self.store.generation -= 1
+            raise
+        if self.journal is not None:
+            journal_path = self.journal.path
+            self.detach_journal()
+            # The old journal is from an earlier generation, so it restarts
+            self.attach_journal(journal_path)
+
+    def __repr__(self):
+        return '\n'.join([f'{key}: {val}' for key, val in self.deals.items()])
+
+    @classmethod
+    def from_portfolio(cls, portfolio):
+        compact = cls()
+        deals = list(portfolio.deals.values())
+        compact.store.extend(
+            instruments=[deal.instrument for deal in deals],
+            quantities=[deal.quantity for deal in deals],
+            counterparties=[deal.counterparty for deal in deals],
+            creation_times=[deal.creation_time for deal in deals]
+        )
+        return compact
+
+    @property
+    def deals(self):
+        return DealMapping(self.store)
+
+    @property
+    def deal_counter(self):
+        return self.store.size
+
+    def create_deal(self, instrument, quantity, counterparty=None, creation_time=None):
+        deal_id = self._append(
+            instrument=instrument,
+            quantity=quantity,
+            counterparty=counterparty,
+            creation_time=creation_time or datetime.datetime.now()
+        )
+        if quantity == 0:
+            self.remove_deal(deal_id=deal_id)
+
+    def add_deal(self, deal):
+        return self._append(
+            instrument=deal.instrument,
+            quantity=deal.quantity,
+            counterparty=deal.counterparty,
+            creation_time=deal.creation_time
+        )
+
+    def _append(self, instrument, quantity, counterparty, creation_time):
+        # Journal first, so a record that cannot be written leaves the book
+        # unchanged rather than holding a deal the journal never saw
+        if self.journal is not None:
+            hash((instrument, counterparty))
+            self.journal.write({
+                'op': 'add',
+                'instrument': instrument,
+                'quantity': float(quantity),
+                'counterparty': counterparty,
+                'creation_time': int(to_timestamp(creation_time))
+            })
+        return self.store.append(
+            instrument=instrument,
+            quantity=quantity,
+            counterparty=counterparty,
+            creation_time=creation_time
+        )
+
+    def remove_deal(self, deal=None, deal_id=None):
+        deal_id = deal.deal_id if deal_id is None else deal_id
+        if deal_id not in self.store:
+            raise KeyError(f"No deal with id {deal_id} in store.")
+        if self.journal is not None:
+            self.journal.write({'op': 'remove', 'deal_id': int(deal_id)})
+        self.store.remove(deal_id)
+        return DealView(self.store, deal_id)
+
+    def _views(self, deal_ids):
+        return [DealView(self.store, deal_id) for deal_id in deal_ids]
+
+    def deals_with_counterparty(self, counterparty):
+        return self._views(self.store.ids_with_counterparty(counterparty))
+
+    def deals_on_instrument(self, instrument):
+        return self._views(self.store.ids_on_instrument(instrument))
+
+    def deals_created_between(self, start=None, end=None):
+        """Deals with start <= creation_time < end, oldest first."""
+        return self._views(self.store.ids_created_between(start, end))
+
+    def positions(self):
+        """Net quantity per instrument over all deals."""
+        quantities, deal_counts = self.store.quantity_by_instrument()
+        return {
+            self.store.instruments.values[code]: quantities[code]
+            for code in np.flatnonzero(deal_counts)
+        }
+
+    def price(self, market_data_object):
+        total_pv = 0
+        for instrument, quantity in self.positions().items():
+            total_pv += instrument.price(market_data_object) * quantity
+        return total_pv
+
+    def price_many(self, market_data_set, per_instrument=False):
+        """Book PV in every scenario, see hedging.portfolio.npv_many."""
+        return npv_many(self.positions().items(), market_data_set, per_instrument)
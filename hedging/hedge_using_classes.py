@@ -1,23 +1,50 @@
 import numpy as np
 import logging
-import QuantLib as ql
-import pla_stats
-import scenario_generator
-import option_price
-from matplotlib import pyplot
-import tristans_options
+from collections import namedtuple
 from datetime import date
+from hedging import options as tristans_options
+from hedging import pla_stats
+from hedging import scenario_generator
+from hedging import tracing
+from hedging.scenario_executor import ScenarioExecutor
+from hedging.sensitivity_pnl import SensitivityPnlModel
 
 #  FOCUS -> Logging, clean code, doc strings, well thought out functions
 
 logger = logging.getLogger(__name__)
 
+# Risk P&L models
+FULL_REVALUATION = 'FULL_REVALUATION'
+SENSITIVITIES = 'SENSITIVITIES'
+
+HedgeRatioStats = namedtuple(
+    'HedgeRatioStats', ['ratios', 'ks_values', 'spearman_values', 'delta']
+)
+
 
 # logging.basicConfig(
 #     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
 #     level=logging.INFO
 
-def hedging_example():
+def hedging_example(pricing_cache=None, risk_model=FULL_REVALUATION):
+    """Run the hedge ratio PLA study and plot it, see hedge_ratio_stats."""
+    from hedging import plotting
+
+    plotting.plot_hedge_ratio_stats(hedge_ratio_stats(
+        pricing_cache=pricing_cache, risk_model=risk_model
+    ))
+
+
+@tracing.traced()
+def hedge_ratio_stats(
+        pricing_cache=None,
+        risk_model=FULL_REVALUATION,
+        num_shocks=100,
+        maturity=date(2022, 10, 15),
+        n_workers=None,
+        mc_engine=tristans_options.EuropeanOption.MONTE_CARLO,
+        seed=None
+):
     """
     This example assumes:
     Portfolio PV = Call_Option(St) - k * Stock(St)
@@ -36,12 +63,27 @@ def hedging_example():
     2) Select a set of hedging ratios (0 to 1)
     3) For each hedging
         a) Calculate portfolio PnLs for n_shocks using analytical pricer
-        b) Calculate portfolio PnLs for n_shocks using Monte Carlo pricer
+        b) Calculate portfolio PnLs for n_shocks using Monte Carlo pricer,
+           or from the Monte Carlo option's base Greeks
         c) PLA test on the PnLs
             - KS test
             - Spearman Corr
-    4) Plot KS test and Spearman Corr as a function of k
-    :return:
+    4) Return KS test and Spearman Corr as a function of k, with the
+       option's analytic delta, the first order hedge ratio
+    :param options.PricingCache pricing_cache: Optional cache for the
+        analytical leg and the sensitivity model's Greeks; reruns with the
+        same seed reuse their NPVs. Under FULL_REVALUATION the Monte Carlo
+        leg is revalued by a ScenarioExecutor, which reseeds every scenario
+        and does not use the cache
+    :param str risk_model: FULL_REVALUATION reprices every scenario with
+        Monte Carlo, SENSITIVITIES takes the risk P&L from a delta-gamma
+        expansion and logs its explain error against full revaluation
+    :param int num_shocks: Number of spot scenarios
+    :param datetime.date maturity: Option maturity
+    :param int n_workers: Processes for the Monte Carlo revaluation
+    :param str mc_engine: Risk leg engine, MONTE_CARLO or NUMPY_MONTE_CARLO
+    :param int seed: Seed for the spot shocks, None draws fresh shocks
+    :return HedgeRatioStats: PLA statistics per hedge ratio and the delta
     """
     base_spot = 100
     vol = 0.1
@@ -49,10 +91,9 @@ def hedging_example():
     rfr = 0.05
     div = 0
     n_ratios = 30
-    maturity=date(2022, 10, 15)
     ratios = np.linspace(0, 1, n_ratios)
     shocks = scenario_generator.generate_log_normal_shocks(
-        vol=vol, num_shocks=100
+        vol=vol, num_shocks=num_shocks, seed=seed
     )
     rand_spot = base_spot * shocks
 
@@ -60,70 +101,58 @@ def hedging_example():
         asset_name='asset',
         strike=strike,
         maturity=maturity,
-        pricing_engine='ANALYTICAL'
+        pricing_engine='ANALYTICAL',
+        pricing_cache=pricing_cache
     )
 
     analytical_base_npv = euro_bin_call._price(base_spot, vol, rfr, div)
+    analytical_npvs = euro_bin_call.price_many(rand_spot, vol, rfr, div)
+    delta = float(euro_bin_call.greeks_many(base_spot, vol, rfr, div).delta)
+    logger.info(f"Analytic delta hedge ratio: {delta:.4f}")
 
     euro_bin_call = tristans_options.EuropeanCallOption(
         asset_name='asset',
         strike=strike,
         maturity=maturity,
-        pricing_engine='MONTE_CARLO'
-    )
-    mc_base_npv = euro_bin_call._price(base_spot, vol, rfr, div)
-
-    analytical_npvs = []
-    mc_npvs = []
-    for spot in rand_spot:
-        # PV for analytical shocked, PV for MC shocked
-        euro_bin_call = tristans_options.EuropeanCallOption(
-        asset_name='asset',
-        strike=strike,
-        maturity=maturity,
-        pricing_engine='ANALYTICAL'
-    )
-        analytical_npvs.append(euro_bin_call._price(spot, vol, rfr, div))
-
-        euro_bin_call = tristans_options.EuropeanCallOption(
-        asset_name='asset',
-        strike=strike,
-        maturity=maturity,
-        pricing_engine='MONTE_CARLO'
+        pricing_engine=mc_engine,
+        pricing_cache=pricing_cache
     )
-
-        mc_npvs.append(euro_bin_call._price(spot, vol, rfr, div))
-
-    fo_option_pnl = [x - analytical_base_npv for x in analytical_npvs]
-    risk_option_pnl = [x - mc_base_npv for x in mc_npvs]
-
-    sp_values = []
-    kstest_values = []
-    for k in ratios:
+    fo_option_pnl = np.asarray(analytical_npvs) - analytical_base_npv
+    if risk_model == SENSITIVITIES:
+        sensitivity_model = SensitivityPnlModel.from_option(
+            euro_bin_call, base_spot, vol, rfr, div
+        )
+        risk_option_pnl = sensitivity_model.pnl(rand_spot)
         logger.info(
-            f"Calculating FO and Risk P&Ls with a hedge value of {k} "
+            f"Sensitivity P&L explain versus full revaluation: "
+            f"{sensitivity_model.explain(fo_option_pnl, rand_spot)}"
         )
-        fo_portfolio_pnl = [x - k*(y-base_spot) for x, y in zip(fo_option_pnl, rand_spot)]
-        risk_portfolio_pnl = [x - k*(y-base_spot) for x, y in zip(risk_option_pnl, rand_spot)]
-        sp_values.append(pla_stats.pla_stats(fo_portfolio_pnl, risk_portfolio_pnl).spearman_value)
-        kstest_values.append(
-            pla_stats.pla_stats(fo_portfolio_pnl, risk_portfolio_pnl).ks_value)
-
-    fig = pyplot.figure()
-    ax1 = fig.add_subplot(121)
-    ax2 = fig.add_subplot(122)
-    ax1.scatter(ratios, kstest_values)
-    ax2.scatter(ratios, sp_values)
-
-    ax1.set_title('FO Pnl vs Risk PnL')
-    ax1.set_xlabel('Hedge Ratio')
-    ax1.set_ylabel('KS Test')
-
-    ax2.set_title('FO Pnl vs Risk PnL')
-    ax2.set_xlabel('Hedge Ratio')
-    ax2.set_ylabel('Spearman Correlation')
-    pyplot.show()
+    elif risk_model == FULL_REVALUATION:
+        with ScenarioExecutor(euro_bin_call, n_workers=n_workers) as executor:
+            mc_base_npv = executor.revalue(base_spot, vol, rfr, div)
+            mc_npvs = executor.revalue(rand_spot, vol, rfr, div)
+        risk_option_pnl = np.asarray(mc_npvs) - mc_base_npv
+    else:
+        raise NotImplementedError(f"Unknown risk P&L model {risk_model}.")
+
+    logger.info(
+        f"Calculating FO and Risk P&Ls for {n_ratios} hedge values."
+    )
+    hedge_pnl = np.outer(ratios, rand_spot - base_spot)
+    pla_results = pla_stats.pla_stats_many(
+        fo_option_pnl - hedge_pnl, risk_option_pnl - hedge_pnl
+    )
+    return HedgeRatioStats(
+        ratios=ratios,
+        ks_values=pla_results.ks_value,
+        spearman_values=pla_results.spearman_value,
+        delta=delta
+    )
 
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
     hedging_example()
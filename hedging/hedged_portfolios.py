@@ -4,7 +4,6 @@ import QuantLib as ql
 import pla_stats
 import scenario_generator
 import option_price
-from matplotlib import pyplot
 
 #  FOCUS -> Logging, clean code, doc strings, well thought out functions
 
@@ -95,35 +94,21 @@ def hedging_example():
         )
         mc_npvs.append(option.NPV())
 
-    fo_option_pnl = [x - analytical_base_npv for x in analytical_npvs]
-    risk_option_pnl = [x - mc_base_npv for x in mc_npvs]
+    fo_option_pnl = np.asarray(analytical_npvs) - analytical_base_npv
+    risk_option_pnl = np.asarray(mc_npvs) - mc_base_npv
 
-    sp_values = []
-    kstest_values = []
-    for k in ratios:
-        logger.info(
-            f"Calculating FO and Risk P&Ls with a hedge value of {k} "
-        )
-        fo_portfolio_pnl = [x - k*(y-base_spot) for x, y in zip(fo_option_pnl, rand_spot)]
-        risk_portfolio_pnl = [x - k*(y-base_spot) for x, y in zip(risk_option_pnl, rand_spot)]
-        sp_values.append(pla_stats.pla_stats(fo_portfolio_pnl, risk_portfolio_pnl).spearman_value)
-        kstest_values.append(
-            pla_stats.pla_stats(fo_portfolio_pnl, risk_portfolio_pnl).ks_value)
-
-    fig = pyplot.figure()
-    ax1 = fig.add_subplot(121)
-    ax2 = fig.add_subplot(122)
-    ax1.scatter(ratios, kstest_values)
-    ax2.scatter(ratios, sp_values)
-
-    ax1.set_title('FO Pnl vs Risk PnL')
-    ax1.set_xlabel('Hedge Ratio')
-    ax1.set_ylabel('KS Test')
+    logger.info(
+        f"Calculating FO and Risk P&Ls for {n_ratios} hedge values."
+    )
+    hedge_pnl = np.outer(ratios, rand_spot - base_spot)
+    pla_results = pla_stats.pla_stats_many(
+        fo_option_pnl - hedge_pnl, risk_option_pnl - hedge_pnl
+    )
+    import plotting
 
-    ax2.set_title('FO Pnl vs Risk PnL')
-    ax2.set_xlabel('Hedge Ratio')
-    ax2.set_ylabel('Spearman Correlation')
-    pyplot.show()
+    plotting.plot_pla_by_hedge_ratio(
+        ratios, pla_results.ks_value, pla_results.spearman_value
+    )
 
 if __name__ == '__main__':
     hedging_example()
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Historical simulation shocks from a memory-mapped price history.
+
+The history is an (n_assets, n_days) array of prices stored either as a .npy
+file or as a raw binary file. It is memory-mapped, never loaded wholesale:
+overlapping n-day windows are strided views on the mapping and shocks are
+only materialised block by block.
+
+Shocks follow the synthetic generators' convention, S1 = S0 * shock, so the
+n-day log return is log(shock).
+"""
+import numpy as np
+
+
+class HistoricalScenarioSource:
+    """Overlapping n-day shocks read lazily from a price history file.
+
+    :param str path: .npy file, or raw C-ordered binary file
+    :param int n_assets: Rows of a raw file, None for a .npy file
+    :param int n_days: Columns of a raw file, None for a .npy file
+    :param dtype: Element type of a raw file
+    :param int offset: Bytes to skip before the data of a raw file
+    :param asset_names: Optional names, one per row, for lookups by name
+    """
+
+    def __init__(
+            self,
+            path,
+            n_assets=None,
+            n_days=None,
+            dtype=np.float64,
+            offset=0,
+            asset_names=None
+    ):
+        if n_assets is None:
+            self.prices = np.load(path, mmap_mode='r')
+        else:
+            self.prices = np.memmap(
+                path, dtype=dtype, mode='r', offset=offset,
+                shape=(n_assets, n_days)
+            )
+        if self.prices.ndim != 2:
+            raise ValueError(
+                f"Price history must be (n_assets, n_days), not {self.prices.shape}."
+            )
+        self.asset_names = list(asset_names) if asset_names is not None else None
+        if self.asset_names is not None and len(self.asset_names) != self.n_assets:
+            raise ValueError(
+                f"Got {len(self.asset_names)} names for {self.n_assets} assets."
+            )
+
+    @property
+    def n_assets(self):
+        return self.prices.shape[0]
+
+    @property
+    def n_days(self):
+        return self.prices.shape[1]
+
+    def asset_index(self, asset):
+        if isinstance(asset, str):
+            if self.asset_names is None:
+                raise KeyError(f"No asset names to look up {asset} in.")
+            return self.asset_names.index(asset)
+        return asset
+
+    def num_shocks(self, horizon=1):
+        return max(self.n_days - horizon, 0)
+
+    def windows(self, horizon=1):
+        """Start and end price views of every overlapping horizon-day window.
+
+        Both are strided views on the memory map, no data is copied.
+
+        :return: Tuple of (n_assets, num_shocks) start and end price views
+        """
+        if horizon < 1:
+            raise ValueError(f"Horizon must be at least one day, not {horizon}.")
+        return self.prices[:, :-horizon], self.prices[:, horizon:]
+
+    def iter_shock_blocks(
+            self, horizon=1, num_shocks=None, assets=None, block_size=100000
+    ):
+        """Yield (rows, n_selected_assets) shock blocks, oldest first.
+
+        :param int horizon: Return horizon in days
+        :param int num_shocks: Use only the most recent num_shocks windows,
+            None uses the whole history
+        :param assets: Asset indices or names, None selects every asset
+        :param int block_size: Maximum windows per yielded block
+        """
+        start_prices, end_prices = self.windows(horizon)
+        total = self.num_shocks(horizon)
+        num_shocks = total if num_shocks is None else num_shocks
+        if num_shocks > total:
+            raise ValueError(
+                f"History only holds {total} {horizon} day shocks, not {num_shocks}."
+            )
+        rows = slice(None) if assets is None else [
+            self.asset_index(asset) for asset in assets
+        ]
+        for start in range(total - num_shocks, total, block_size):
+            stop = min(start + block_size, total)
+            yield (
+                end_prices[rows, start:stop] / start_prices[rows, start:stop]
+            ).T
+
+    def generate_shock_matrix(self, num_shocks=780, horizon=1, assets=None):
+        """(num_shocks, n_assets) shock matrix, as from the correlated generator."""
+        blocks = list(self.iter_shock_blocks(
+            horizon=horizon, num_shocks=num_shocks, assets=assets
+        ))
+        if not blocks:
+            n_cols = self.n_assets if assets is None else len(assets)
+            return np.empty((0, n_cols))
+        return np.concatenate(blocks)
+
+    def generate_shocks(self, asset, num_shocks=780, horizon=1):
+        """Shock vector for one asset, as from generate_log_normal_shocks."""
+        return self.generate_shock_matrix(
+            num_shocks=num_shocks, horizon=horizon, assets=[asset]
+        )[:, 0]
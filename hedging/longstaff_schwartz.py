@@ -0,0 +1,205 @@
+"""
+Longstaff-Schwartz Monte Carlo for Bermudan options on one GBM underlying.
+
+Pricing runs in two passes over independent paths. The regression pass holds
+its paths in memory and rolls back through the exercise dates, regressing
+each option's discounted future cash flows on polynomials of the spot over
+its in the money paths; every option is fitted at once through batched
+normal equations. The pricing pass then streams fresh paths in chunks and
+exercises each option the first time its payoff beats the fitted
+continuation value. Using separate paths for the exercise policy keeps the
+estimate free of look-ahead bias, it is a slightly low biased price.
+
+All options in a batch share the same simulated paths, sampled on the union
+of their exercise dates.
+"""
+import numpy as np
+from hedging import scenario_generator
+from hedging import tracing
+
+
+def polynomial_basis(spots, degree):
+    """(..., degree + 1) powers of the normalised spots, 1 first."""
+    return spots[..., None] ** np.arange(degree + 1)
+
+
+class LongstaffSchwartzEngine:
+    """Least squares Monte Carlo engine for batches of Bermudan options.
+
+    :param int num_paths: Paths in the pricing pass
+    :param int regression_paths: Paths in the regression pass, held in memory
+    :param int degree: Degree of the polynomial regression basis
+    :param int seed: Seed for both passes, None draws fresh paths
+    :param str method: Normal sampling method from scenario_generator
+    :param int chunk_size: Pricing paths simulated at once
+    """
+
+    def __init__(
+            self,
+            num_paths=100000,
+            regression_paths=20000,
+            degree=3,
+            seed=None,
+            method=scenario_generator.ANTITHETIC,
+            chunk_size=2 ** 14
+    ):
+        self.num_paths = num_paths
+        self.regression_paths = regression_paths
+        self.degree = degree
+        self.seed = seed
+        self.method = method
+        self.chunk_size = chunk_size
+
+    def iter_paths(self, num_paths, spot, vol, rfr, div, times, seed):
+        """Yield (paths, n_times) blocks of GBM spots divided by spot."""
+        steps = np.diff(times, prepend=0)
+        drift = (rfr - div - 0.5 * vol ** 2) * steps
+        diffusion = vol * np.sqrt(steps)
+        for normals in scenario_generator.iter_standard_normal_blocks(
+                num_paths, n_dims=len(times), block_size=self.chunk_size,
+                method=self.method, seed=seed
+        ):
+            yield np.exp(np.cumsum(drift + diffusion * normals, axis=1))
+
+    @tracing.traced()
+    def price_many(
+            self,
+            call_or_put,
+            strikes,
+            spot,
+            vol,
+            rfr,
+            div,
+            exercise_times,
+            cash=None
+    ):
+        """Price a batch of Bermudan options on one underlying.
+
+        :param call_or_put: 1 for calls, -1 for puts, per option or shared
+        :param strikes: Strike per option, or shared
+        :param float spot: Spot of the shared underlying
+        :param float vol: Volatility of the underlying
+        :param float rfr: Risk free rate
+        :param float div: Dividend yield
+        :param exercise_times: Exercise times in years, shared by the batch
+            or one row per option with NaN padding; the last time of each
+            row is its maturity. A time of 0 allows exercise today while a
+            later date remains; as in QuantLib and the binomial lattice, an
+            option whose last date is today or earlier has expired and is
+            worth 0
+        :param cash: Cash-or-nothing amount, None for vanilla payoffs
+        :return np.ndarray: Price per option
+        """
+        exercise_times = np.atleast_2d(np.asarray(exercise_times, dtype=float))
+        call_or_put, strikes = np.broadcast_arrays(
+            np.asarray(call_or_put, dtype=float),
+            np.asarray(strikes, dtype=float)
+        )
+        n_options = max(call_or_put.size, exercise_times.shape[0])
+        call_or_put = np.broadcast_to(np.ravel(call_or_put), (n_options,))
+        strikes = np.broadcast_to(np.ravel(strikes), (n_options,))
+        exercise_times = np.broadcast_to(
+            exercise_times, (n_options, exercise_times.shape[1])
+        )
+
+        times = np.unique(exercise_times[exercise_times > 0])
+        # Exercise today only counts while a later date remains
+        exercise_now = np.any(exercise_times == 0, axis=1) \
+            & np.any(exercise_times > 0, axis=1)
+
+        def intrinsic(path_spots):
+            moneyness = call_or_put[:, None] * (spot * path_spots - strikes[:, None])
+            if cash is None:
+                return np.maximum(moneyness, 0)
+            return np.where(moneyness > 0, cash, 0.0)
+
+        if times.size == 0:
+            # Every option matures today or has expired
+            return np.zeros(n_options)
+
+        exercisable = np.zeros((n_options, times.size), dtype=bool)
+        for column in exercise_times.T:
+            valid = column > 0
+            exercisable[valid, np.searchsorted(times, column[valid])] = True
+        maturities = np.where(
+            exercisable.any(axis=1),
+            times.size - 1 - np.argmax(exercisable[:, ::-1], axis=1),
+            -1
+        )
+
+        regression_seed, pricing_seed = np.random.SeedSequence(
+            self.seed
+        ).spawn(2)
+        coefficients = self._fit(
+            intrinsic, spot, vol, rfr, div, times, exercisable, maturities,
+            regression_seed
+        )
+
+        values = np.zeros(n_options)
+        discounts = np.exp(-rfr * times)
+        for paths in self.iter_paths(
+                self.num_paths, spot, vol, rfr, div, times, pricing_seed
+        ):
+            alive = np.ones((n_options, len(paths)), dtype=bool)
+            for idx in range(times.size):
+                payoffs = intrinsic(paths[:, idx])
+                exercise = alive & (maturities == idx)[:, None]
+                regress = exercisable[:, idx] & (maturities > idx)
+                if np.any(regress):
+                    continuation = (
+                        polynomial_basis(paths[:, idx], self.degree)
+                        @ coefficients[idx, regress].T
+                    ).T
+                    exercise[regress] |= alive[regress] & (payoffs[regress] > 0) & (
+                        payoffs[regress] > continuation
+                    )
+                values += discounts[idx] * np.sum(
+                    np.where(exercise, payoffs, 0.0), axis=1
+                )
+                alive &= ~exercise
+        prices = values / self.num_paths
+        return np.where(
+            exercise_now, np.maximum(prices, intrinsic(np.ones(1))[:, 0]), prices
+        )
+
+    def _fit(
+            self, intrinsic, spot, vol, rfr, div, times, exercisable, maturities,
+            seed
+    ):
+        """Continuation value coefficients, (n_times, n_options, degree + 1).
+
+        Rolls back from the last date on in-memory regression paths, solving
+        every option's least squares problem at a date in one batched call.
+        """
+        n_options = exercisable.shape[0]
+        paths = np.concatenate(list(self.iter_paths(
+            self.regression_paths, spot, vol, rfr, div, times, seed
+        )))
+        coefficients = np.zeros((times.size, n_options, self.degree + 1))
+        cash_flows = np.zeros((n_options, len(paths)))
+        ridge = 1e-10 * np.eye(self.degree + 1)
+        for idx in range(times.size - 1, -1, -1):
+            if idx < times.size - 1:
+                cash_flows *= np.exp(-rfr * (times[idx + 1] - times[idx]))
+            payoffs = intrinsic(paths[:, idx])
+            maturing = maturities == idx
+            cash_flows[maturing] = payoffs[maturing]
+            regress = exercisable[:, idx] & (maturities > idx)
+            if not np.any(regress):
+                continue
+            basis = polynomial_basis(paths[:, idx], self.degree)
+            in_the_money = (payoffs[regress] > 0).astype(float)
+            gram = np.einsum('op,pk,pl->okl', in_the_money, basis, basis)
+            moments = np.einsum(
+                'op,pk->ok', in_the_money * cash_flows[regress], basis
+            )
+            scale = np.trace(gram, axis1=1, axis2=2)[:, None, None] + 1
+            beta = np.linalg.solve(gram + scale * ridge, moments[..., None])[..., 0]
+            coefficients[idx, regress] = beta
+            exercise = (in_the_money > 0) & (
+                payoffs[regress] > beta @ basis.T
+            )
+            cash_flows[regress] = np.where(
+                exercise, payoffs[regress], cash_flows[regress]
+            )
+        return coefficients
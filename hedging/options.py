@@ -1,13 +1,181 @@
 import datetime
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections import namedtuple
+import numpy as np
 import QuantLib as ql
 from datetime import date
+from hedging import black_scholes
+from hedging import greeks
+from hedging import tracing
+from hedging.lattice import BinomialLatticeEngine
+from hedging.numpy_mc import NumpyMCEuropeanEngine
+from hedging.pricing_grid import PricingGrid
+from hedging.pricing_session import PricingSession
 
 
 def to_ql_dt(dt):
     return ql.Date(dt.day, dt.month, dt.year)
 
 
+def year_fraction(maturity):
+    """Act/365 year fraction from today to maturity, as used by bsm_process."""
+    today = ql.Date().todaysDate()
+    return ql.Actual365Fixed().yearFraction(today, to_ql_dt(maturity))
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'size', 'max_size']
+)
+
+MARKET_INPUTS = ['spot', 'vol', 'rfr', 'div']
+
+_MISSING = object()
+
+
+class PricingCache:
+    """LRU cache of NPVs keyed on contract terms and market inputs.
+
+    Keys are (payoff, exercise, strike, maturity, engine, mc_params, spot,
+    vol, rfr, div, valuation date), so options built separately with the
+    same terms share entries. Market inputs are rounded before the lookup and
+    options are priced at the rounded inputs, so a cached NPV never depends
+    on which nearby input was priced first.
+
+    :param int max_size: Entries kept before the least recently used is
+        evicted
+    :param decimals: Decimal places market inputs are rounded to, either one
+        int for all inputs or a dict keyed on 'spot', 'vol', 'rfr' and 'div'.
+        None, or a missing key, keys on the exact input
+    """
+
+    def __init__(self, max_size=100000, decimals=None):
+        if max_size < 1:
+            raise ValueError(f"Cache size must be positive, not {max_size}.")
+        self.max_size = max_size
+        if decimals is None or isinstance(decimals, dict):
+            self.decimals = dict(decimals or {})
+        else:
+            self.decimals = {name: decimals for name in MARKET_INPUTS}
+        unknown = set(self.decimals) - set(MARKET_INPUTS)
+        if unknown:
+            raise ValueError(f"Unknown market inputs to quantise: {unknown}.")
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def info(self):
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self), self.max_size
+        )
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def quantise(self, spot, vol, rfr, div):
+        """Round market inputs, scalars or arrays, to the cache's grid."""
+        quantised = []
+        for name, value in zip(MARKET_INPUTS, (spot, vol, rfr, div)):
+            decimals = self.decimals.get(name)
+            quantised.append(
+                value if decimals is None else np.round(value, decimals)
+            )
+        return quantised
+
+    def get(self, key):
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return _MISSING
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def price(self, option, spot, vol, rfr, div, price_func, valuation_date=None):
+        """NPV of option at one set of market inputs, pricing on a miss.
+
+        :param option: Option providing contract_terms()
+        :param price_func: Callable (spot, vol, rfr, div) -> NPV
+        :param datetime.date valuation_date: Defaults to today
+        """
+        spot, vol, rfr, div = [
+            float(x) for x in self.quantise(spot, vol, rfr, div)
+        ]
+        key = option.contract_terms() + (
+            spot, vol, rfr, div, valuation_date or date.today()
+        )
+        value = self.get(key)
+        if value is _MISSING:
+            value = price_func(spot, vol, rfr, div)
+            self.put(key, value)
+        return value
+
+    def price_many(
+            self, option, spots, vols, rfrs, divs, price_func, valuation_date=None
+    ):
+        """NPVs over broadcast market input arrays, pricing misses in one call.
+
+        :param price_func: Vectorised callable (spots, vols, rfrs, divs) ->
+            NPV array, only called with the distinct inputs not yet cached
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        spots, vols, rfrs, divs = np.broadcast_arrays(*self.quantise(
+            np.asarray(spots, dtype=float),
+            np.asarray(vols, dtype=float),
+            np.asarray(rfrs, dtype=float),
+            np.asarray(divs, dtype=float)
+        ))
+        shape = spots.shape
+        spots, vols, rfrs, divs = [
+            np.ravel(x) for x in (spots, vols, rfrs, divs)
+        ]
+        contract = option.contract_terms()
+        valuation_date = valuation_date or date.today()
+
+        prices = np.empty(spots.size)
+        missing = OrderedDict()
+        for idx, market in enumerate(zip(
+                spots.tolist(), vols.tolist(), rfrs.tolist(), divs.tolist()
+        )):
+            key = contract + market + (valuation_date,)
+            if key in missing:
+                self.hits += 1
+                missing[key].append(idx)
+                continue
+            value = self.get(key)
+            if value is _MISSING:
+                missing[key] = [idx]
+            else:
+                prices[idx] = value
+
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            values = np.ravel(price_func(
+                spots[first], vols[first], rfrs[first], divs[first]
+            ))
+            for (key, indices), value in zip(missing.items(), values.tolist()):
+                prices[indices] = value
+                self.put(key, value)
+        return prices.reshape(shape)
+
+
 class Option(ABC):
 
     def __init__(self, asset_name, strike, maturity):
@@ -16,6 +184,12 @@ class Option(ABC):
         self.maturity = maturity
         self._option_object = None
 
+    def __getstate__(self):
+        # QuantLib objects cannot be pickled, rebuild them lazily instead
+        state = self.__dict__.copy()
+        state['_option_object'] = None
+        return state
+
     @property
     @abstractmethod
     def call_or_put(self):
@@ -49,6 +223,28 @@ class Option(ABC):
     def valid_pricing_engines(self):
         raise NotImplementedError()
 
+    @property
+    @abstractmethod
+    def payoff_terms(self):
+        raise NotImplementedError()
+
+    @property
+    @abstractmethod
+    def exercise_terms(self):
+        raise NotImplementedError()
+
+    def contract_terms(self):
+        """Hashable terms that, with the market inputs, fix the NPV."""
+        mc_params = getattr(self, 'mc_params', None) or {}
+        return (
+            self.payoff_terms,
+            self.exercise_terms,
+            self.strike,
+            self.maturity,
+            getattr(self, 'pricing_engine', None),
+            tuple(sorted(mc_params.items()))
+        )
+
     def validate_pricing_engine_input(self, pricing_engine_input):
         if pricing_engine_input not in self.valid_pricing_engines:
             raise NotImplementedError
@@ -58,48 +254,109 @@ class Option(ABC):
 
 class VanillaOption(Option, ABC):
 
-    def __init__(self, asset_name, strike, maturity, mc_params=None):
+    # Engines priced in NumPy through _npv_many rather than a QuantLib engine
+    NUMPY_ENGINES = []
+
+    def __init__(
+            self, asset_name, strike, maturity, mc_params=None, pricing_cache=None
+    ):
         super(VanillaOption, self).__init__(
             asset_name=asset_name, strike=strike, maturity=maturity
         )
         self.mc_params=self.default_mc(mc_params)
+        self.pricing_cache = pricing_cache
 
     @property
     def pay_off_type(self):
         return ql.PlainVanillaPayoff(self.call_or_put, self.strike)
 
+    @property
+    def payoff_terms(self):
+        return ('PlainVanilla', self.call_or_put)
+
     def create_option_object(self):
         return ql.VanillaOption(self.pay_off_type, self.exercise_type)
 
+    def payoff_values(self, spots):
+        return np.maximum(self.call_or_put * (spots - self.strike), 0)
+
     def default_mc(self, mc_param_input):
         if mc_param_input is None:
             return {'steps': 100, 'num_paths': 10000, 'rng': 'pseudorandom'}
         else:
             return mc_param_input
 
+    def pricing_session(self, spot=100, vol=0.1, rfr=0.02, div=0):
+        """Wire this option's engine once for fast repricing of scenarios."""
+        return PricingSession(self, spot=spot, vol=vol, rfr=rfr, div=div)
+
+    def pricing_grid(self, spot_range, vol=None, vol_range=None, rfr=0.02, div=0, **kwargs):
+        """Price once on an adaptive grid, then interpolate scenario prices."""
+        return PricingGrid(
+            self, spot_range, vol=vol, vol_range=vol_range, rfr=rfr, div=div,
+            **kwargs
+        )
+
+    def greeks_many(self, spots, vols, rfrs, divs):
+        """Delta, gamma, vega, theta and rho over arrays of market inputs.
+
+        Bumps and revalues with common random numbers across the bumps.
+
+        :return black_scholes.Greeks: Greek arrays in the broadcast shape
+        """
+        return greeks.bump_and_revalue_greeks(self, spots, vols, rfrs, divs)
+
 
 class EuropeanOption(VanillaOption):
 
     ANALYTICAL = 'ANALYTICAL'
     MONTE_CARLO = 'MONTE_CARLO'
+    NUMPY_MONTE_CARLO = 'NUMPY_MONTE_CARLO'
+    NUMPY_ENGINES = [NUMPY_MONTE_CARLO]
 
-    def __init__(self, asset_name, strike, maturity, pricing_engine, mc_params=None):
+    def __init__(
+            self,
+            asset_name,
+            strike,
+            maturity,
+            pricing_engine,
+            mc_params=None,
+            pricing_cache=None
+    ):
         super(EuropeanOption, self).__init__(
             asset_name=asset_name,
             strike=strike,
             maturity=maturity,
-            mc_params=mc_params
+            mc_params=mc_params,
+            pricing_cache=pricing_cache
         )
         self.pricing_engine = self.validate_pricing_engine_input(pricing_engine)
+        self._numpy_mc_engine = None
 
     @property
     def exercise_type(self):
         return ql.EuropeanExercise(to_ql_dt(self.maturity))
 
+    @property
+    def exercise_terms(self):
+        return ('European',)
+
     @property
     def valid_pricing_engines(self):
-        return [self.ANALYTICAL, self.MONTE_CARLO]
+        return [self.ANALYTICAL, self.MONTE_CARLO, self.NUMPY_MONTE_CARLO]
 
+    @property
+    def numpy_mc_engine(self):
+        """NumPy MC engine whose paths are drawn once and reused per option."""
+        num_paths = self.mc_params['num_paths']
+        seed = self.mc_params.get('seed')
+        engine = self._numpy_mc_engine
+        if engine is None or (engine.num_paths, engine.seed) != (num_paths, seed):
+            engine = NumpyMCEuropeanEngine(num_paths=num_paths, seed=seed)
+            self._numpy_mc_engine = engine
+        return engine
+
+    @tracing.traced('option_model')
     def option_model(self, process):
         if self.pricing_engine == self.ANALYTICAL:
             return ql.AnalyticEuropeanEngine(process)
@@ -107,9 +364,17 @@ class EuropeanOption(VanillaOption):
             steps = self.mc_params['steps']
             rng = self.mc_params['rng']
             num_paths = self.mc_params['num_paths']
-            return ql.MCEuropeanEngine(process, rng, steps, requiredSamples=num_paths)
-
+            seed = self.mc_params.get('seed', 0)
+            return ql.MCEuropeanEngine(
+                process, rng, steps, requiredSamples=num_paths, seed=seed
+            )
+        elif self.pricing_engine == self.NUMPY_MONTE_CARLO:
+            raise NotImplementedError(
+                'The NumPy Monte Carlo engine is not a QuantLib engine, '
+                'price it with _price, price_many or a pricing_session.'
+            )
 
+    @tracing.traced('bsm_process')
     def bsm_process(self, spot, vol, rfr, div):
         init_spot = ql.QuoteHandle(ql.SimpleQuote(spot))
         today = ql.Date().todaysDate()
@@ -130,22 +395,169 @@ class EuropeanOption(VanillaOption):
         return bsm_process
 
     def _price(self, spot, vol, rfr, div):
+        if self.pricing_cache is not None:
+            return self.pricing_cache.price(
+                self, spot, vol, rfr, div, self._npv
+            )
+        return self._npv(spot, vol, rfr, div)
+
+    @tracing.traced('price')
+    def _npv(self, spot, vol, rfr, div):
+        if self.pricing_engine == self.NUMPY_MONTE_CARLO:
+            return float(self._npv_many(spot, vol, rfr, div))
+
         bsm_process = self.bsm_process(
             spot=spot, vol=vol, rfr=rfr, div=div
         )
 
         engine = self.option_model(process=bsm_process)
         self.option_object.setPricingEngine(engine)
-        return self.option_object.NPV()
+        with tracing.span('NPV'):
+            return self.option_object.NPV()
+
+    def price_many(self, spots, vols, rfrs, divs):
+        """Price the option over arrays of market inputs.
+
+        Inputs are broadcast against each other. The analytical and NumPy
+        Monte Carlo engines price every scenario in one vectorised pass, the
+        QuantLib Monte Carlo engine reprices through one PricingSession.
+        With a pricing cache only the scenarios it misses are priced.
+
+        :param spots: Spot price(s)
+        :param vols: Volatility(ies)
+        :param rfrs: Risk free rate(s)
+        :param divs: Dividend yield(s)
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        if self.pricing_cache is not None:
+            return self.pricing_cache.price_many(
+                self, spots, vols, rfrs, divs, self._npv_many
+            )
+        return self._npv_many(spots, vols, rfrs, divs)
+
+    @tracing.traced('price_many')
+    def _npv_many(self, spots, vols, rfrs, divs):
+        spots, vols, rfrs, divs = np.broadcast_arrays(
+            np.asarray(spots, dtype=float),
+            np.asarray(vols, dtype=float),
+            np.asarray(rfrs, dtype=float),
+            np.asarray(divs, dtype=float)
+        )
+        if self.pricing_engine in [self.ANALYTICAL, self.NUMPY_MONTE_CARLO]:
+            tau = year_fraction(self.maturity)
+            if tau <= 0:
+                return np.zeros(spots.shape)
+            if self.pricing_engine == self.NUMPY_MONTE_CARLO:
+                return self.numpy_mc_engine.price_many(
+                    self.payoff_values, spots, vols, rfrs, divs, tau
+                )
+            return self.analytic_price_many(spots, vols, rfrs, divs, tau)
+
+        return self.pricing_session().price_many(spots, vols, rfrs, divs)
+
+    def analytic_price_many(self, spots, vols, rfrs, divs, tau):
+        return black_scholes.vanilla_price(
+            self.call_or_put, spots, self.strike, vols, rfrs, divs, tau
+        )
+
+    def greeks_many(self, spots, vols, rfrs, divs):
+        """Delta, gamma, vega, theta and rho over arrays of market inputs.
+
+        The analytical engine uses closed forms, the Monte Carlo engines bump
+        and revalue with common random numbers across the bumps.
+
+        :return black_scholes.Greeks: Greek arrays in the broadcast shape
+        """
+        if self.pricing_engine != self.ANALYTICAL:
+            return super(EuropeanOption, self).greeks_many(spots, vols, rfrs, divs)
+        spots, vols, rfrs, divs = np.broadcast_arrays(
+            np.asarray(spots, dtype=float),
+            np.asarray(vols, dtype=float),
+            np.asarray(rfrs, dtype=float),
+            np.asarray(divs, dtype=float)
+        )
+        tau = year_fraction(self.maturity)
+        if tau <= 0:
+            return black_scholes.Greeks(*[np.zeros(spots.shape)] * 5)
+        return self.analytic_greeks_many(spots, vols, rfrs, divs, tau)
+
+    def analytic_greeks_many(self, spots, vols, rfrs, divs, tau):
+        return black_scholes.vanilla_greeks(
+            self.call_or_put, spots, self.strike, vols, rfrs, divs, tau
+        )
 
     def price(self, market_data_object):
         # -> unpack market_data_object later into self._price
         return self._price(spot=100, vol=0.1, rfr=0.02, div=0)
 
 
+class EuropeanBinaryOption(EuropeanOption, ABC):
+
+    def __init__(
+            self,
+            asset_name,
+            strike,
+            maturity,
+            pricing_engine,
+            cash_payoff=1,
+            mc_params=None,
+            pricing_cache=None
+    ):
+        super(EuropeanBinaryOption, self).__init__(
+            asset_name=asset_name,
+            strike=strike,
+            maturity=maturity,
+            pricing_engine=pricing_engine,
+            mc_params=mc_params,
+            pricing_cache=pricing_cache
+        )
+        self.cash_payoff = cash_payoff
+
+    @property
+    def pay_off_type(self):
+        return ql.CashOrNothingPayoff(
+            self.call_or_put, self.strike, self.cash_payoff
+        )
+
+    @property
+    def payoff_terms(self):
+        return ('CashOrNothing', self.call_or_put, self.cash_payoff)
+
+    def analytic_price_many(self, spots, vols, rfrs, divs, tau):
+        return black_scholes.cash_or_nothing_price(
+            self.call_or_put, spots, self.strike, vols, rfrs, divs, tau,
+            cash=self.cash_payoff
+        )
+
+    def analytic_greeks_many(self, spots, vols, rfrs, divs, tau):
+        return black_scholes.cash_or_nothing_greeks(
+            self.call_or_put, spots, self.strike, vols, rfrs, divs, tau,
+            cash=self.cash_payoff
+        )
+
+    def payoff_values(self, spots):
+        return np.where(
+            self.call_or_put * (spots - self.strike) > 0, self.cash_payoff, 0.0
+        )
+
+
 class AmericanOption(VanillaOption, ABC):
+    """American option priced by QuantLib's Monte Carlo, lattice or
+    approximation engines.
+
+    The finite difference, binomial and approximation engines exercise from
+    the valuation date onwards, they do not honour a later earliest_date.
+    """
 
+    # There is no closed form American price, ANALYTICAL is never valid
+    ANALYTICAL = 'ANALYTICAL'
     MONTE_CARLO = 'MONTE_CARLO'
+    FINITE_DIFFERENCE = 'FINITE_DIFFERENCE'
+    BINOMIAL = 'BINOMIAL'
+    BARONE_ADESI_WHALEY = 'BARONE_ADESI_WHALEY'
+    BJERKSUND_STENSLAND = 'BJERKSUND_STENSLAND'
+    NUMPY_BINOMIAL = 'NUMPY_BINOMIAL'
+    NUMPY_ENGINES = [NUMPY_BINOMIAL]
 
     def __init__(
             self,
@@ -154,31 +566,100 @@ class AmericanOption(VanillaOption, ABC):
             maturity,
             pricing_engine,
             earliest_date,
-            mc_params=None
+            mc_params=None,
+            pricing_cache=None,
+            grid_params=None
     ):
         super(AmericanOption, self).__init__(
-            asset_name=asset_name, strike=strike, maturity=maturity
+            asset_name=asset_name,
+            strike=strike,
+            maturity=maturity,
+            pricing_cache=pricing_cache
         )
         self.pricing_engine = self.validate_pricing_engine_input(pricing_engine)
         self.mc_params = self.default_mc(mc_params)
+        self.grid_params = self.default_grid(grid_params)
         self.earliest_date = earliest_date
 
+    def default_grid(self, grid_param_input):
+        """Finite difference grid sizes and binomial tree type and steps."""
+        if grid_param_input is None:
+            return {'time_steps': 200, 'spot_steps': 200, 'tree': 'crr'}
+        else:
+            return grid_param_input
+
+    def contract_terms(self):
+        return super(AmericanOption, self).contract_terms() + (
+            tuple(sorted(self.grid_params.items())),
+        )
+
     @property
     def exercise_type(self):
         return ql.AmericanExercise(
             to_ql_dt(self.earliest_date), to_ql_dt(self.maturity)
         )
 
+    @property
+    def exercise_terms(self):
+        return ('American', self.earliest_date)
+
+    @property
+    def valid_pricing_engines(self):
+        return [
+            self.MONTE_CARLO,
+            self.FINITE_DIFFERENCE,
+            self.BINOMIAL,
+            self.BARONE_ADESI_WHALEY,
+            self.BJERKSUND_STENSLAND,
+            self.NUMPY_BINOMIAL
+        ]
+
+    @property
+    def lattice_engine(self):
+        """Batched NumPy tree with the grid_params steps and tree type."""
+        return BinomialLatticeEngine(
+            steps=self.grid_params['time_steps'], tree=self.grid_params['tree']
+        )
+
+    @tracing.traced('option_model')
     def option_model(self, process):
 
-        if self.pricing_engine == self.MONTE_CARLO:
+        if self.pricing_engine == self.FINITE_DIFFERENCE:
+            return ql.FdBlackScholesVanillaEngine(
+                process,
+                self.grid_params['time_steps'],
+                self.grid_params['spot_steps']
+            )
+        elif self.pricing_engine == self.BINOMIAL:
+            return ql.BinomialVanillaEngine(
+                process, self.grid_params['tree'], self.grid_params['time_steps']
+            )
+        elif self.pricing_engine == self.BARONE_ADESI_WHALEY:
+            return ql.BaroneAdesiWhaleyApproximationEngine(process)
+        elif self.pricing_engine == self.BJERKSUND_STENSLAND:
+            return ql.BjerksundStenslandApproximationEngine(process)
+        elif self.pricing_engine == self.NUMPY_BINOMIAL:
+            raise NotImplementedError(
+                'The NumPy binomial engine is not a QuantLib engine, '
+                'price it with _price, price_many or a pricing_session.'
+            )
+        elif self.pricing_engine == self.MONTE_CARLO:
             steps = self.mc_params['steps']
             rng = self.mc_params['rng']
             num_paths = self.mc_params['num_paths']
-            return ql.MCAmericanEngine(process, rng, steps, requiredSamples=num_paths)
+            seed = self.mc_params.get('seed', 0)
+            # Fix the regression paths' seed too, so repricing is repeatable
+            return ql.MCAmericanEngine(
+                process, rng, steps, requiredSamples=num_paths, seed=seed,
+                seedCalibration=seed or None
+            )
         else:
-            raise RuntimeError()        # TODO -> add meaningful error
+            raise NotImplementedError(
+                f"{self.pricing_engine} is not an American option engine, "
+                f"use one of {self.valid_pricing_engines}."
+            )
 
+    @tracing.traced('bsm_process')
     def bsm_process(self, spot, vol, rfr, div):
         init_spot = ql.QuoteHandle(ql.SimpleQuote(spot))
         today = ql.Date().todaysDate()
@@ -199,13 +680,50 @@ class AmericanOption(VanillaOption, ABC):
         return bsm_process
 
     def _price(self, spot, vol, rfr, div):
+        if self.pricing_cache is not None:
+            return self.pricing_cache.price(
+                self, spot, vol, rfr, div, self._npv
+            )
+        return self._npv(spot, vol, rfr, div)
+
+    @tracing.traced('price')
+    def _npv(self, spot, vol, rfr, div):
+        if self.pricing_engine == self.NUMPY_BINOMIAL:
+            return float(self._npv_many(spot, vol, rfr, div))
+
         bsm_process = self.bsm_process(
             spot=spot, vol=vol, rfr=rfr, div=div
         )
 
         engine = self.option_model(process=bsm_process)
         self.option_object.setPricingEngine(engine)
-        return self.option_object.NPV()
+        with tracing.span('NPV'):
+            return self.option_object.NPV()
+
+    def price_many(self, spots, vols, rfrs, divs):
+        """Price the option over arrays of market inputs.
+
+        The NumPy binomial engine rolls every scenario back in one batched
+        lattice, QuantLib engines reprice through one PricingSession. With a
+        pricing cache only the scenarios it misses are priced.
+
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        if self.pricing_cache is not None:
+            return self.pricing_cache.price_many(
+                self, spots, vols, rfrs, divs, self._npv_many
+            )
+        return self._npv_many(spots, vols, rfrs, divs)
+
+    @tracing.traced('price_many')
+    def _npv_many(self, spots, vols, rfrs, divs):
+        if self.pricing_engine == self.NUMPY_BINOMIAL:
+            return self.lattice_engine.price_many(
+                self.call_or_put, spots, self.strike, vols, rfrs, divs,
+                year_fraction(self.maturity),
+                earliest_times=max(year_fraction(self.earliest_date), 0)
+            )
+        return self.pricing_session().price_many(spots, vols, rfrs, divs)
 
     def price(self, market_data_object):
         # -> unpack market_data_object later into self._price
@@ -218,6 +736,13 @@ class AmericanCallOption(AmericanOption):
         return ql.Option.Call
 
 
+class AmericanPutOption(AmericanOption):
+
+    @property
+    def call_or_put(self):
+        return ql.Option.Put
+
+
 class EuropeanCallOption(EuropeanOption):
 
     @property
@@ -232,6 +757,20 @@ class EuropeanPutOption(EuropeanOption):
         return ql.Option.Put
 
 
+class EuropeanBinaryCallOption(EuropeanBinaryOption):
+
+    @property
+    def call_or_put(self):
+        return ql.Option.Call
+
+
+class EuropeanBinaryPutOption(EuropeanBinaryOption):
+
+    @property
+    def call_or_put(self):
+        return ql.Option.Put
+
+
 def main():
     asset_name = 'Asset'
     strike = 120
@@ -1,13 +1,12 @@
 # TODO FOCUS -> Logging, clean code, doc strings, well thought out functions
 import logging
 from collections import namedtuple
-from scipy.stats import ks_2samp, spearmanr
+import numpy as np
+from hedging import tracing
+
+# scipy.stats is imported where it is used, it is slow to import
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 
 PlaResult = namedtuple(
     'PlaResultV2',
@@ -15,6 +14,7 @@ PlaResult = namedtuple(
 )
 
 
+@tracing.traced()
 def pla_stats(fo_pnl, risk_pnl):
     """Calculates pnl stats for two sets of pnl vectors.
     kolmogorov-smirnov(ks): test metric to assess the similarity of the
@@ -31,6 +31,8 @@ def pla_stats(fo_pnl, risk_pnl):
         f"Calculating pla statistics for fo_pnl and risk_pnls of "
         f"length {len(fo_pnl)} & {len(risk_pnl)}."
     )
+    from scipy.stats import ks_2samp, spearmanr
+
     ks_results = ks_2samp(fo_pnl, risk_pnl)
     spearcorr_results = spearmanr(fo_pnl, risk_pnl)
 
@@ -42,6 +44,96 @@ def pla_stats(fo_pnl, risk_pnl):
     )
 
 
+@tracing.traced()
+def ks_statistics(fo_pnl, risk_pnl):
+    """Two sample KS statistic for every row of two P&L matrices.
+
+    Both samples of a row are sorted together once; walking the merged order
+    and stepping the empirical cdf difference by +1/n_fo or -1/n_risk gives
+    the statistic as the largest gap at the end of each run of tied values.
+
+    :param np.ndarray fo_pnl: (n_rows, n_fo) matrix
+    :param np.ndarray risk_pnl: (n_rows, n_risk) matrix
+    :return np.ndarray: KS statistic per row
+    """
+    n_fo = fo_pnl.shape[1]
+    n_risk = risk_pnl.shape[1]
+    pooled = np.concatenate([fo_pnl, risk_pnl], axis=1)
+    order = np.argsort(pooled, axis=1, kind='stable')
+    pooled = np.take_along_axis(pooled, order, axis=1)
+    steps = np.where(order < n_fo, 1.0 / n_fo, -1.0 / n_risk)
+    cdf_diff = np.abs(np.cumsum(steps, axis=1))
+    run_end = np.ones(pooled.shape, dtype=bool)
+    run_end[:, :-1] = pooled[:, 1:] != pooled[:, :-1]
+    return np.max(np.where(run_end, cdf_diff, 0), axis=1)
+
+
+@tracing.traced()
+def spearman_correlations(fo_pnl, risk_pnl):
+    """Spearman correlation and p-value for every row of two P&L matrices.
+
+    :return: Tuple of (correlation, p-value) arrays
+    """
+    from scipy.stats import rankdata
+    from scipy.stats import t as student_t
+
+    n = fo_pnl.shape[1]
+    fo_ranks = rankdata(fo_pnl, axis=1)
+    risk_ranks = rankdata(risk_pnl, axis=1)
+    fo_ranks -= fo_ranks.mean(axis=1, keepdims=True)
+    risk_ranks -= risk_ranks.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rho = np.sum(fo_ranks * risk_ranks, axis=1) / np.sqrt(
+            np.sum(fo_ranks ** 2, axis=1) * np.sum(risk_ranks ** 2, axis=1)
+        )
+        rho = np.clip(rho, -1, 1)
+        dof = n - 2
+        t_stat = rho * np.sqrt(dof / ((rho + 1.0) * (1.0 - rho)))
+        pvalue = 2 * student_t.sf(np.abs(t_stat), dof)
+    return rho, pvalue
+
+
+@tracing.traced()
+def pla_stats_many(fo_pnl, risk_pnl):
+    """Calculates pla stats for a whole sweep of P&L vectors at once.
+
+    Row i of fo_pnl is compared with row i of risk_pnl, e.g. one row per
+    hedge ratio. KS statistics match ks_2samp exactly; KS p-values use the
+    asymptotic Kolmogorov distribution (ks_2samp(..., method='asymp')).
+
+    :param fo_pnl: (n_ratios, n_shocks) matrix of HPL
+    :param risk_pnl: (n_ratios, n_shocks) matrix of RTPL
+    :return PlaResult: Fields are arrays with one value per row
+    """
+    fo_pnl = np.atleast_2d(np.asarray(fo_pnl, dtype=float))
+    risk_pnl = np.atleast_2d(np.asarray(risk_pnl, dtype=float))
+    if fo_pnl.shape != risk_pnl.shape:
+        raise ValueError(
+            f'fo_pnl and risk_pnl must have the same shape, not '
+            f'{fo_pnl.shape} & {risk_pnl.shape}.'
+        )
+    logger.info(
+        f"Calculating pla statistics for {fo_pnl.shape[0]} pairs of "
+        f"fo_pnl and risk_pnls of length {fo_pnl.shape[1]}."
+    )
+    n_fo = fo_pnl.shape[1]
+    n_risk = risk_pnl.shape[1]
+    from scipy.stats import kstwo
+
+    ks_values = ks_statistics(fo_pnl, risk_pnl)
+    ks_pvalues = np.clip(
+        kstwo.sf(ks_values, np.round(n_fo * n_risk / (n_fo + n_risk))), 0, 1
+    )
+    spearman_values, spearman_pvalues = spearman_correlations(fo_pnl, risk_pnl)
+
+    return PlaResult(
+        ks_value=ks_values,
+        ks_pvalue=ks_pvalues,
+        spearman_value=spearman_values,
+        spearman_pvalue=spearman_pvalues
+    )
+
+
 def main():
     pla_result = pla_stats([1, 2, 3, 4, 5], [2, 3, 4, 5, 5])
     logger.info(f'PLA stats returned {pla_result.ks_result} & {pla_result.spear_result}.')
@@ -50,4 +142,8 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
     main()
@@ -0,0 +1,45 @@
+"""
+Plots for the hedging studies.
+
+Kept apart from the pricing and statistics modules so that only code that
+draws something imports matplotlib and its GUI backend; batch workers never
+import this module.
+"""
+from matplotlib import pyplot
+
+
+def plot_pla_by_hedge_ratio(ratios, ks_values, spearman_values, delta=None):
+    """Scatter KS and Spearman statistics against hedge ratio.
+
+    :param delta: Hedge ratio to mark with a vertical line, e.g. the
+        option's delta; None marks nothing
+    """
+    fig = pyplot.figure()
+    ax1 = fig.add_subplot(121)
+    ax2 = fig.add_subplot(122)
+    ax1.scatter(ratios, ks_values)
+    ax2.scatter(ratios, spearman_values)
+    if delta is not None:
+        for ax in (ax1, ax2):
+            ax.axvline(delta, linestyle='--', color='grey', label='Delta')
+
+    ax1.set_title('FO Pnl vs Risk PnL')
+    ax1.set_xlabel('Hedge Ratio')
+    ax1.set_ylabel('KS Test')
+
+    ax2.set_title('FO Pnl vs Risk PnL')
+    ax2.set_xlabel('Hedge Ratio')
+    ax2.set_ylabel('Spearman Correlation')
+    pyplot.show()
+
+
+def plot_hedge_ratio_stats(stats):
+    """Plot hedge_using_classes.HedgeRatioStats, marking the delta."""
+    plot_pla_by_hedge_ratio(
+        stats.ratios, stats.ks_values, stats.spearman_values, delta=stats.delta
+    )
+
+
+def plot_path(prices):
+    pyplot.plot(prices)
+    pyplot.show()
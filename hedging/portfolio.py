@@ -1,6 +1,9 @@
 import logging
+from collections import namedtuple
+import numpy as np
 import QuantLib as ql
-import option_price
+from hedging import black_scholes
+from hedging.pricing_session import create_bsm_process
 
 logger = logging.getLogger(__name__)
 '''
@@ -30,6 +33,8 @@ Shocks(vol)
 
 '''
 
+EquityData = namedtuple('EquityData', ['eq_spot', 'eq_vol'])
+
 
 class Instrument:
 
@@ -41,12 +46,15 @@ class EuropeanOption:
 
     def __init__(self, asset, strike, maturity, option_type):
         self.asset = asset
+        self.strike = strike
+        self.maturity = maturity
+        self.option_type = option_type
         payoff = ql.PlainVanillaPayoff(option_type, strike)
         europeanExercise = ql.EuropeanExercise(maturity)
         self.vanilla_option = ql.VanillaOption(payoff, europeanExercise)
 
     def pricer(self, spot, vol, rfr, div):
-        bsm_process = option_price.create_bsm_process(
+        bsm_process = create_bsm_process(
             spot=spot, vol=vol, rfr=rfr, div=div
         )
         engine = ql.AnalyticEuropeanEngine(bsm_process)
@@ -62,14 +70,45 @@ class EuropeanOption:
             div=0
         )
 
+    @classmethod
+    def price_many(cls, instruments, market_data_set):
+        """Closed form prices of many options over every scenario at once.
+
+        :return np.ndarray: (n_instruments, n_scenarios) prices
+        """
+        rows = [market_data_set.asset_index(instr.asset) for instr in instruments]
+        today = ql.Date().todaysDate()
+        day_counter = ql.Actual365Fixed()
+        taus = np.array([
+            day_counter.yearFraction(today, instr.maturity) for instr in instruments
+        ])[:, None]
+        strikes = np.array([instr.strike for instr in instruments])[:, None]
+        call_or_put = np.array([instr.option_type for instr in instruments])[:, None]
+        prices = black_scholes.vanilla_price(
+            call_or_put,
+            market_data_set.eq_spots[rows],
+            strikes,
+            market_data_set.eq_vols[rows],
+            market_data_set.rfrs,
+            0,
+            np.maximum(taus, 0)
+        )
+        # Expired options are worth nothing, as in QuantLib
+        return np.where(taus > 0, prices, 0.0)
+
 
 class Stock:
 
     def __init__(self, asset):
-        pass
+        self.asset = asset
 
     def price(self, market_data):
-        return market_data.eq_spot
+        return market_data.equity_lookup(self.asset).eq_spot
+
+    @classmethod
+    def price_many(cls, instruments, market_data_set):
+        rows = [market_data_set.asset_index(instr.asset) for instr in instruments]
+        return market_data_set.eq_spots[rows]
 
 
 class Portfolio:
@@ -89,6 +128,51 @@ class Portfolio:
 
         return total_pv
 
+    def npv_many(self, market_data_set, per_instrument=False):
+        """Portfolio PV in every scenario of a MarketDataSet.
+
+        See npv_many; the instrument rows follow self.instrs order.
+        """
+        return npv_many(self.instrs.items(), market_data_set, per_instrument)
+
+
+def npv_many(positions, market_data_set, per_instrument=False):
+    """PV of (instrument, quantity) positions across all scenarios.
+
+    Instruments are grouped by type and each group is priced by the type's
+    price_many classmethod in one call; types without one fall back to
+    pricing every scenario view.
+
+    :param positions: Iterable of (instrument, quantity) pairs
+    :param MarketDataSet market_data_set: Scenarios to price under
+    :param bool per_instrument: Also return the position PV matrix
+    :return: (n_scenarios,) PV vector, or a tuple of it and the
+        (n_positions, n_scenarios) position PV matrix
+    """
+    positions = list(positions)
+    position_pvs = np.zeros((len(positions), market_data_set.n_scenarios))
+
+    groups = {}
+    for row, (instrument, _) in enumerate(positions):
+        groups.setdefault(type(instrument), []).append(row)
+
+    for instrument_type, rows in groups.items():
+        instruments = [positions[row][0] for row in rows]
+        if hasattr(instrument_type, 'price_many'):
+            prices = instrument_type.price_many(instruments, market_data_set)
+        else:
+            prices = np.array([
+                [instrument.price(view) for view in market_data_set.scenarios()]
+                for instrument in instruments
+            ])
+        quantities = np.array([positions[row][1] for row in rows], dtype=float)
+        position_pvs[rows] = prices * quantities[:, None]
+
+    total_pvs = position_pvs.sum(axis=0)
+    if per_instrument:
+        return total_pvs, position_pvs
+    return total_pvs
+
 
 class MarketData:
 
@@ -97,17 +181,117 @@ class MarketData:
         self.eq_vol = eq_vol
         self.rfr = rfr
 
+    def equity_lookup(self, asset):
+        # Single equity market data, every asset maps to it
+        return EquityData(eq_spot=self.eq_spot, eq_vol=self.eq_vol)
+
+
+class MarketDataSet:
+    """Columnar market data for many assets over many scenario days.
+
+    Spots and vols are (n_assets, n_scenarios) arrays and rates are one per
+    scenario, so no per-day objects are created. equity_lookup returns whole
+    rows across scenarios; scenario(j) gives a cheap view that behaves like a
+    single day MarketData.
+
+    :param asset_names: One name per row
+    :param eq_spots: (n_assets, n_scenarios) spot prices
+    :param eq_vols: Vols broadcastable to eq_spots, e.g. one per asset
+    :param rfrs: Risk free rates broadcastable to (n_scenarios,)
+    """
+
+    def __init__(self, asset_names, eq_spots, eq_vols, rfrs):
+        self.asset_names = list(asset_names)
+        self._asset_index = {
+            asset: index for index, asset in enumerate(self.asset_names)
+        }
+        if len(self._asset_index) != len(self.asset_names):
+            raise ValueError(f"Asset names must be unique, not {self.asset_names}.")
+        self.eq_spots = np.atleast_2d(np.asarray(eq_spots, dtype=float))
+        if self.eq_spots.shape[0] != len(self.asset_names):
+            raise ValueError(
+                f"Got {len(self.asset_names)} asset names for spots of shape "
+                f"{self.eq_spots.shape}."
+            )
+        eq_vols = np.asarray(eq_vols, dtype=float)
+        if eq_vols.ndim == 1:
+            eq_vols = eq_vols[:, None]
+        self.eq_vols = np.broadcast_to(eq_vols, self.eq_spots.shape)
+        self.rfrs = np.broadcast_to(
+            np.asarray(rfrs, dtype=float), (self.n_scenarios,)
+        )
+
+    @classmethod
+    def from_shocks(cls, asset_names, base_spots, eq_vols, rfrs, shock_matrix):
+        """Build scenarios from a (n_scenarios, n_assets) shock matrix, as
+        produced by the scenario generators."""
+        base_spots = np.asarray(base_spots, dtype=float)
+        return cls(
+            asset_names=asset_names,
+            eq_spots=base_spots[:, None] * np.asarray(shock_matrix).T,
+            eq_vols=eq_vols,
+            rfrs=rfrs
+        )
+
+    @property
+    def n_assets(self):
+        return self.eq_spots.shape[0]
+
+    @property
+    def n_scenarios(self):
+        return self.eq_spots.shape[1]
+
+    def __len__(self):
+        return self.n_scenarios
+
+    def asset_index(self, asset):
+        return self._asset_index[asset]
+
+    def equity_lookup(self, asset):
+        """Spot and vol rows of one asset across all scenarios."""
+        index = self._asset_index[asset]
+        return EquityData(eq_spot=self.eq_spots[index], eq_vol=self.eq_vols[index])
+
+    def scenario(self, scenario_index):
+        return MarketDataView(self, scenario_index)
+
+    def scenarios(self):
+        for scenario_index in range(self.n_scenarios):
+            yield MarketDataView(self, scenario_index)
+
+
+class MarketDataView:
+    """One scenario of a MarketDataSet, usable wherever MarketData is."""
+
+    __slots__ = ('data_set', 'scenario_index')
+
+    def __init__(self, data_set, scenario_index):
+        self.data_set = data_set
+        self.scenario_index = scenario_index
+
+    @property
+    def rfr(self):
+        return self.data_set.rfrs[self.scenario_index]
+
+    def equity_lookup(self, asset):
+        index = self.data_set.asset_index(asset)
+        return EquityData(
+            eq_spot=self.data_set.eq_spots[index, self.scenario_index],
+            eq_vol=self.data_set.eq_vols[index, self.scenario_index]
+        )
+
 
 def main():
     mkt_data_obj = MarketData(eq_spot=100, eq_vol=0.1, rfr=0.01)
     my_portfolio = Portfolio()
     option = EuropeanOption(
+        asset='AAPL',
         strike=100,
         maturity=ql.Date(15, 6, 2025),
         option_type=ql.Option.Call
     )
     option.price(market_data=mkt_data_obj)
-    stock = Stock()
+    stock = Stock(asset='AAPL')
     my_portfolio.add_instrument(stock, 40)
     my_portfolio.add_instrument(option, -20)
     temp = 1
@@ -1,10 +1,18 @@
 import datetime
+from bisect import bisect_left, insort
+from hedging.deal_store import CompactPortfolio
+from hedging.portfolio import npv_many
+
 
 class Portfolio:
 
     def __init__(self):
         self.deals = {}
         self.deal_counter = 0
+        # Secondary indexes, kept in step with self.deals on add and remove
+        self._deals_by_counterparty = {}
+        self._deals_by_instrument = {}
+        self._creation_index = []
 
     def __repr__(self):
         return '\n'.join([f'{key}: {val}' for key, val in self.deals.items()])
@@ -22,23 +30,81 @@ class Portfolio:
             self.remove_deal(deal=deal)
 
     def add_deal(self, deal):
-        self.deals[self.deal_counter] = deal
+        deal_id = self.deal_counter
+        deal.deal_id = deal_id
+        self.deals[deal_id] = deal
+        self._deals_by_counterparty.setdefault(deal.counterparty, {})[deal_id] = deal
+        self._deals_by_instrument.setdefault(deal.instrument, {})[deal_id] = deal
+        insort(self._creation_index, (deal.creation_time, deal_id))
         self.deal_counter += 1
+        return deal_id
+
+    def remove_deal(self, deal=None, deal_id=None):
+        """Remove a deal, given either the deal or its id, from the book and
+        every index."""
+        deal_id = deal.deal_id if deal_id is None else deal_id
+        if deal_id not in self.deals:
+            raise KeyError(f"No deal with id {deal_id} in portfolio.")
+        deal = self.deals.pop(deal_id)
+        self._remove_from_index(self._deals_by_counterparty, deal.counterparty, deal_id)
+        self._remove_from_index(self._deals_by_instrument, deal.instrument, deal_id)
+        position = bisect_left(self._creation_index, (deal.creation_time, deal_id))
+        del self._creation_index[position]
+        return deal
+
+    @staticmethod
+    def _remove_from_index(index, key, deal_id):
+        deals = index[key]
+        del deals[deal_id]
+        if not deals:
+            del index[key]
+
+    def positions(self):
+        """Net quantity per instrument over all deals."""
+        instrs = {}
+        for deal in self.deals.values():
+            instrs[deal.instrument] = instrs.get(deal.instrument, 0) + deal.quantity
+        return instrs
 
     def price(self, market_data_object):
         total_pv = 0
-        for instrument, quantity in self.instrs.items():
+        for instrument, quantity in self.positions().items():
             instr_npv = instrument.price(market_data_object)
             position_npv = instr_npv * quantity
             total_pv += position_npv
 
         return total_pv
 
-    def deals_with_counterparty(self):
-        pass
+    def price_many(self, market_data_set, per_instrument=False):
+        """Book PV in every scenario, see hedging.portfolio.npv_many."""
+        return npv_many(self.positions().items(), market_data_set, per_instrument)
+
+    def save_snapshot(self, path):
+        """Persist the book as a columnar snapshot.
+
+        Load it back with deal_store.CompactPortfolio.load_snapshot, which
+        memory-maps the deals instead of rebuilding Deal objects.
+        """
+        CompactPortfolio.from_portfolio(self).save_snapshot(path)
+
+    def deals_with_counterparty(self, counterparty):
+        return list(self._deals_by_counterparty.get(counterparty, {}).values())
+
+    def deals_on_instrument(self, instrument):
+        return list(self._deals_by_instrument.get(instrument, {}).values())
+
+    def deals_created_between(self, start=None, end=None):
+        """Deals with start <= creation_time < end, oldest first.
 
-    def deals_on_instrument(self):
-        pass
+        Either bound may be None for an open ended range.
+        """
+        lower = 0 if start is None else bisect_left(self._creation_index, (start,))
+        upper = len(self._creation_index) if end is None \
+            else bisect_left(self._creation_index, (end,))
+        return [
+            self.deals[deal_id]
+            for _, deal_id in self._creation_index[lower:upper]
+        ]
 
 
 class Deal:
@@ -48,6 +114,7 @@ class Deal:
         self.quantity = quantity
         self.creation_time = creation_time or datetime.datetime.now()
         self.counterparty = counterparty
+        self.deal_id = None
 
     def __repr__(self):
         return f'Deal(instrument={self.instrument}, ' \
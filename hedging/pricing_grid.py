@@ -0,0 +1,220 @@
+"""
+Precomputed pricing grids for engines too slow to call once per scenario.
+
+The option is priced once on a grid over spot, and optionally vol, and
+scenarios are then priced from an interpolant. Grids are refined by doubling
+the number of intervals: both node families nest, so every refinement only
+prices the new nodes, and the gap between the coarse interpolant and the new
+prices is the error estimate reported with the grid. It measures the coarse
+grid, so it overstates the error of the refined grid that is kept.
+
+Monte Carlo engines price the grid on one fixed seed, so the grid values are
+smooth in spot and vol and do not chase simulation noise.
+"""
+import logging
+import numpy as np
+from numpy.polynomial import chebyshev
+from hedging.greeks import common_random_numbers_copy
+
+logger = logging.getLogger(__name__)
+
+CHEBYSHEV = 'CHEBYSHEV'
+PCHIP = 'PCHIP'
+INTERPOLANTS = [CHEBYSHEV, PCHIP]
+
+
+def grid_nodes(low, high, n_nodes, method=CHEBYSHEV):
+    """Ascending nodes on [low, high].
+
+    Chebyshev-Lobatto nodes for CHEBYSHEV, equally spaced nodes for PCHIP.
+    Either family with 2 * n - 1 nodes contains the family with n nodes.
+    """
+    if method == CHEBYSHEV:
+        unit = -np.cos(np.pi * np.arange(n_nodes) / (n_nodes - 1))
+    elif method == PCHIP:
+        unit = np.linspace(-1, 1, n_nodes)
+    else:
+        raise NotImplementedError(f"Unknown interpolant {method}.")
+    return low + (unit + 1) * (high - low) / 2
+
+
+def _to_unit(values, low, high):
+    return (2 * values - (low + high)) / (high - low)
+
+
+class PricingGrid:
+    """Interpolated prices of one option over spot and optionally vol.
+
+    :param option: Option with a price_many method
+    :param tuple spot_range: (low, high) spots covered by the grid
+    :param float vol: Volatility when the grid is over spot only
+    :param tuple vol_range: (low, high) vols, makes the grid two dimensional
+    :param float rfr: Risk free rate
+    :param float div: Dividend yield
+    :param str method: CHEBYSHEV or PCHIP, the latter is monotone preserving
+    :param int initial_nodes: Nodes per dimension of the first grid
+    :param int max_nodes: Nodes per dimension refinement stops at
+    :param float tolerance: Absolute price error refinement stops below
+    """
+
+    def __init__(
+            self,
+            option,
+            spot_range,
+            vol=None,
+            vol_range=None,
+            rfr=0.02,
+            div=0,
+            method=CHEBYSHEV,
+            initial_nodes=9,
+            max_nodes=65,
+            tolerance=1e-3
+    ):
+        if method not in INTERPOLANTS:
+            raise NotImplementedError(f"Unknown interpolant {method}.")
+        if (vol is None) == (vol_range is None):
+            raise ValueError('Give either a fixed vol or a vol_range.')
+        if initial_nodes < 5:
+            raise ValueError(f"Need at least 5 nodes, not {initial_nodes}.")
+        self.option = common_random_numbers_copy(option)
+        self.spot_range = tuple(spot_range)
+        self.vol = vol
+        self.vol_range = None if vol_range is None else tuple(vol_range)
+        self.rfr = rfr
+        self.div = div
+        self.method = method
+        self.tolerance = tolerance
+        self.n_evaluations = 0
+        self.error_bound = np.inf
+        self.spot_nodes = None
+        self.vol_nodes = None
+        self.values = None
+        self._interpolant = None
+        self._fit(initial_nodes, max_nodes)
+
+    @property
+    def two_dimensional(self):
+        return self.vol_range is not None
+
+    def _nodes(self, n_nodes):
+        spot_nodes = grid_nodes(*self.spot_range, n_nodes, self.method)
+        if not self.two_dimensional:
+            return spot_nodes, None
+        return spot_nodes, grid_nodes(*self.vol_range, n_nodes, self.method)
+
+    def _price_nodes(self, spot_nodes, vol_nodes, known=None):
+        """Engine prices on the grid, reusing the values of nested coarse nodes.
+
+        :param known: Values on the previous grid, which sits on every other
+            node of this one
+        """
+        if vol_nodes is None:
+            spots, vols = spot_nodes, np.full(spot_nodes.shape, self.vol)
+        else:
+            spots, vols = np.meshgrid(spot_nodes, vol_nodes, indexing='ij')
+        values = np.empty(spots.shape)
+        new = np.ones(spots.shape, dtype=bool)
+        if known is not None:
+            coarse = (slice(None, None, 2),) * values.ndim
+            values[coarse] = known
+            new[coarse] = False
+        values[new] = self.option.price_many(
+            spots[new], vols[new], self.rfr, self.div
+        )
+        self.n_evaluations += int(new.sum())
+        return values
+
+    def _build_interpolant(self, spot_nodes, vol_nodes, values):
+        if self.method == CHEBYSHEV:
+            # Interpolating coefficients, one square solve per dimension
+            spot_vander = chebyshev.chebvander(
+                _to_unit(spot_nodes, *self.spot_range), len(spot_nodes) - 1
+            )
+            coefficients = np.linalg.solve(spot_vander, values)
+            if vol_nodes is not None:
+                vol_vander = chebyshev.chebvander(
+                    _to_unit(vol_nodes, *self.vol_range), len(vol_nodes) - 1
+                )
+                coefficients = np.linalg.solve(vol_vander, coefficients.T).T
+            return coefficients
+        from scipy.interpolate import PchipInterpolator
+        from scipy.interpolate import RegularGridInterpolator
+
+        if vol_nodes is None:
+            return PchipInterpolator(spot_nodes, values)
+        return RegularGridInterpolator(
+            (spot_nodes, vol_nodes), values, method='pchip'
+        )
+
+    def _evaluate(self, interpolant, spots, vols):
+        if self.method == CHEBYSHEV:
+            spots = _to_unit(spots, *self.spot_range)
+            if not self.two_dimensional:
+                return chebyshev.chebval(spots, interpolant)
+            return chebyshev.chebval2d(
+                spots, _to_unit(vols, *self.vol_range), interpolant
+            )
+        if not self.two_dimensional:
+            return interpolant(spots)
+        return interpolant(np.stack([spots, vols], axis=-1))
+
+    def _fit(self, n_nodes, max_nodes):
+        spot_nodes, vol_nodes = self._nodes(n_nodes)
+        values = self._price_nodes(spot_nodes, vol_nodes)
+        interpolant = self._build_interpolant(spot_nodes, vol_nodes, values)
+        while 2 * n_nodes - 1 <= max_nodes:
+            n_nodes = 2 * n_nodes - 1
+            fine_spots, fine_vols = self._nodes(n_nodes)
+            fine_values = self._price_nodes(fine_spots, fine_vols, known=values)
+            if fine_vols is None:
+                grid_spots, grid_vols = fine_spots, None
+            else:
+                grid_spots, grid_vols = np.meshgrid(
+                    fine_spots, fine_vols, indexing='ij'
+                )
+            self.error_bound = float(np.max(np.abs(
+                self._evaluate(interpolant, grid_spots, grid_vols) - fine_values
+            )))
+            spot_nodes, vol_nodes, values = fine_spots, fine_vols, fine_values
+            interpolant = self._build_interpolant(spot_nodes, vol_nodes, values)
+            logger.debug(
+                f"{n_nodes} node grid, estimated error {self.error_bound:.2e}."
+            )
+            if self.error_bound < self.tolerance:
+                break
+        else:
+            logger.warning(
+                f"Pricing grid stopped at {n_nodes} nodes with estimated error "
+                f"{self.error_bound:.2e} above tolerance {self.tolerance:.2e}."
+            )
+        self.spot_nodes, self.vol_nodes, self.values = spot_nodes, vol_nodes, values
+        self._interpolant = interpolant
+        logger.info(
+            f"Pricing grid fitted with {self.n_evaluations} engine prices, "
+            f"estimated error {self.error_bound:.2e}."
+        )
+
+    def price_many(self, spots, vols=None):
+        """Interpolated prices of scenarios inside the grid.
+
+        :param spots: Scenario spots
+        :param vols: Scenario vols, required by a grid over vol
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        if self.two_dimensional and vols is None:
+            raise ValueError('A grid over vol needs scenario vols.')
+        spots = np.asarray(spots, dtype=float)
+        if self.two_dimensional:
+            spots, vols = np.broadcast_arrays(spots, np.asarray(vols, dtype=float))
+            self._check_range('vol', vols, self.vol_range)
+        self._check_range('spot', spots, self.spot_range)
+        return np.asarray(self._evaluate(self._interpolant, spots, vols))
+
+    @staticmethod
+    def _check_range(name, values, bounds):
+        low, high = bounds
+        if values.size and (values.min() < low or values.max() > high):
+            raise ValueError(
+                f"Scenario {name}s [{values.min()}, {values.max()}] fall "
+                f"outside the grid's [{low}, {high}]."
+            )
@@ -0,0 +1,117 @@
+"""
+Pricing sessions that wire a QuantLib process once and reprice scenarios by
+mutating SimpleQuotes, letting QuantLib's observer machinery recalculate.
+"""
+import numpy as np
+import QuantLib as ql
+from hedging import tracing
+
+
+def quote_bsm_process(spot_quote, vol_quote, rfr_quote, div_quote, today=None):
+    """Build a BSM process whose market inputs are live SimpleQuotes.
+
+    :param ql.SimpleQuote spot_quote: Spot price quote
+    :param ql.SimpleQuote vol_quote: Black volatility quote
+    :param ql.SimpleQuote rfr_quote: Risk free rate quote
+    :param ql.SimpleQuote div_quote: Dividend yield quote
+    :param ql.Date today: Curve reference date, defaults to today
+    :return ql.BlackScholesMertonProcess: Process observing the quotes
+    """
+    today = today or ql.Date().todaysDate()
+    rfr_ts = ql.YieldTermStructureHandle(
+        ql.FlatForward(today, ql.QuoteHandle(rfr_quote), ql.Actual365Fixed())
+    )
+    div_ts = ql.YieldTermStructureHandle(
+        ql.FlatForward(today, ql.QuoteHandle(div_quote), ql.Actual365Fixed())
+    )
+    vol_ts = ql.BlackVolTermStructureHandle(
+        ql.BlackConstantVol(
+            today, ql.NullCalendar(), ql.QuoteHandle(vol_quote),
+            ql.Actual365Fixed()
+        )
+    )
+    return ql.BlackScholesMertonProcess(
+        ql.QuoteHandle(spot_quote), div_ts, rfr_ts, vol_ts
+    )
+
+
+def create_bsm_process(spot, vol, rfr, div):
+    """Build a BSM process for fixed market inputs."""
+    return quote_bsm_process(
+        ql.SimpleQuote(spot),
+        ql.SimpleQuote(vol),
+        ql.SimpleQuote(rfr),
+        ql.SimpleQuote(div)
+    )
+
+
+class PricingSession:
+    """Reprice one option under many market scenarios.
+
+    The process, engine and QuantLib instrument are built once. Each call to
+    price only updates the spot, vol, rate and dividend quotes before asking
+    for the NPV again.
+
+    Options on one of their NUMPY_ENGINES have no QuantLib engine, the
+    session prices them through the option's vectorised _npv_many, which
+    draws its Monte Carlo paths once per option.
+    """
+
+    def __init__(self, option, spot=100, vol=0.1, rfr=0.02, div=0):
+        self.option = option
+        self.spot_quote = ql.SimpleQuote(spot)
+        self.vol_quote = ql.SimpleQuote(vol)
+        self.rfr_quote = ql.SimpleQuote(rfr)
+        self.div_quote = ql.SimpleQuote(div)
+        self.process = quote_bsm_process(
+            self.spot_quote, self.vol_quote, self.rfr_quote, self.div_quote
+        )
+        self.option_object = option.create_option_object()
+        self.engine = None
+        self.reset_engine()
+
+    @tracing.traced('reset_engine')
+    def reset_engine(self):
+        """Rebuild the pricing engine, e.g. after the option's mc_params change."""
+        if self.is_numpy:
+            self.engine = None
+            return
+        self.engine = self.option.option_model(process=self.process)
+        self.option_object.setPricingEngine(self.engine)
+
+    @property
+    def is_numpy(self):
+        return self.option.pricing_engine in self.option.NUMPY_ENGINES
+
+    def set_market(self, spot, vol, rfr, div):
+        self.spot_quote.setValue(spot)
+        self.vol_quote.setValue(vol)
+        self.rfr_quote.setValue(rfr)
+        self.div_quote.setValue(div)
+
+    def price(self, spot, vol, rfr, div):
+        if self.is_numpy:
+            return float(self.option._npv_many(spot, vol, rfr, div))
+        self.set_market(spot=spot, vol=vol, rfr=rfr, div=div)
+        with tracing.span('NPV'):
+            return self.option_object.NPV()
+
+    def price_many(self, spots, vols, rfrs, divs):
+        """Price every scenario of the broadcast market input arrays.
+
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        if self.is_numpy:
+            return self.option._npv_many(spots, vols, rfrs, divs)
+        spots, vols, rfrs, divs = np.broadcast_arrays(
+            np.asarray(spots, dtype=float),
+            np.asarray(vols, dtype=float),
+            np.asarray(rfrs, dtype=float),
+            np.asarray(divs, dtype=float)
+        )
+        prices = np.empty(spots.shape)
+        for idx in np.ndindex(spots.shape):
+            prices[idx] = self.price(
+                spot=spots[idx], vol=vols[idx], rfr=rfrs[idx], div=divs[idx]
+            )
+        return prices
@@ -0,0 +1,181 @@
+"""
+Revalue an option over many market scenarios on a pool of processes.
+
+Each worker builds its QuantLib pricing session once, then prices batches of
+scenarios by updating quotes. Monte Carlo engines are reseeded per scenario
+from (base_seed, scenario index), so every scenario gets the same price
+whatever the number of workers or the batch size. The NumPy Monte Carlo
+engine prices every scenario against one set of normals, so its seed is
+fixed once in the parent before the option is shipped and every worker
+draws the same common random numbers. Other engines are deterministic and
+keep the engine the session built.
+"""
+import copy
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from hedging import tracing
+
+logger = logging.getLogger(__name__)
+
+_worker_session = None
+
+
+def scenario_seed(base_seed, index):
+    """Deterministic, non-zero QuantLib seed for one scenario.
+
+    QuantLib treats a zero seed as 'seed from the clock', so zero is mapped
+    to one.
+    """
+    seed = np.random.SeedSequence([base_seed, index]).generate_state(1)[0]
+    return int(seed) or 1
+
+
+def _worker_copy(option):
+    """Deep copy of option to ship to workers, without its caches.
+
+    The pricing cache and any cached NumPy Monte Carlo paths stay with the
+    caller's option rather than being pickled to every worker.
+    """
+    option = copy.copy(option)
+    option.pricing_cache = None
+    if getattr(option, '_numpy_mc_engine', None) is not None:
+        option._numpy_mc_engine = None
+    option = copy.deepcopy(option)
+    option.mc_params = dict(option.mc_params)
+    return option
+
+
+def _fix_common_seed(option, base_seed):
+    """Fix an unseeded NumPy Monte Carlo option's seed for every worker."""
+    if option.pricing_engine != getattr(option, 'NUMPY_MONTE_CARLO', None):
+        return
+    if option.mc_params.get('seed') is not None:
+        return
+    if base_seed is None:
+        # Draw one seed here so all workers still share the same normals
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    else:
+        seed = scenario_seed(base_seed, 0)
+    option.mc_params['seed'] = seed
+
+
+def _init_worker(option):
+    global _worker_session
+    _worker_session = option.pricing_session()
+
+
+def _revalue_batch(start, spots, vols, rfrs, divs, base_seed, session=None):
+    session = session or _worker_session
+    option = session.option
+    if session.is_numpy:
+        # One vectorised pass against the seed fixed in the parent
+        return session.price_many(spots, vols, rfrs, divs)
+    reseed = base_seed is not None and option.pricing_engine == option.MONTE_CARLO
+    prices = np.empty(len(spots))
+    for offset in range(len(spots)):
+        if reseed:
+            session.option.mc_params['seed'] = scenario_seed(
+                base_seed, start + offset
+            )
+            session.reset_engine()
+        prices[offset] = session.price(
+            spot=spots[offset], vol=vols[offset], rfr=rfrs[offset], div=divs[offset]
+        )
+    return prices
+
+
+class ScenarioExecutor:
+    """Spread scenario revaluation of one option over worker processes.
+
+    Use as a context manager to keep the pool alive across revalue calls.
+
+    :param option: Option to revalue; workers price private copies of it
+    :param int n_workers: Number of processes, 1 prices in this process
+    :param int batch_size: Scenarios sent to a worker per task
+    :param int base_seed: Seed for per-scenario MC seeds, None keeps the
+        option's own mc_params seed for every scenario. Also seeds the common
+        normals of an unseeded NumPy Monte Carlo option.
+    """
+
+    def __init__(self, option, n_workers=None, batch_size=64, base_seed=42):
+        self.option = _worker_copy(option)
+        _fix_common_seed(self.option, base_seed)
+        self.n_workers = n_workers
+        self.batch_size = batch_size
+        self.base_seed = base_seed
+        self._pool = None
+        # In process pricing session, built on the first serial revalue
+        self._session = None
+
+    def __enter__(self):
+        self._start_pool()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def _start_pool(self):
+        if self._pool is None and self.n_workers != 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(self.option,)
+            )
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @tracing.traced()
+    def revalue(self, spots, vols, rfrs, divs):
+        """Price every scenario, returning prices in scenario order.
+
+        :return np.ndarray: Prices with the broadcast shape of the inputs
+        """
+        spots, vols, rfrs, divs = np.broadcast_arrays(
+            np.asarray(spots, dtype=float),
+            np.asarray(vols, dtype=float),
+            np.asarray(rfrs, dtype=float),
+            np.asarray(divs, dtype=float)
+        )
+        shape = spots.shape
+        spots, vols, rfrs, divs = [
+            np.ravel(x) for x in (spots, vols, rfrs, divs)
+        ]
+        starts = range(0, spots.size, self.batch_size)
+        batches = [
+            (
+                start,
+                spots[start:start + self.batch_size],
+                vols[start:start + self.batch_size],
+                rfrs[start:start + self.batch_size],
+                divs[start:start + self.batch_size],
+                self.base_seed
+            )
+            for start in starts
+        ]
+        logger.info(
+            f"Revaluing {spots.size} scenarios in {len(batches)} batches."
+        )
+
+        if self.n_workers == 1:
+            if self._session is None:
+                self._session = self.option.pricing_session()
+            results = [
+                _revalue_batch(*batch, session=self._session)
+                for batch in batches
+            ]
+        else:
+            owns_pool = self._pool is None
+            self._start_pool()
+            try:
+                results = list(self._pool.map(_revalue_batch, *zip(*batches)))
+            finally:
+                if owns_pool:
+                    self.close()
+
+        if not results:
+            return np.empty(shape)
+        return np.concatenate(results).reshape(shape)
@@ -1,11 +1,70 @@
 """
 Module to produce shocks for risk factors.
 """
+import warnings
+from functools import lru_cache
 import numpy as np
-from matplotlib import pyplot
+from hedging import tracing
 
+PSEUDORANDOM = 'pseudorandom'
+ANTITHETIC = 'antithetic'
+SOBOL = 'sobol'
+LATIN_HYPERCUBE = 'latin_hypercube'
+SHOCK_METHODS = [PSEUDORANDOM, ANTITHETIC, SOBOL, LATIN_HYPERCUBE]
 
-def generate_log_normal_shocks(vol, num_shocks=780):
+# Eigenvalue floor used to repair correlation matrices that are not
+# positive definite
+MIN_EIGENVALUE = 1e-10
+
+
+def iter_standard_normal_blocks(
+        num_draws, n_dims=1, block_size=100000, method=PSEUDORANDOM, seed=None
+):
+    """Yield blocks of standard normal draws for a sampling method.
+
+    pseudorandom: independent draws.
+    antithetic: every block holds pairs z, -z.
+    sobol: scrambled Sobol points mapped through the inverse normal cdf.
+    latin_hypercube: one draw per equal probability stratum of each
+        dimension, within every block.
+
+    :param int num_draws: Total number of rows to draw
+    :param int n_dims: Number of dimensions (columns)
+    :param int block_size: Maximum rows per yielded block
+    :param str method: One of SHOCK_METHODS
+    :param seed: Seed for the random generator or QMC scrambling
+    :return: Iterator of (rows, n_dims) arrays
+    """
+    if method not in SHOCK_METHODS:
+        raise NotImplementedError(
+            f"Shock method must be one of {SHOCK_METHODS}, not {method}."
+        )
+    if method in [SOBOL, LATIN_HYPERCUBE]:
+        # scipy is slow to import, only the quasi random methods need it
+        from scipy.special import ndtri
+        from scipy.stats import qmc
+    rng = np.random.default_rng(seed)
+    sobol_engine = qmc.Sobol(n_dims, scramble=True, seed=rng) \
+        if method == SOBOL else None
+
+    for start in range(0, num_draws, block_size):
+        rows = min(block_size, num_draws - start)
+        if method == PSEUDORANDOM:
+            yield rng.standard_normal((rows, n_dims))
+        elif method == ANTITHETIC:
+            half = rng.standard_normal(((rows + 1) // 2, n_dims))
+            yield np.concatenate([half, -half])[:rows]
+        elif method == SOBOL:
+            with warnings.catch_warnings():
+                # Sobol balance warnings for non power of two counts
+                warnings.simplefilter('ignore', UserWarning)
+                yield ndtri(sobol_engine.random(rows))
+        else:
+            yield ndtri(qmc.LatinHypercube(n_dims, seed=rng).random(rows))
+
+
+@tracing.traced()
+def generate_log_normal_shocks(vol, num_shocks=780, method=PSEUDORANDOM, seed=None):
     """Generate a vector of log normal shocks with given volatility.
 
     Log shock = exp(vol * N(0,1))
@@ -13,31 +72,212 @@ def generate_log_normal_shocks(vol, num_shocks=780):
 
     :param float vol: Volatility in standard units
     :param int num_shocks: Number of shocks to produce
+    :param str method: Sampling method, one of SHOCK_METHODS
+    :param seed: Seed for the sampling method; pseudorandom shocks without
+        a seed keep using the global numpy random state
     :return [int]: Vector of shocks
     """
 
     if vol < 0:
         raise TypeError(f"Vol must be zero or greater, not {vol}.")
 
-    rand_norm_vector = np.random.normal(loc=0, scale=1, size=num_shocks)
+    if method == PSEUDORANDOM and seed is None:
+        rand_norm_vector = np.random.normal(loc=0, scale=1, size=num_shocks)
+    else:
+        # No blocks are yielded for zero shocks
+        rand_norm_vector = next(iter_standard_normal_blocks(
+            num_shocks, block_size=max(num_shocks, 1), method=method, seed=seed
+        ), np.empty((0, 1)))[:, 0]
     shock_vector = np.exp(vol * rand_norm_vector)
 
     return shock_vector
 
 
+def nearest_correlation(corr, min_eigenvalue=MIN_EIGENVALUE):
+    """Repair a near-singular or indefinite correlation matrix.
 
-def main():
-    shocks = generate_log_normal_shocks(vol=0.6, num_shocks=10000)
-    rel_shocks = shocks + 1
+    Eigenvalues are floored at min_eigenvalue and the result is rescaled back
+    to a unit diagonal.
+
+    :param np.ndarray corr: Symmetric matrix with unit diagonal
+    :param float min_eigenvalue: Smallest eigenvalue to keep
+    :return np.ndarray: Positive definite correlation matrix
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(corr)
+    eigenvalues = np.maximum(eigenvalues, min_eigenvalue)
+    repaired = (eigenvectors * eigenvalues) @ eigenvectors.T
+    scale = 1 / np.sqrt(np.diag(repaired))
+    repaired = repaired * np.outer(scale, scale)
+    np.fill_diagonal(repaired, 1)
+    return repaired
+
+
+@lru_cache(maxsize=32)
+def _cholesky_from_bytes(n_assets, corr_bytes):
+    corr = np.frombuffer(corr_bytes, dtype=float).reshape(n_assets, n_assets)
+    try:
+        factor = np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        factor = np.linalg.cholesky(nearest_correlation(corr))
+    factor.flags.writeable = False
+    return factor
+
+
+def cholesky_factor(corr):
+    """Cached lower triangular Cholesky factor of a correlation matrix.
+
+    Matrices that are not positive definite are first repaired with
+    nearest_correlation.
+
+    :param corr: (n_assets, n_assets) correlation matrix
+    :return np.ndarray: Read-only lower triangular factor
+    """
+    corr = np.ascontiguousarray(corr, dtype=float)
+    if corr.ndim != 2 or corr.shape[0] != corr.shape[1]:
+        raise ValueError(f"Correlation matrix must be square, not {corr.shape}.")
+    if not np.allclose(corr, corr.T) or not np.allclose(np.diag(corr), 1):
+        raise ValueError(
+            "Correlation matrix must be symmetric with a unit diagonal."
+        )
+    return _cholesky_from_bytes(corr.shape[0], corr.tobytes())
+
+
+def iter_correlated_log_normal_shocks(
+        vols, corr, num_shocks=780, block_size=100000, method=PSEUDORANDOM,
+        seed=None
+):
+    """Yield blocks of correlated log normal shocks for several assets.
+
+    Log shock_i = exp(vol_i * (L z)_i), z ~ N(0, I), L L^T = corr
+
+    :param vols: Volatility per asset in standard units
+    :param corr: (n_assets, n_assets) correlation matrix
+    :param int num_shocks: Total number of shocks (rows) to produce
+    :param int block_size: Maximum rows per yielded block
+    :param str method: Sampling method, one of SHOCK_METHODS
+    :param seed: Seed for the random generator
+    :return: Iterator of (rows, n_assets) shock arrays
+    """
+    vols = np.asarray(vols, dtype=float)
+    if np.any(vols < 0):
+        raise TypeError(f"Vols must be zero or greater, not {vols}.")
+    factor = cholesky_factor(corr)
+    if factor.shape[0] != vols.size:
+        raise ValueError(
+            f"Got {vols.size} vols for a {factor.shape[0]} asset correlation."
+        )
 
-    prices=[None]*len(shocks)
-    prices[0]=1
-    for i in range(1,len(shocks)):
-        prices[i]=prices[i-1]*shocks[i-1]
-    #X = np.linspace(0, len(shocks),10000)
+    for rand_norm_block in iter_standard_normal_blocks(
+            num_shocks, vols.size, block_size=block_size, method=method, seed=seed
+    ):
+        yield np.exp(vols * (rand_norm_block @ factor.T))
+
+
+@tracing.traced()
+def generate_correlated_log_normal_shocks(
+        vols, corr, num_shocks=780, block_size=100000, method=PSEUDORANDOM,
+        seed=None
+):
+    """Generate a (num_shocks, n_assets) matrix of correlated log normal shocks.
+
+    See iter_correlated_log_normal_shocks; blocks are written into one
+    preallocated matrix so temporaries stay bounded by block_size.
+    """
+    vols = np.asarray(vols, dtype=float)
+    shock_matrix = np.empty((num_shocks, vols.size))
+    start = 0
+    for block in iter_correlated_log_normal_shocks(
+            vols, corr, num_shocks=num_shocks, block_size=block_size,
+            method=method, seed=seed
+    ):
+        shock_matrix[start:start + len(block)] = block
+        start += len(block)
+
+    return shock_matrix
+
+
+def iter_gbm_paths(
+        spot,
+        vol,
+        n_paths,
+        n_steps,
+        drift=0,
+        dt=1 / 252,
+        dtype=np.float64,
+        chunk_size=10000,
+        method=PSEUDORANDOM,
+        seed=None
+):
+    """Yield chunks of geometric Brownian motion price paths.
+
+    log S(t + dt) = log S(t) + (drift - vol**2 / 2) dt + vol sqrt(dt) N(0,1)
+
+    Log increments are summed along each path in float64 and only then cast
+    to dtype, so float32 storage does not accumulate rounding error.
+
+    :param float spot: Initial price S(0)
+    :param float vol: Annualised volatility in standard units
+    :param int n_paths: Number of paths
+    :param int n_steps: Number of time steps per path
+    :param float drift: Annualised drift
+    :param float dt: Time step in years
+    :param dtype: Element type of the yielded paths, e.g. np.float32
+    :param int chunk_size: Maximum paths per yielded chunk
+    :param str method: Sampling method, one of SHOCK_METHODS
+    :param seed: Seed for the random generator
+    :return: Iterator of (rows, n_steps) arrays of S(dt), ..., S(n_steps dt)
+    """
+    if vol < 0:
+        raise TypeError(f"Vol must be zero or greater, not {vol}.")
+
+    step_drift = (drift - 0.5 * vol ** 2) * dt
+    step_vol = vol * np.sqrt(dt)
+    for log_paths in iter_standard_normal_blocks(
+            n_paths, n_steps, block_size=chunk_size, method=method, seed=seed
+    ):
+        log_paths *= step_vol
+        log_paths += step_drift
+        np.cumsum(log_paths, axis=1, out=log_paths)
+        np.exp(log_paths, out=log_paths)
+        log_paths *= spot
+        yield log_paths.astype(dtype, copy=False)
+
+
+@tracing.traced()
+def generate_gbm_paths(
+        spot,
+        vol,
+        n_paths,
+        n_steps,
+        drift=0,
+        dt=1 / 252,
+        dtype=np.float64,
+        chunk_size=10000,
+        method=PSEUDORANDOM,
+        seed=None
+):
+    """Generate an (n_paths, n_steps) matrix of GBM price paths.
+
+    See iter_gbm_paths; chunks are written into one preallocated matrix of
+    the requested dtype.
+    """
+    paths = np.empty((n_paths, n_steps), dtype=dtype)
+    start = 0
+    for chunk in iter_gbm_paths(
+            spot, vol, n_paths, n_steps, drift=drift, dt=dt, dtype=dtype,
+            chunk_size=chunk_size, method=method, seed=seed
+    ):
+        paths[start:start + len(chunk)] = chunk
+        start += len(chunk)
+
+    return paths
+
+
+def main():
+    from hedging import plotting
 
-    pyplot.plot(prices[0:500])
-    pyplot.show()
+    prices = generate_gbm_paths(spot=1, vol=0.6, n_paths=1, n_steps=10000, dt=1)[0]
+    plotting.plot_path(prices[0:500])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,115 @@
+"""
+Sensitivity based risk P&L from a Taylor expansion in the base Greeks.
+
+Risk engines usually produce RTPL from sensitivities rather than a full
+revaluation per scenario. The Greeks are computed once at the base market
+and every scenario P&L is then
+
+    delta * dS + 0.5 * gamma * dS**2 + vega * dvol + rho * drfr + theta * dt
+
+which is plain array arithmetic, so millions of shocks cost little more than
+the one set of Greeks. The P&L vector can be passed straight to pla_stats as
+risk_pnl, and explain_error measures what the expansion misses against a
+full revaluation.
+"""
+from collections import namedtuple
+import numpy as np
+
+ExplainResult = namedtuple(
+    'ExplainResult',
+    ['mean_error', 'rmse', 'max_abs_error', 'unexplained_fraction']
+)
+
+# Bound on scenarios evaluated at once, keeps temporaries small
+CHUNK_SIZE = 2 ** 20
+
+
+def explain_error(full_pnl, sensitivity_pnl):
+    """Error of sensitivity P&Ls against full revaluation P&Ls.
+
+    :param full_pnl: P&Ls from full revaluation
+    :param sensitivity_pnl: P&Ls from the Taylor expansion, same shape
+    :return ExplainResult: Mean error, RMSE and largest absolute error of
+        sensitivity minus full P&L, and the fraction of the full P&L
+        variance the expansion leaves unexplained
+    """
+    full_pnl = np.asarray(full_pnl, dtype=float)
+    sensitivity_pnl = np.asarray(sensitivity_pnl, dtype=float)
+    if full_pnl.shape != sensitivity_pnl.shape:
+        raise ValueError(
+            f"P&L shapes differ: {full_pnl.shape} and {sensitivity_pnl.shape}."
+        )
+    errors = sensitivity_pnl - full_pnl
+    full_variance = np.var(full_pnl)
+    return ExplainResult(
+        mean_error=float(np.mean(errors)),
+        rmse=float(np.sqrt(np.mean(errors ** 2))),
+        max_abs_error=float(np.max(np.abs(errors))),
+        unexplained_fraction=float(
+            np.var(errors) / full_variance if full_variance > 0 else 0.0
+        )
+    )
+
+
+class SensitivityPnlModel:
+    """Delta-gamma-vega-rho-theta P&L around one base market.
+
+    :param greeks: black_scholes.Greeks of the position at the base market,
+        scalars, or arrays summed over a portfolio beforehand
+    :param float spot: Base spot
+    :param float vol: Base volatility
+    :param float rfr: Base risk free rate
+    :param float quantity: Position size the Greeks are scaled by
+    """
+
+    def __init__(self, greeks, spot, vol, rfr, quantity=1):
+        self.greeks = greeks
+        self.spot = spot
+        self.vol = vol
+        self.rfr = rfr
+        self.delta = quantity * float(greeks.delta)
+        self.gamma = quantity * float(greeks.gamma)
+        self.vega = quantity * float(greeks.vega)
+        self.theta = quantity * float(greeks.theta)
+        self.rho = quantity * float(greeks.rho)
+
+    @classmethod
+    def from_option(cls, option, spot, vol, rfr, div, quantity=1):
+        """Model built from one greeks_many call on option at the base market."""
+        return cls(
+            option.greeks_many(spot, vol, rfr, div),
+            spot=spot, vol=vol, rfr=rfr, quantity=quantity
+        )
+
+    def pnl(self, spots, vols=None, rfrs=None, horizon=0):
+        """Taylor expansion P&L for every scenario.
+
+        :param spots: Scenario spots
+        :param vols: Scenario vols, None keeps the base vol
+        :param rfrs: Scenario risk free rates, None keeps the base rate
+        :param float horizon: Years the scenarios lie after the base date,
+            0 leaves out theta as for an instantaneous shock
+        :return np.ndarray: P&Ls with the broadcast shape of the inputs
+        """
+        spots, vols, rfrs = np.broadcast_arrays(
+            np.asarray(spots, dtype=float),
+            np.asarray(self.vol if vols is None else vols, dtype=float),
+            np.asarray(self.rfr if rfrs is None else rfrs, dtype=float)
+        )
+        shape = spots.shape
+        spots, vols, rfrs = [np.ravel(x) for x in (spots, vols, rfrs)]
+        pnl = np.empty(spots.size)
+        for start in range(0, spots.size, CHUNK_SIZE):
+            stop = start + CHUNK_SIZE
+            spot_move = spots[start:stop] - self.spot
+            pnl[start:stop] = (
+                (self.delta + 0.5 * self.gamma * spot_move) * spot_move
+                + self.vega * (vols[start:stop] - self.vol)
+                + self.rho * (rfrs[start:stop] - self.rfr)
+                + self.theta * horizon
+            )
+        return pnl.reshape(shape)
+
+    def explain(self, full_pnl, spots, vols=None, rfrs=None, horizon=0):
+        """Explain error of this model against full revaluation P&Ls."""
+        return explain_error(full_pnl, self.pnl(spots, vols, rfrs, horizon))
@@ -0,0 +1,264 @@
+"""
+Streaming, mergeable PLA statistics for P&L vectors too large to hold.
+
+P&L chunks are folded into quantile sketches: levels of values where a value
+on level h stands for 2**h original P&Ls. A level that outgrows its capacity
+is sorted and every other value is promoted to the next level, which can
+shift any empirical cdf by at most 2**h observations. The sketch records the
+sum of these shifts, so results are exact until the first compaction and
+carry a guaranteed error bound afterwards. Sketches from different workers
+merge level by level.
+
+KS only needs the two sketches. Spearman needs the ranks of each pair, so it
+takes a second pass over the data that maps each P&L to its mid-rank through
+the frozen sketches and accumulates mergeable moment sums. The P&L source
+must therefore be replayable: streaming_pla_stats takes a callable returning
+a fresh iterable of chunks, not a one-shot generator. Distributed workers run
+the first pass, merge their PlaAccumulators, then run the second pass each
+against the merged sketches and merge their RankCorrelationAccumulators.
+"""
+import logging
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+StreamingPlaResult = namedtuple(
+    'StreamingPlaResult',
+    [
+        'ks_value', 'ks_pvalue', 'spearman_value', 'spearman_pvalue',
+        'ks_error_bound', 'rank_error_bound'
+    ]
+)
+
+
+class QuantileSketch:
+    """Mergeable empirical cdf of a stream with a tracked rank error."""
+
+    def __init__(self, capacity=4096, seed=None):
+        if capacity < 2:
+            raise ValueError(f'Capacity must be at least 2, not {capacity}.')
+        self.capacity = capacity
+        self.levels = []
+        self.count = 0
+        self.rank_error = 0
+        self._rng = np.random.default_rng(seed)
+        self._cdf_view = None
+
+    @property
+    def error_bound(self):
+        """Worst case absolute error of cdf(), as a fraction of count."""
+        return self.rank_error / self.count if self.count else 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.count += values.size
+        self._add_to_level(0, values)
+        self._compact()
+
+    def merge(self, other):
+        if other.capacity != self.capacity:
+            raise ValueError(
+                f'Cannot merge sketches of capacity {self.capacity} & '
+                f'{other.capacity}.'
+            )
+        self.count += other.count
+        self.rank_error += other.rank_error
+        for level, values in enumerate(other.levels):
+            self._add_to_level(level, values)
+        self._compact()
+        return self
+
+    def _add_to_level(self, level, values):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+        self._cdf_view = None
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if values.size > self.capacity:
+                values = np.sort(values)
+                held_back = values[values.size - values.size % 2:]
+                offset = self._rng.integers(2)
+                promoted = values[offset:values.size - held_back.size:2]
+                self.levels[level] = held_back
+                self._add_to_level(level + 1, promoted)
+                self.rank_error += 2 ** level
+            level += 1
+
+    def _sorted_view(self):
+        if self._cdf_view is None:
+            values = np.concatenate(self.levels) if self.levels else np.empty(0)
+            weights = np.concatenate([
+                np.full(level_values.size, 2.0 ** level)
+                for level, level_values in enumerate(self.levels)
+            ]) if self.levels else np.empty(0)
+            order = np.argsort(values, kind='stable')
+            self._cdf_view = (
+                values[order], np.concatenate([[0.0], np.cumsum(weights[order])])
+            )
+        return self._cdf_view
+
+    def cdf(self, points, side='right'):
+        """Fraction of the stream <= points ('right') or < points ('left')."""
+        if not self.count:
+            raise ValueError('Cannot evaluate the cdf of an empty sketch.')
+        values, cum_weights = self._sorted_view()
+        idx = np.searchsorted(values, points, side=side)
+        return cum_weights[idx] / self.count
+
+    def retained_values(self):
+        return self._sorted_view()[0]
+
+
+class RankCorrelationAccumulator:
+    """Second pass accumulator of Spearman moments against frozen sketches.
+
+    Each P&L is mapped to its normalised mid-rank (F(x-) + F(x)) / 2, an
+    affine function of its average rank, so the Pearson correlation of these
+    values is exactly Spearman's rho whenever the sketches are exact.
+    """
+
+    def __init__(self, fo_sketch, risk_sketch):
+        self.fo_sketch = fo_sketch
+        self.risk_sketch = risk_sketch
+        self.count = 0
+        self.sums = np.zeros(5)
+
+    def update(self, fo_chunk, risk_chunk):
+        fo_chunk = np.asarray(fo_chunk, dtype=float).ravel()
+        risk_chunk = np.asarray(risk_chunk, dtype=float).ravel()
+        u = 0.5 * (
+            self.fo_sketch.cdf(fo_chunk, 'left')
+            + self.fo_sketch.cdf(fo_chunk, 'right')
+        )
+        v = 0.5 * (
+            self.risk_sketch.cdf(risk_chunk, 'left')
+            + self.risk_sketch.cdf(risk_chunk, 'right')
+        )
+        self.count += u.size
+        self.sums += [u.sum(), v.sum(), (u * u).sum(), (v * v).sum(), (u * v).sum()]
+
+    def merge(self, other):
+        self.count += other.count
+        self.sums += other.sums
+        return self
+
+    def spearman(self):
+        """Spearman correlation and two sided p-value of the pairs seen."""
+        from scipy.stats import t as student_t
+
+        n = self.count
+        sum_u, sum_v, sum_uu, sum_vv, sum_uv = self.sums
+        cov = sum_uv - sum_u * sum_v / n
+        var_u = sum_uu - sum_u ** 2 / n
+        var_v = sum_vv - sum_v ** 2 / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rho = np.clip(cov / np.sqrt(var_u * var_v), -1, 1)
+            dof = n - 2
+            t_stat = rho * np.sqrt(dof / ((rho + 1.0) * (1.0 - rho)))
+            pvalue = 2 * student_t.sf(np.abs(t_stat), dof)
+        return rho, pvalue
+
+
+class PlaAccumulator:
+    """First pass accumulator holding one sketch per P&L stream."""
+
+    def __init__(self, capacity=4096, seed=None):
+        seeds = np.random.SeedSequence(seed).spawn(2)
+        self.fo_sketch = QuantileSketch(capacity=capacity, seed=seeds[0])
+        self.risk_sketch = QuantileSketch(capacity=capacity, seed=seeds[1])
+
+    def update(self, fo_chunk, risk_chunk):
+        if len(fo_chunk) != len(risk_chunk):
+            raise ValueError(
+                f'P&L chunks must have equal length, not {len(fo_chunk)} & '
+                f'{len(risk_chunk)}.'
+            )
+        self.fo_sketch.update(fo_chunk)
+        self.risk_sketch.update(risk_chunk)
+
+    def merge(self, other):
+        self.fo_sketch.merge(other.fo_sketch)
+        self.risk_sketch.merge(other.risk_sketch)
+        return self
+
+    @property
+    def ks_error_bound(self):
+        return self.fo_sketch.error_bound + self.risk_sketch.error_bound
+
+    def ks(self):
+        """KS statistic and asymptotic p-value of the streams seen so far."""
+        points = np.concatenate([
+            self.fo_sketch.retained_values(), self.risk_sketch.retained_values()
+        ])
+        ks_value = np.max(np.abs(
+            self.fo_sketch.cdf(points) - self.risk_sketch.cdf(points)
+        ))
+        from scipy.stats import kstwo
+
+        n_fo = self.fo_sketch.count
+        n_risk = self.risk_sketch.count
+        ks_pvalue = np.clip(
+            kstwo.sf(ks_value, np.round(n_fo * n_risk / (n_fo + n_risk))), 0, 1
+        )
+        return ks_value, ks_pvalue
+
+    def rank_accumulator(self):
+        return RankCorrelationAccumulator(self.fo_sketch, self.risk_sketch)
+
+
+def streaming_pla_stats(chunk_source, capacity=4096, seed=None):
+    """Calculates pla stats from a replayable source of P&L chunks.
+
+    Two passes are made over the chunks, the first builds the sketches and
+    the second ranks each pair against them for Spearman.
+
+    :param chunk_source: Callable returning a fresh iterable of
+        (fo_chunk, risk_chunk) pairs; it is called once per pass and must
+        yield the same chunks each time.
+    :param int capacity: Values kept per sketch level, trading memory for
+        accuracy.
+    :param seed: Seed for the compaction offsets.
+    :return StreamingPlaResult: PLA statistics with KS and rank error bounds.
+    """
+    if not callable(chunk_source):
+        raise TypeError(
+            'chunk_source must be a callable returning a fresh iterable of '
+            'chunks, Spearman needs a second pass over the P&Ls.'
+        )
+    accumulator = PlaAccumulator(capacity=capacity, seed=seed)
+    for fo_chunk, risk_chunk in chunk_source():
+        accumulator.update(fo_chunk, risk_chunk)
+
+    rank_accumulator = accumulator.rank_accumulator()
+    for fo_chunk, risk_chunk in chunk_source():
+        rank_accumulator.update(fo_chunk, risk_chunk)
+    if rank_accumulator.count != accumulator.fo_sketch.count:
+        raise ValueError(
+            f'chunk_source yielded {accumulator.fo_sketch.count} P&Ls on the '
+            f'first pass and {rank_accumulator.count} on the second, it must '
+            f'replay the same chunks on every call.'
+        )
+
+    logger.info(
+        f"Calculated streaming pla statistics for {rank_accumulator.count} "
+        f"P&L pairs."
+    )
+    ks_value, ks_pvalue = accumulator.ks()
+    spearman_value, spearman_pvalue = rank_accumulator.spearman()
+
+    return StreamingPlaResult(
+        ks_value=ks_value,
+        ks_pvalue=ks_pvalue,
+        spearman_value=spearman_value,
+        spearman_pvalue=spearman_pvalue,
+        ks_error_bound=accumulator.ks_error_bound,
+        rank_error_bound=max(
+            accumulator.fo_sketch.error_bound,
+            accumulator.risk_sketch.error_bound
+        )
+    )
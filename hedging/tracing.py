@@ -0,0 +1,262 @@
+"""
+Hierarchical timing spans for the pricing hot paths.
+
+Code is instrumented with named spans, either the span context manager or
+the traced decorator, and spans opened inside other spans nest under them.
+Every span is recorded against its full path from the outermost span, so
+the same function called from two places is reported twice. Each path keeps
+its call count, total time and self time, total less the time spent in
+nested spans, as running sums, and a histogram of call durations in log
+spaced buckets from which percentiles are read. Memory per path is fixed
+however many calls are traced; percentiles are accurate to about 6%.
+
+Tracing is off by default and then span hands back a shared no-op context
+and traced functions pay one flag check per call. Switch it on with enable,
+the tracing context manager or by setting the HEDGING_TRACE environment
+variable to 1, true, yes or on.
+
+Spans are recorded per process, worker processes of a ScenarioExecutor keep
+their own records.
+
+    with tracing.tracing():
+        hedge_using_classes.hedge_ratio_stats()
+    tracing.log_report()
+    tracing.write_collapsed('hedging.folded')
+
+The collapsed file, one 'outer;inner;leaf microseconds' line per path
+weighted by self time, is the input flamegraph.pl and speedscope read.
+"""
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = [50, 95, 99]
+# Duration histogram: BUCKETS_PER_DECADE buckets per factor of ten from
+# MIN_DURATION, durations beyond the last bucket are counted in it
+MIN_DURATION = 1e-7
+BUCKETS_PER_DECADE = 20
+N_BUCKETS = 12 * BUCKETS_PER_DECADE
+
+SpanStats = namedtuple(
+    'SpanStats',
+    ['path', 'count', 'total', 'self_time', 'p50', 'p95', 'p99']
+)
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+_enabled = os.environ.get('HEDGING_TRACE', '').strip().lower() in TRUE_VALUES
+_local = threading.local()
+# {path tuple: _SpanRecord}
+_records = {}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget every recorded span."""
+    _records.clear()
+
+
+@contextmanager
+def tracing(clear=True):
+    """Enable tracing inside the with block, restoring the previous state.
+
+    :param bool clear: Forget spans recorded before the block
+    """
+    global _enabled
+    previous = _enabled
+    if clear:
+        reset()
+    _enabled = True
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _SpanRecord:
+    """Running totals and duration histogram of one span path."""
+
+    __slots__ = ['count', 'total', 'self_time', 'min', 'max', 'buckets']
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.self_time = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, elapsed, self_time):
+        self.count += 1
+        self.total += elapsed
+        self.self_time += self_time
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        if elapsed > MIN_DURATION:
+            bucket = min(
+                int(math.log10(elapsed / MIN_DURATION) * BUCKETS_PER_DECADE),
+                N_BUCKETS - 1
+            )
+        else:
+            bucket = 0
+        self.buckets[bucket] += 1
+
+    def percentile(self, q):
+        """Geometric middle of the bucket holding the q-th percentile."""
+        cumulative = np.cumsum(self.buckets)
+        bucket = int(np.searchsorted(cumulative, q / 100 * self.count))
+        middle = MIN_DURATION * 10 ** ((bucket + 0.5) / BUCKETS_PER_DECADE)
+        return min(max(middle, self.min), self.max)
+
+
+class _Span:
+    """Open span: [path, start time, time spent in child spans]"""
+
+    __slots__ = ['name', 'frame']
+
+    def __init__(self, name):
+        self.name = name
+        self.frame = None
+
+    def __enter__(self):
+        stack = _stack()
+        path = (stack[-1][0] if stack else ()) + (self.name,)
+        self.frame = [path, 0.0, 0.0]
+        stack.append(self.frame)
+        self.frame[1] = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        elapsed = time.perf_counter() - self.frame[1]
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1][2] += elapsed
+        record = _records.get(self.frame[0])
+        if record is None:
+            record = _records.setdefault(self.frame[0], _SpanRecord())
+        record.add(elapsed, elapsed - self.frame[2])
+        return False
+
+
+class _NullSpan:
+
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Context manager timing its block as a span called name."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def traced(name=None):
+    """Decorator running every call of the function in a span.
+
+    :param str name: Span name, defaults to the function's qualified name
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def span_stats():
+    """SpanStats per recorded span path, ordered by path.
+
+    Times are in seconds.
+    """
+    stats = []
+    for path in sorted(_records):
+        record = _records[path]
+        p50, p95, p99 = [record.percentile(q) for q in PERCENTILES]
+        stats.append(SpanStats(
+            path=path,
+            count=record.count,
+            total=record.total,
+            self_time=record.self_time,
+            p50=p50,
+            p95=p95,
+            p99=p99
+        ))
+    return stats
+
+
+def report():
+    """Indented table of span statistics, one line per span path."""
+    lines = [
+        f"{'span':<50} {'calls':>8} {'total s':>10} {'self s':>10} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    ]
+    for stats in span_stats():
+        label = '  ' * (len(stats.path) - 1) + stats.path[-1]
+        lines.append(
+            f"{label:<50} {stats.count:>8} {stats.total:>10.4f} "
+            f"{stats.self_time:>10.4f} {stats.p50 * 1e3:>9.3f} "
+            f"{stats.p95 * 1e3:>9.3f} {stats.p99 * 1e3:>9.3f}"
+        )
+    return '\n'.join(lines)
+
+
+def log_report():
+    logger.info(f"Span timings:\n{report()}")
+
+
+def collapsed_stacks():
+    """Collapsed stack lines, 'outer;inner microseconds' weighted by self time."""
+    return [
+        f"{';'.join(stats.path)} {int(round(stats.self_time * 1e6))}"
+        for stats in span_stats()
+    ]
+
+
+def write_collapsed(path):
+    """Write the collapsed stacks to path for flame graph tools."""
+    with open(path, 'w') as collapsed_file:
+        for line in collapsed_stacks():
+            collapsed_file.write(line + '\n')
@@ -23,7 +23,7 @@ from bermudan_option import BermudanOption
 def option_example():
     asset_name = 'aapl'
     strike = 100
-    maturity = ql.Date(25, 10, 2025)
+    maturity = ql.Date().todaysDate() + ql.Period(1, ql.Years)
     a = EuropeanOption(asset_name, strike, maturity, 'call', 'vanilla')
     print(f"The price of the European Vanilla Call Option is {format(a.price(), '.3f')}")
     b = EuropeanOption(asset_name, strike, maturity, 'put', 'vanilla')
@@ -36,8 +36,10 @@ def option_example():
     print(f"The price of the American Vanilla Call Option is {format(e.price(), '.3f')}")
     f = AmericanOption(asset_name, strike, maturity, 'put', 'vanilla')
     print(f"The price of the American Vanilla Put Option is {format(f.price(), '.3f')}")
-    print("=="*35)
-    print("Cannot price a Bermudan option as I cannot find the right engine!")
+    g = BermudanOption(asset_name, strike, maturity, 'call', 'vanilla')
+    print(f"The price of the Bermudan Vanilla Call Option is {format(g.price(), '.3f')}")
+    h = BermudanOption(asset_name, strike, maturity, 'put', 'vanilla')
+    print(f"The price of the Bermudan Vanilla Put Option is {format(h.price(), '.3f')}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,67 @@
+import unittest
+from benchmarks import suite
+from benchmarks.suite import BenchmarkResult
+
+
+def result(wall_time, peak_memory=2 ** 20):
+    return BenchmarkResult(
+        name='case',
+        wall_time=wall_time,
+        peak_memory=peak_memory,
+        throughput=1 / wall_time,
+        max_rss=None
+    )
+
+
+class TestCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = {'case': {'wall_time': 0.01, 'peak_memory': 2 ** 20}}
+
+    def test_slowdown_above_noise_floor(self):
+        """A slowdown past the threshold and the noise floor is flagged."""
+        ret = suite.compare([result(0.02)], self.baseline, threshold=0.2)
+        self.assertEqual(
+            [(r.metric, r.baseline, r.current) for r in ret],
+            [('wall_time', 0.01, 0.02)]
+        )
+        self.assertAlmostEqual(ret[0].change, 1.0)
+
+    def test_slowdown_below_noise_floor(self):
+        """Relative slowdowns smaller than the noise floor are ignored."""
+        ret = suite.compare([result(0.014)], self.baseline, threshold=0.2)
+        self.assertEqual(ret, [])
+        ret = suite.compare(
+            [result(0.014)], self.baseline, threshold=0.2, floors={}
+        )
+        self.assertEqual([r.metric for r in ret], ['wall_time'])
+
+    def test_memory_floor_and_rss_not_compared(self):
+        """Heap growth under a MiB is noise and max RSS is never compared."""
+        baseline = {'case': dict(self.baseline['case'], max_rss=1)}
+        current = result(0.01, peak_memory=2 ** 20 + 2 ** 19)._replace(
+            max_rss=2 ** 40
+        )
+        self.assertEqual(suite.compare([current], baseline), [])
+        current = current._replace(peak_memory=2 ** 22)
+        self.assertEqual(
+            [r.metric for r in suite.compare([current], baseline)],
+            ['peak_memory']
+        )
+
+    def test_run_benchmark_records_max_rss(self):
+        """Results carry the process max RSS when the platform reports it."""
+        suite.register('unittest.noop', items=10, repeat=2)(lambda: lambda: None)
+        try:
+            ret = suite.run_benchmark('unittest.noop')
+        finally:
+            del suite.BENCHMARKS['unittest.noop']
+        self.assertEqual(ret.name, 'unittest.noop')
+        if suite.resource is None:
+            self.assertIsNone(ret.max_rss)
+        else:
+            self.assertGreater(ret.max_rss, 2 ** 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
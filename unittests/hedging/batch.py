@@ -0,0 +1,73 @@
+import datetime
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+from hedging import batch
+from hedging import black_scholes
+from hedging.options import year_fraction
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_headless_import(self):
+        """Library modules import without scipy, matplotlib or log handlers."""
+        script = (
+            "import sys, logging\n"
+            "import hedging.batch, hedging.hedge_using_classes\n"
+            "import hedging.scenario_generator, hedging.streaming_pla\n"
+            "print(sorted(m for m in ('scipy', 'matplotlib') if m in sys.modules),"
+            " logging.getLogger().handlers)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=ROOT, check=True,
+            capture_output=True, text=True
+        ).stdout.strip()
+        self.assertEqual(output, '[] []')
+
+    def test_main_prices_csv_scenarios(self):
+        """The batch entry point prices every csv scenario analytically."""
+        maturity = datetime.date.today() + datetime.timedelta(days=365)
+        scenarios = np.array([
+            [100, 0.2, 0.03, 0.01],
+            [90, 0.25, 0.02, 0.0],
+            [120, 0.1, 0.05, 0.02],
+        ])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scenario_path = os.path.join(tmp_dir, 'scenarios.csv')
+            output_path = os.path.join(tmp_dir, 'prices.csv')
+            np.savetxt(
+                scenario_path, scenarios, delimiter=',',
+                header='spot,vol,rfr,div', comments=''
+            )
+            status = batch.main([
+                scenario_path, output_path, '--option', 'european_put',
+                '--strike', '100', '--maturity', maturity.isoformat(),
+                '--engine', 'ANALYTICAL'
+            ])
+            prices = np.loadtxt(output_path, skiprows=1)
+
+        self.assertEqual(status, 0)
+        expected = black_scholes.vanilla_price(
+            -1, scenarios[:, 0], 100, scenarios[:, 1], scenarios[:, 2],
+            scenarios[:, 3], year_fraction(maturity)
+        )
+        np.testing.assert_allclose(prices, expected, rtol=1e-10)
+
+    def test_bad_inputs(self):
+        """Unknown option types and wrong scenario columns are rejected."""
+        with self.assertRaises(KeyError):
+            batch.create_option('asian_call', 100, datetime.date.today(), 'ANALYTICAL')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'scenarios.npy')
+            np.save(path, np.ones((4, 3)))
+            with self.assertRaises(ValueError):
+                batch.load_scenarios(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
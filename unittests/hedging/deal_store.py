@@ -0,0 +1,249 @@
+import unittest
+import datetime
+import os
+import tempfile
+from unittest import mock
+import numpy as np
+from hedging.deal_store import CompactPortfolio
+from hedging.deal_store import Interner
+from hedging.portfolio_object import Portfolio
+
+
+class TestCompactPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        self.start = datetime.datetime(2024, 1, 1)
+        self.deals = [
+            (3, 'AAPL', 'BankA', 10),
+            (1, 'GOOG', 'BankB', 5),
+            (2, 'AAPL', 'BankB', -3),
+            (5, 'GOOG', 'BankA', 7),
+            (4, 'AAPL', 'BankC', 0),
+        ]
+        self.portfolio = Portfolio()
+        self.compact = CompactPortfolio()
+        for book in [self.portfolio, self.compact]:
+            for day, instrument, counterparty, quantity in self.deals:
+                book.create_deal(
+                    instrument=instrument,
+                    quantity=quantity,
+                    counterparty=counterparty,
+                    creation_time=self.start + datetime.timedelta(days=day)
+                )
+
+    @staticmethod
+    def summary(deals):
+        return [
+            (d.instrument, d.quantity, d.counterparty, d.creation_time)
+            for d in deals
+        ]
+
+    def test_same_queries_as_portfolio(self):
+        """The compact book answers every query like the object book."""
+        for query, args in [
+            ('deals_with_counterparty', ('BankB',)),
+            ('deals_on_instrument', ('AAPL',)),
+            ('deals_created_between', (
+                self.start + datetime.timedelta(days=2),
+                self.start + datetime.timedelta(days=5)
+            )),
+        ]:
+            self.assertEqual(
+                self.summary(getattr(self.compact, query)(*args)),
+                self.summary(getattr(self.portfolio, query)(*args)),
+                f'Expect equal results for {query}.'
+            )
+        self.assertEqual(
+            self.summary(self.compact.deals.values()),
+            self.summary(self.portfolio.deals.values())
+        )
+        self.assertEqual(self.compact.positions(), self.portfolio.positions())
+
+    def test_index_tail_and_removal(self):
+        """Lookups see deals added after an index was built and skip removals."""
+        self.assertEqual(len(self.compact.deals_on_instrument('GOOG')), 2)
+        self.compact.create_deal('GOOG', 4, 'BankC', self.start)
+        removed = self.compact.deals_on_instrument('GOOG')[0]
+        self.compact.remove_deal(deal=removed)
+        ret = self.compact.deals_on_instrument('GOOG')
+        self.assertEqual([d.quantity for d in ret], [7, 4])
+        self.assertEqual(len(self.compact.deals), 4)
+        with self.assertRaises(KeyError):
+            self.compact.remove_deal(deal_id=removed.deal_id)
+
+    def test_bulk_extend_grows_columns(self):
+        """Bulk loading interns codes and grows the columns."""
+        compact = CompactPortfolio()
+        n_deals = 5000
+        deal_ids = compact.store.extend(
+            instruments=np.array(['AAPL', 'GOOG'])[np.arange(n_deals) % 2],
+            quantities=np.ones(n_deals),
+            counterparties=['BankA'] * n_deals,
+            creation_times=np.arange(n_deals, dtype=np.int64)
+        )
+        self.assertEqual(len(deal_ids), n_deals)
+        self.assertEqual(compact.positions(), {'AAPL': 2500, 'GOOG': 2500})
+        self.assertEqual(compact.store.instrument_codes.dtype, np.int32)
+
+    def test_bulk_extend_tuple_instruments(self):
+        """Tuple instruments are interned whole, not as arrays."""
+        compact = CompactPortfolio()
+        compact.store.extend(
+            instruments=[('AAPL', 'C'), ('GOOG', 'P'), ('AAPL', 'C')],
+            quantities=[1, 2, 3],
+            counterparties=['BankA'] * 3,
+            creation_times=np.arange(3, dtype=np.int64)
+        )
+        self.assertEqual(
+            compact.positions(), {('AAPL', 'C'): 4, ('GOOG', 'P'): 2}
+        )
+
+    def test_code_many_mixed_types(self):
+        """Mixed int and str keys keep their types and share codes."""
+        interner = Interner()
+        codes = interner.code_many([1, 'a', 1])
+        self.assertEqual(interner.values, [1, 'a'])
+        self.assertEqual(codes.tolist(), [0, 1, 0])
+        self.assertEqual(interner.code(1), 0)
+        self.assertEqual(len(interner), 2)
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp_dir.name, 'book.snap')
+        self.journal_path = os.path.join(self.tmp_dir.name, 'book.journal')
+        self.start = datetime.datetime(2024, 1, 1)
+        self.portfolio = Portfolio()
+        for day in range(20):
+            self.portfolio.create_deal(
+                instrument=f'INSTR{day % 3}',
+                quantity=day - 5,
+                counterparty=f'CPTY{day % 4}',
+                creation_time=self.start + datetime.timedelta(hours=day)
+            )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def summary(book):
+        return [
+            (d.instrument, d.quantity, d.counterparty, d.creation_time)
+            for d in book.deals.values()
+        ]
+
+    def test_snapshot_round_trip(self):
+        """A saved object book loads back memory-mapped with the same deals."""
+        self.portfolio.save_snapshot(self.snapshot_path)
+        ret = CompactPortfolio.load_snapshot(self.snapshot_path)
+        self.assertIsInstance(ret.store.quantities, np.memmap)
+        self.assertEqual(self.summary(ret), self.summary(self.portfolio))
+        self.assertEqual(ret.positions(), self.portfolio.positions())
+
+    def test_journal_replay(self):
+        """Intraday adds and removes are replayed on top of the snapshot, and
+        never written into the snapshot file."""
+        CompactPortfolio.from_portfolio(self.portfolio).save_snapshot(self.snapshot_path)
+        intraday = CompactPortfolio.load_snapshot(self.snapshot_path)
+        intraday.attach_journal(self.journal_path)
+        intraday.create_deal('INSTR9', 3, 'CPTY9', self.start)
+        intraday.remove_deal(deal_id=2)
+        intraday.detach_journal()
+
+        ret = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.summary(ret), self.summary(intraday))
+        self.assertEqual(len(CompactPortfolio.load_snapshot(self.snapshot_path).deals), 19)
+
+    def test_checkpoint_truncates_journal(self):
+        """After a checkpoint the snapshot alone holds the book."""
+        compact = CompactPortfolio.from_portfolio(self.portfolio)
+        compact.attach_journal(self.journal_path)
+        compact.create_deal('INSTR9', 3, 'CPTY9', self.start)
+        compact.checkpoint(self.snapshot_path)
+        compact.create_deal('INSTR8', 4, 'CPTY8', self.start)
+        compact.detach_journal()
+        ret = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.summary(ret), self.summary(compact))
+
+    def test_checkpoint_over_loaded_snapshot(self):
+        """Checkpointing to the memory-mapped snapshot the book was loaded
+        from replaces it safely and reloads with the same deals."""
+        self.portfolio.save_snapshot(self.snapshot_path)
+        intraday = CompactPortfolio.load_snapshot(
+            self.snapshot_path, journal_path=self.journal_path
+        )
+        intraday.attach_journal(self.journal_path)
+        intraday.remove_deal(deal_id=5)
+        intraday.checkpoint(self.snapshot_path)
+        intraday.remove_deal(deal_id=7)
+        intraday.detach_journal()
+
+        ret = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.summary(ret), self.summary(intraday))
+        self.assertEqual(len(ret.deals), len(self.portfolio.deals) - 2)
+        self.assertEqual(os.listdir(self.tmp_dir.name).count('book.snap'), 1)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 2)
+
+    def test_failed_journal_write_leaves_book_unchanged(self):
+        """Deals are only added or removed once the journal has them."""
+        compact = CompactPortfolio.from_portfolio(self.portfolio)
+        compact.attach_journal(self.journal_path)
+        expected_ret = self.summary(compact)
+        with self.assertRaises(TypeError):
+            compact.create_deal(object(), 1, 'CPTY0', self.start)
+        with mock.patch.object(compact.journal.file, 'write', side_effect=OSError):
+            with self.assertRaises(OSError):
+                compact.create_deal('INSTR9', 1, 'CPTY9', self.start)
+            with self.assertRaises(OSError):
+                compact.remove_deal(deal_id=2)
+        compact.detach_journal()
+        self.assertEqual(compact.deal_counter, len(self.portfolio.deals))
+        self.assertEqual(self.summary(compact), expected_ret)
+        with open(self.journal_path) as file:
+            self.assertEqual(len(file.readlines()), 1)
+
+    def test_crash_after_checkpoint_snapshot(self):
+        """A crash between writing the checkpoint and resetting the journal
+        leaves a journal the new snapshot already contains."""
+        CompactPortfolio.from_portfolio(self.portfolio).save_snapshot(self.snapshot_path)
+        intraday = CompactPortfolio.load_snapshot(self.snapshot_path)
+        intraday.attach_journal(self.journal_path)
+        intraday.create_deal('INSTR9', 3, 'CPTY9', self.start)
+        intraday.remove_deal(deal_id=2)
+        with mock.patch.object(
+                CompactPortfolio, 'detach_journal', side_effect=RuntimeError('crash')
+        ):
+            with self.assertRaises(RuntimeError):
+                intraday.checkpoint(self.snapshot_path)
+        intraday.journal.close()
+
+        ret = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.summary(ret), self.summary(intraday))
+        ret.attach_journal(self.journal_path)
+        ret.create_deal('INSTR8', 4, 'CPTY8', self.start)
+        ret.detach_journal()
+        reloaded = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+        self.assertEqual(self.summary(reloaded), self.summary(ret))
+
+    def test_journal_for_other_snapshot(self):
+        """A journal is only replayed on the snapshot it was started from."""
+        compact = CompactPortfolio.from_portfolio(self.portfolio)
+        compact.attach_journal(self.journal_path)
+        compact.detach_journal()
+        compact.create_deal('INSTR0', 1, 'CPTY0')
+        compact.save_snapshot(self.snapshot_path)
+        with self.assertRaises(ValueError):
+            _ = CompactPortfolio.load_snapshot(self.snapshot_path, self.journal_path)
+
+    def test_not_a_snapshot(self):
+        """Files without the snapshot header are rejected."""
+        with open(self.snapshot_path, 'wb') as file:
+            file.write(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            _ = CompactPortfolio.load_snapshot(self.snapshot_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
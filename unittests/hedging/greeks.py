@@ -0,0 +1,87 @@
+import unittest
+import datetime
+import numpy as np
+from hedging.options import AmericanCallOption
+from hedging.options import AmericanOption
+from hedging.options import EuropeanBinaryCallOption
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+from hedging.options import EuropeanPutOption
+from hedging.pricing_session import create_bsm_process
+
+
+class TestGreeks(unittest.TestCase):
+
+    def setUp(self):
+        self.maturity = datetime.date.today() + datetime.timedelta(days=365)
+        self.spots = np.array([85., 100., 115.])
+
+    def test_analytic_greeks_match_quantlib(self):
+        """Closed form Greeks agree with QuantLib's analytic engine."""
+        for option_class in [
+            EuropeanCallOption, EuropeanPutOption, EuropeanBinaryCallOption
+        ]:
+            option = option_class(
+                asset_name='Asset',
+                strike=100,
+                maturity=self.maturity,
+                pricing_engine=EuropeanOption.ANALYTICAL
+            )
+            ret = option.greeks_many(self.spots, 0.25, 0.03, 0.01)
+            for idx, spot in enumerate(self.spots):
+                ql_option = option.create_option_object()
+                ql_option.setPricingEngine(option.option_model(
+                    create_bsm_process(spot, 0.25, 0.03, 0.01)
+                ))
+                expected_ret = [
+                    ql_option.delta(), ql_option.gamma(), ql_option.vega(),
+                    ql_option.theta(), ql_option.rho()
+                ]
+                self.assertTrue(
+                    np.allclose([greek[idx] for greek in ret], expected_ret,
+                                rtol=1e-6, atol=1e-10),
+                    f'Expect QuantLib Greeks for {option_class} at {spot}.'
+                )
+
+    def test_monte_carlo_greeks_close_to_analytic(self):
+        """Bumped NumPy MC Greeks on common paths track the closed forms."""
+        analytic = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=self.maturity,
+            pricing_engine=EuropeanOption.ANALYTICAL
+        ).greeks_many(self.spots, 0.2, 0.03, 0)
+        ret = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=self.maturity,
+            pricing_engine=EuropeanOption.NUMPY_MONTE_CARLO,
+            mc_params={'steps': 1, 'num_paths': 200000, 'rng': 'pseudorandom'}
+        ).greeks_many(self.spots, 0.2, 0.03, 0)
+        self.assertTrue(np.allclose(ret.delta, analytic.delta, atol=0.01))
+        self.assertTrue(np.allclose(ret.gamma, analytic.gamma, atol=0.002))
+        self.assertTrue(np.allclose(ret.vega, analytic.vega, rtol=0.02))
+        self.assertTrue(np.allclose(ret.theta, analytic.theta, rtol=0.02))
+        self.assertTrue(np.allclose(ret.rho, analytic.rho, rtol=0.02))
+
+    def test_american_greeks_shape_and_repeatable(self):
+        """American MC Greeks come back per scenario and are repeatable."""
+        option = AmericanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=self.maturity,
+            pricing_engine=AmericanOption.MONTE_CARLO,
+            earliest_date=datetime.date.today(),
+            mc_params={'steps': 10, 'num_paths': 1000, 'rng': 'pseudorandom'}
+        )
+        first = option.greeks_many(self.spots, 0.2, 0.03, 0)
+        second = option.greeks_many(self.spots, 0.2, 0.03, 0)
+        self.assertEqual(first.delta.shape, (3,))
+        for first_greek, second_greek in zip(first, second):
+            self.assertTrue(np.array_equal(first_greek, second_greek))
+        self.assertTrue(np.all(np.diff(first.delta) > 0))
+        self.assertEqual(option.mc_params.get('seed'), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from hedging.historical_scenarios import HistoricalScenarioSource
+
+
+class TestHistoricalScenarios(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.prices = 100 * np.exp(np.cumsum(
+            rng.normal(scale=0.01, size=(3, 1000)), axis=1
+        ))
+        self.npy_path = os.path.join(self.tmp_dir.name, 'history.npy')
+        self.raw_path = os.path.join(self.tmp_dir.name, 'history.bin')
+        np.save(self.npy_path, self.prices)
+        self.prices.tofile(self.raw_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_npy_and_raw_sources_agree(self):
+        """Both file layouts are memory-mapped and give the same shocks."""
+        npy_source = HistoricalScenarioSource(self.npy_path)
+        raw_source = HistoricalScenarioSource(self.raw_path, n_assets=3, n_days=1000)
+        self.assertIsInstance(npy_source.prices, np.memmap)
+        self.assertIsInstance(raw_source.prices, np.memmap)
+        self.assertTrue(np.array_equal(
+            npy_source.generate_shock_matrix(num_shocks=500, horizon=10),
+            raw_source.generate_shock_matrix(num_shocks=500, horizon=10)
+        ))
+
+    def test_overlapping_shocks(self):
+        """Shocks are the most recent overlapping horizon-day price ratios."""
+        source = HistoricalScenarioSource(self.npy_path, asset_names=['a', 'b', 'c'])
+        ret = source.generate_shocks('b', num_shocks=780, horizon=5)
+        expected_ret = self.prices[1, 220:] / self.prices[1, 215:-5]
+        self.assertEqual(len(ret), 780, "Expect 780 shocks.")
+        self.assertTrue(np.allclose(ret, expected_ret))
+
+    def test_blocks_match_matrix(self):
+        """Block iteration yields the same shocks as the full matrix."""
+        source = HistoricalScenarioSource(self.npy_path)
+        blocks = list(source.iter_shock_blocks(horizon=3, block_size=97))
+        self.assertTrue(np.array_equal(
+            np.concatenate(blocks),
+            source.generate_shock_matrix(num_shocks=997, horizon=3)
+        ))
+
+    def test_too_many_shocks(self):
+        """Asking for more windows than the history holds raises."""
+        source = HistoricalScenarioSource(self.npy_path)
+        with self.assertRaises(ValueError):
+            _ = source.generate_shock_matrix(num_shocks=1000, horizon=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import datetime
+import numpy as np
+import QuantLib as ql
+from hedging import black_scholes
+from hedging import lattice
+from hedging.lattice import BinomialLatticeEngine
+from hedging.options import AmericanOption
+from hedging.options import AmericanPutOption
+from hedging.options import to_ql_dt
+from hedging.options import year_fraction
+from hedging.pricing_session import create_bsm_process
+
+
+class TestBinomialLattice(unittest.TestCase):
+
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.maturity = self.today + datetime.timedelta(days=365)
+        self.tau = year_fraction(self.maturity)
+        self.strikes = np.array([80., 90., 100., 110., 120.])
+
+    def quantlib_price(self, strike, exercise, steps=200):
+        option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Put, strike), exercise)
+        option.setPricingEngine(ql.BinomialVanillaEngine(
+            create_bsm_process(100, 0.2, 0.05, 0.01), 'crr', steps
+        ))
+        return option.NPV()
+
+    def test_american_strike_ladder_matches_quantlib(self):
+        """A strike ladder priced in one pass matches QuantLib's CRR tree."""
+        ret = BinomialLatticeEngine(steps=200).price_many(
+            ql.Option.Put, 100, self.strikes, 0.2, 0.05, 0.01, self.tau
+        )
+        exercise = ql.AmericanExercise(to_ql_dt(self.today), to_ql_dt(self.maturity))
+        expected_ret = [self.quantlib_price(strike, exercise) for strike in self.strikes]
+        self.assertTrue(np.allclose(ret, expected_ret, atol=5e-4))
+
+    def test_bermudan_matches_quantlib(self):
+        """Bermudan exercise on quarterly dates matches QuantLib's tree."""
+        dates = [
+            self.today + datetime.timedelta(days=91 * quarter)
+            for quarter in range(1, 4)
+        ] + [self.maturity]
+        ret = BinomialLatticeEngine(steps=730).price_many(
+            ql.Option.Put, 100, 110, 0.2, 0.05, 0.01, self.tau,
+            exercise_times=[year_fraction(date) for date in dates]
+        )
+        expected_ret = self.quantlib_price(
+            110, ql.BermudanExercise([to_ql_dt(date) for date in dates]), steps=730
+        )
+        self.assertAlmostEqual(float(ret), expected_ret, places=3)
+
+    def test_european_exercise_converges(self):
+        """With only exercise at maturity the trees converge to Black-Scholes."""
+        for tree in lattice.TREES:
+            for cash in [None, 1]:
+                ret = BinomialLatticeEngine(steps=801, tree=tree).price_many(
+                    [ql.Option.Call, ql.Option.Put], 100, 105, 0.25, 0.03, 0.01,
+                    self.tau, exercise_times=[self.tau], cash=cash
+                )
+                price_func = black_scholes.vanilla_price if cash is None else \
+                    black_scholes.cash_or_nothing_price
+                expected_ret = [
+                    price_func(phi, 100, 105, 0.25, 0.03, 0.01, self.tau)
+                    for phi in [ql.Option.Call, ql.Option.Put]
+                ]
+                self.assertTrue(
+                    np.allclose(ret, expected_ret, atol=0.01),
+                    f'Expect {tree} tree to converge for cash={cash}.'
+                )
+
+    def test_batch_of_mixed_options(self):
+        """Maturities, rights and expired options mix within a batch."""
+        taus = np.array([0.5, 1.0, 0.0])
+        engine = BinomialLatticeEngine(steps=100)
+        ret = engine.price_many([1, -1, -1], 100, 100, 0.2, 0.05, 0, taus)
+        expected_ret = [
+            engine.price_many(phi, 100, 100, 0.2, 0.05, 0, tau)
+            for phi, tau in zip([1, -1, -1], taus)
+        ]
+        self.assertTrue(np.allclose(ret, expected_ret))
+        self.assertEqual(ret[2], 0)
+
+    def test_chunked_batches(self):
+        """Batches larger than one chunk give the same prices."""
+        spots = np.linspace(80, 120, 50)
+        engine = BinomialLatticeEngine(steps=50)
+        expected_ret = engine.price_many(-1, spots, 100, 0.2, 0.05, 0, self.tau)
+        chunk_elements = lattice.CHUNK_ELEMENTS
+        lattice.CHUNK_ELEMENTS = 7 * 51
+        try:
+            ret = engine.price_many(-1, spots, 100, 0.2, 0.05, 0, self.tau)
+        finally:
+            lattice.CHUNK_ELEMENTS = chunk_elements
+        self.assertTrue(np.array_equal(ret, expected_ret))
+
+    def test_invalid_tree_parameters(self):
+        """Trees without vol or with an up probability outside [0, 1] raise
+        instead of blowing up, as QuantLib's trees do."""
+        tau = year_fraction(self.today + datetime.timedelta(days=180))
+        engine = BinomialLatticeEngine(steps=200)
+        with self.assertRaises(ValueError):
+            engine.price_many(ql.Option.Put, 100, 100, 0.001, 0.2, 0, tau)
+        with self.assertRaises(ValueError):
+            engine.price_many(ql.Option.Put, 100, 100, 0, 0.05, 0, tau)
+        with self.assertRaises(ValueError):
+            BinomialLatticeEngine(tree=lattice.LEISEN_REIMER).price_many(
+                ql.Option.Put, 100, 100, 0, 0.05, 0, tau
+            )
+
+    def test_option_engine(self):
+        """AmericanOption prices scenarios through the batched lattice."""
+        option = AmericanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=self.maturity,
+            pricing_engine=AmericanOption.NUMPY_BINOMIAL,
+            earliest_date=self.today
+        )
+        quantlib_tree = AmericanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=self.maturity,
+            pricing_engine=AmericanOption.BINOMIAL,
+            earliest_date=self.today
+        )
+        spots = [90., 100., 110.]
+        self.assertTrue(np.allclose(
+            option.price_many(spots, 0.2, 0.05, 0.01),
+            quantlib_tree.price_many(spots, 0.2, 0.05, 0.01),
+            atol=5e-4
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+from hedging import black_scholes
+from hedging.lattice import BinomialLatticeEngine
+from hedging.longstaff_schwartz import LongstaffSchwartzEngine
+
+
+class TestLongstaffSchwartz(unittest.TestCase):
+
+    def setUp(self):
+        self.exercise_times = np.array([0.25, 0.5, 0.75, 1.0])
+        self.strikes = np.array([90., 100., 110.])
+
+    def test_bermudan_puts_match_lattice(self):
+        """A strike ladder on shared paths matches a fine binomial tree."""
+        ret = LongstaffSchwartzEngine(num_paths=200000, seed=1).price_many(
+            -1, self.strikes, 100, 0.2, 0.05, 0.01, self.exercise_times
+        )
+        expected_ret = BinomialLatticeEngine(steps=1000).price_many(
+            -1, 100, self.strikes, 0.2, 0.05, 0.01, 1.0,
+            exercise_times=self.exercise_times
+        )
+        self.assertTrue(np.allclose(ret, expected_ret, atol=0.03))
+
+    def test_single_date_is_european(self):
+        """With exercise only at maturity the price is the European one."""
+        ret = LongstaffSchwartzEngine(num_paths=200000, seed=2).price_many(
+            [1, -1], 100, 100, 0.2, 0.03, 0, [1.0]
+        )
+        expected_ret = [
+            black_scholes.vanilla_price(phi, 100, 100, 0.2, 0.03, 0, 1.0)
+            for phi in [1, -1]
+        ]
+        self.assertTrue(np.allclose(ret, expected_ret, atol=0.05))
+
+    def test_per_option_schedules(self):
+        """Options keep their own NaN padded schedules within one batch."""
+        exercise_times = np.full((2, 4), np.nan)
+        exercise_times[0] = self.exercise_times
+        exercise_times[1, 0] = 1.0
+        engine = LongstaffSchwartzEngine(num_paths=50000, seed=3)
+        ret = engine.price_many(-1, 110, 100, 0.2, 0.05, 0, exercise_times)
+        self.assertGreater(ret[0], ret[1], 'Expect early exercise premium.')
+        self.assertAlmostEqual(
+            ret[1],
+            float(black_scholes.vanilla_price(-1, 100, 110, 0.2, 0.05, 0, 1.0)),
+            delta=0.1
+        )
+
+    def test_chunking_does_not_change_price(self):
+        """Antithetic chunks cover the same paths whatever the chunk size."""
+        prices = [
+            LongstaffSchwartzEngine(
+                num_paths=20000, regression_paths=5000, seed=4,
+                chunk_size=chunk_size
+            ).price_many(-1, 100, 100, 0.2, 0.05, 0, self.exercise_times)
+            for chunk_size in [1000, 20000]
+        ]
+        self.assertTrue(np.allclose(prices[0], prices[1], rtol=1e-10))
+
+    def test_exercise_today(self):
+        """Deep in the money options exercisable today are worth intrinsic."""
+        ret = LongstaffSchwartzEngine(num_paths=10000, seed=5).price_many(
+            -1, 150, 100, 0.2, 0.05, 0, [0, 1.0]
+        )
+        self.assertAlmostEqual(float(ret[0]), 50)
+
+    def test_nothing_left_to_exercise(self):
+        """Options maturing today have expired like in QuantLib and the lattice."""
+        engine = LongstaffSchwartzEngine(num_paths=1000, seed=6)
+        ret = engine.price_many([-1, 1], 150, 100, 0.2, 0.05, 0, [0.0])
+        self.assertEqual(ret.tolist(), [0.0, 0.0])
+        expected_ret = BinomialLatticeEngine(steps=50).price_many(
+            [-1, 1], 100, 150, 0.2, 0.05, 0, 0.0, exercise_times=[0.0]
+        )
+        self.assertEqual(ret.tolist(), expected_ret.tolist())
+        ret = engine.price_many(-1, 150, 100, 0.2, 0.05, 0, [-0.5])
+        self.assertEqual(ret.tolist(), [0.0])
+
+    def test_expiry_convention_matches_lattice(self):
+        """In a batch with live options, one maturing today is still worth
+        nothing on both Bermudan routes, and exercise today of a live option
+        is allowed on both."""
+        exercise_times = np.array([[0.0, np.nan], [0.0, 1.0]])
+        ret = LongstaffSchwartzEngine(num_paths=10000, seed=7).price_many(
+            -1, 150, 100, 0.2, 0.05, 0, exercise_times
+        )
+        expected_ret = BinomialLatticeEngine(steps=100).price_many(
+            -1, 100, 150, 0.2, 0.05, 0, [0.0, 1.0], exercise_times=exercise_times
+        )
+        self.assertEqual(ret[0], 0.0)
+        self.assertTrue(np.allclose(ret, expected_ret), f'{ret} != {expected_ret}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import datetime
+import numpy as np
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanBinaryPutOption
+from hedging.options import EuropeanOption
+
+
+class TestNumpyMCEngine(unittest.TestCase):
+
+    def make_option(self, option_class, pricing_engine):
+        return option_class(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=pricing_engine,
+            mc_params={'steps': 1, 'num_paths': 200000, 'rng': 'pseudorandom', 'seed': 3}
+        )
+
+    def test_converges_to_analytical(self):
+        """NumPy MC prices lie within a few standard errors of the closed form."""
+        spots = np.array([85., 100., 115.])
+        for option_class in [EuropeanCallOption, EuropeanBinaryPutOption]:
+            mc_option = self.make_option(option_class, EuropeanOption.NUMPY_MONTE_CARLO)
+            analytic_option = self.make_option(option_class, EuropeanOption.ANALYTICAL)
+            ret = mc_option.price_many(spots, 0.2, 0.03, 0.01)
+            expected_ret = analytic_option.price_many(spots, 0.2, 0.03, 0.01)
+            self.assertTrue(
+                np.allclose(ret, expected_ret, rtol=0.01, atol=0.01),
+                f'Expect MC close to analytical for {option_class}.'
+            )
+
+    def test_common_random_numbers(self):
+        """Scenarios share paths, so call prices rise monotonically with spot
+        and repeated calls reproduce identical prices."""
+        option = self.make_option(EuropeanCallOption, EuropeanOption.NUMPY_MONTE_CARLO)
+        spots = np.linspace(99, 101, 50)
+        ret = option.price_many(spots, 0.2, 0.03, 0.01)
+        self.assertTrue(np.all(np.diff(ret) > 0), 'Expect monotone prices.')
+        self.assertEqual(option._price(spot=99, vol=0.2, rfr=0.03, div=0.01), ret[0])
+
+    def test_varying_market_inputs(self):
+        """Per scenario vols and rates take the chunked path."""
+        option = self.make_option(EuropeanCallOption, EuropeanOption.NUMPY_MONTE_CARLO)
+        vols = np.array([0.1, 0.2, 0.3])
+        ret = option.price_many(100, vols, 0.03, 0)
+        expected_ret = [option._price(spot=100, vol=vol, rfr=0.03, div=0) for vol in vols]
+        self.assertTrue(np.allclose(ret, expected_ret))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,13 @@ import numpy as np
 from hedging.options import EuropeanCallOption
 from hedging.options import AmericanCallOption
 from hedging.options import AmericanOption
+from hedging.options import AmericanPutOption
+from hedging.options import EuropeanOption
+from hedging.options import EuropeanPutOption
+from hedging.options import EuropeanBinaryCallOption
+from hedging.options import EuropeanBinaryPutOption
+from hedging.options import CacheInfo
+from hedging.options import PricingCache
 
 
 class TestOptions(unittest.TestCase):
@@ -76,9 +83,155 @@ class TestOptions(unittest.TestCase):
         self.assertDictEqual(ret,expected_ret, 'Expect MC paramater dictionaries'
                                                'to be equal')
 
+    def test_euro_price_many_matches_quantlib(self):
+        """Vectorised analytic prices agree with the QuantLib engine."""
+        maturity = datetime.date.today() + datetime.timedelta(days=365)
+        spots = np.array([80., 95., 100., 105., 130.])
+        vols = np.array([0.05, 0.1, 0.2, 0.3, 0.4])
+
+        for option_class in [
+            EuropeanCallOption,
+            EuropeanPutOption,
+            EuropeanBinaryCallOption,
+            EuropeanBinaryPutOption
+        ]:
+            option = option_class(
+                asset_name='Asset',
+                strike=100,
+                maturity=maturity,
+                pricing_engine=EuropeanOption.ANALYTICAL
+            )
+            ret = option.price_many(spots, vols, 0.03, 0.01)
+            expected_ret = [
+                option._price(spot=spot, vol=vol, rfr=0.03, div=0.01)
+                for spot, vol in zip(spots, vols)
+            ]
+            self.assertTrue(
+                np.allclose(ret, expected_ret, rtol=1e-8, atol=1e-10),
+                f'Expect analytic prices to match QuantLib for {option_class}.'
+            )
+
+    def test_euro_price_many_expired(self):
+        """Expired options are worth nothing, as in QuantLib."""
+        option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date(2022, 10, 15),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+        ret = option.price_many([90, 100, 110], 0.1, 0.05, 0)
+        self.assertTrue(np.allclose(ret, np.zeros(3)))
+
+
+class TestAmericanEngines(unittest.TestCase):
+
+    def create_put(self, pricing_engine, grid_params=None):
+        return AmericanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=pricing_engine,
+            earliest_date=datetime.date.today(),
+            grid_params=grid_params
+        )
+
+    def test_engines_agree(self):
+        """Lattice and approximation engines agree with a fine FD grid."""
+        reference = self.create_put(
+            AmericanOption.FINITE_DIFFERENCE,
+            grid_params={'time_steps': 1000, 'spot_steps': 1000, 'tree': 'crr'}
+        ).price_many([90., 100., 110.], 0.2, 0.05, 0)
+        european = EuropeanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        ).price_many([90., 100., 110.], 0.2, 0.05, 0)
+        self.assertTrue(np.all(reference > european), 'Expect early exercise premium.')
+
+        for engine, tolerance in [
+            (AmericanOption.FINITE_DIFFERENCE, 0.01),
+            (AmericanOption.BINOMIAL, 0.03),
+            (AmericanOption.BARONE_ADESI_WHALEY, 0.1),
+            (AmericanOption.BJERKSUND_STENSLAND, 0.15)
+        ]:
+            ret = self.create_put(engine).price_many([90., 100., 110.], 0.2, 0.05, 0)
+            self.assertTrue(
+                np.allclose(ret, reference, atol=tolerance),
+                f'Expect {engine} within {tolerance} of the reference.'
+            )
 
+    def test_binomial_tree_type(self):
+        """The binomial tree type and steps come from grid_params."""
+        crr = self.create_put(AmericanOption.BINOMIAL)
+        leisen_reimer = self.create_put(
+            AmericanOption.BINOMIAL,
+            grid_params={'time_steps': 201, 'spot_steps': 200, 'tree': 'lr'}
+        )
+        self.assertNotEqual(
+            crr._price(100, 0.2, 0.05, 0), leisen_reimer._price(100, 0.2, 0.05, 0)
+        )
+        self.assertNotEqual(crr.contract_terms(), leisen_reimer.contract_terms())
 
 
+class TestPricingCache(unittest.TestCase):
 
+    def setUp(self):
+        self.maturity = datetime.date.today() + datetime.timedelta(days=365)
 
+    def create_call(self, pricing_cache, strike=100):
+        return EuropeanCallOption(
+            asset_name='Asset',
+            strike=strike,
+            maturity=self.maturity,
+            pricing_engine=EuropeanOption.ANALYTICAL,
+            pricing_cache=pricing_cache
+        )
 
+    def test_shared_across_options_with_same_terms(self):
+        """A second option with identical terms hits the first one's NPV."""
+        cache = PricingCache()
+        first = self.create_call(cache)._price(100, 0.2, 0.03, 0)
+        second = self.create_call(cache)._price(100, 0.2, 0.03, 0)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 0, 1, 100000))
+
+        self.create_call(cache, strike=110)._price(100, 0.2, 0.03, 0)
+        self.assertEqual(cache.misses, 2, 'Expect strike to be part of the key.')
+
+    def test_price_many_prices_misses_once(self):
+        """Overlapping grids only price the scenarios not seen before."""
+        cache = PricingCache()
+        option = self.create_call(cache)
+        with mock.patch.object(
+                option, '_npv_many', wraps=option._npv_many
+        ) as npv_many:
+            option.price_many([90., 100., 100.], 0.2, 0.03, 0)
+            ret = option.price_many([100., 110.], 0.2, 0.03, 0)
+        self.assertEqual(npv_many.call_count, 2)
+        self.assertTrue(np.allclose(npv_many.call_args[0][0], [110.]))
+        expected_ret = self.create_call(None).price_many([100., 110.], 0.2, 0.03, 0)
+        self.assertTrue(np.allclose(ret, expected_ret))
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_quantisation(self):
+        """Inputs within the rounding grid share an NPV priced on the grid."""
+        cache = PricingCache(decimals={'spot': 2})
+        option = self.create_call(cache)
+        first = option._price(100.001, 0.2, 0.03, 0)
+        second = option._price(99.999, 0.2, 0.03, 0)
+        self.assertEqual(first, second)
+        self.assertEqual(first, self.create_call(None)._price(100, 0.2, 0.03, 0))
+
+    def test_lru_eviction(self):
+        """The least recently used entry is dropped once the cache is full."""
+        cache = PricingCache(max_size=2)
+        option = self.create_call(cache)
+        option._price(90, 0.2, 0.03, 0)
+        option._price(100, 0.2, 0.03, 0)
+        option._price(90, 0.2, 0.03, 0)
+        option._price(110, 0.2, 0.03, 0)
+        self.assertEqual(cache.evictions, 1)
+        option._price(90, 0.2, 0.03, 0)
+        option._price(100, 0.2, 0.03, 0)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
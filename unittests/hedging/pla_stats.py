@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from scipy.stats import ks_2samp, spearmanr
+from hedging.pla_stats import pla_stats_many
+
+
+class TestPlaStats(unittest.TestCase):
+
+    def test_pla_stats_many_matches_scipy(self):
+        """Batched stats agree row by row with the scipy functions."""
+        rng = np.random.default_rng(42)
+        fo_pnl = rng.normal(size=(20, 500))
+        risk_pnl = fo_pnl + rng.normal(scale=0.5, size=(20, 500))
+        # Rounding introduces plenty of ties within and across samples
+        risk_pnl[10:] = np.round(risk_pnl[10:], 1)
+        fo_pnl[10:] = np.round(fo_pnl[10:], 1)
+
+        ret = pla_stats_many(fo_pnl, risk_pnl)
+
+        for i in range(20):
+            ks_result = ks_2samp(fo_pnl[i], risk_pnl[i], method='asymp')
+            sp_result = spearmanr(fo_pnl[i], risk_pnl[i])
+            self.assertAlmostEqual(ret.ks_value[i], ks_result.statistic, places=12)
+            self.assertAlmostEqual(ret.ks_pvalue[i], ks_result.pvalue, places=12)
+            self.assertAlmostEqual(
+                ret.spearman_value[i], sp_result.correlation, places=12
+            )
+            self.assertAlmostEqual(
+                ret.spearman_pvalue[i], sp_result.pvalue, places=12
+            )
+
+    def test_pla_stats_many_shape_mismatch(self):
+        """Mismatched matrices raise a ValueError."""
+        with self.assertRaises(ValueError):
+            _ = pla_stats_many(np.zeros((2, 5)), np.zeros((3, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
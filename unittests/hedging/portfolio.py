@@ -0,0 +1,97 @@
+import unittest
+import datetime
+import numpy as np
+import QuantLib as ql
+from hedging.portfolio import EuropeanOption
+from hedging.portfolio import MarketData
+from hedging.portfolio import MarketDataSet
+from hedging.portfolio import Portfolio
+from hedging.portfolio import Stock
+
+
+class TestMarketDataSet(unittest.TestCase):
+
+    def setUp(self):
+        self.data_set = MarketDataSet(
+            asset_names=['AAPL', 'GOOG'],
+            eq_spots=[[120., 125., 110.], [100., 95., 105.]],
+            eq_vols=[0.2, 0.3],
+            rfrs=0.01
+        )
+        maturity = datetime.date.today() + datetime.timedelta(days=365)
+        self.option = EuropeanOption(
+            asset='GOOG',
+            strike=100,
+            maturity=ql.Date(maturity.day, maturity.month, maturity.year),
+            option_type=ql.Option.Call
+        )
+
+    def test_equity_lookup_rows(self):
+        """Lookups return per scenario rows without copying."""
+        ret = self.data_set.equity_lookup('GOOG')
+        self.assertTrue(np.array_equal(ret.eq_spot, [100., 95., 105.]))
+        self.assertTrue(np.array_equal(ret.eq_vol, [0.3, 0.3, 0.3]))
+        self.assertTrue(np.shares_memory(ret.eq_spot, self.data_set.eq_spots))
+
+    def test_scenario_view_prices_like_market_data(self):
+        """A scenario view prices a portfolio like the equivalent MarketData."""
+        portfolio = Portfolio()
+        portfolio.add_instrument(self.option, 10)
+        portfolio.add_instrument(Stock('GOOG'), -5)
+        ret = portfolio.npv(self.data_set.scenario(1))
+        expected_ret = portfolio.npv(MarketData(eq_spot=95., eq_vol=0.3, rfr=0.01))
+        self.assertAlmostEqual(ret, expected_ret, places=12)
+
+    def test_from_shocks(self):
+        """Shock matrices from the generators become spot scenarios."""
+        shocks = np.array([[1.1, 0.9], [1.0, 1.2]])
+        ret = MarketDataSet.from_shocks(['AAPL', 'GOOG'], [120, 100], 0.2, 0.01, shocks)
+        self.assertTrue(np.allclose(ret.eq_spots, [[132., 120.], [90., 120.]]))
+        self.assertEqual(len(ret), 2)
+
+
+class TestNpvMany(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.data_set = MarketDataSet(
+            asset_names=['AAPL', 'GOOG'],
+            eq_spots=np.array([[120], [100]]) * np.exp(0.1 * rng.normal(size=(2, 50))),
+            eq_vols=[0.2, 0.3],
+            rfrs=np.linspace(0, 0.02, 50)
+        )
+        self.portfolio = Portfolio()
+        for days, asset, strike, option_type, quantity in [
+            (365, 'AAPL', 120, ql.Option.Call, 10),
+            (180, 'GOOG', 90, ql.Option.Put, -4),
+            (30, 'GOOG', 110, ql.Option.Call, 7),
+            (-30, 'AAPL', 100, ql.Option.Call, 3),
+        ]:
+            maturity = datetime.date.today() + datetime.timedelta(days=days)
+            option = EuropeanOption(
+                asset=asset,
+                strike=strike,
+                maturity=ql.Date(maturity.day, maturity.month, maturity.year),
+                option_type=option_type
+            )
+            self.portfolio.add_instrument(option, quantity)
+        self.portfolio.add_instrument(Stock('AAPL'), -5)
+
+    def test_npv_many_matches_scenario_loop(self):
+        """Batch revaluation equals pricing each scenario separately."""
+        ret = self.portfolio.npv_many(self.data_set)
+        expected_ret = [
+            self.portfolio.npv(view) for view in self.data_set.scenarios()
+        ]
+        self.assertTrue(np.allclose(ret, expected_ret, rtol=1e-10))
+
+    def test_npv_many_per_instrument(self):
+        """Position PVs have one row per instrument and sum to the total."""
+        ret, position_pvs = self.portfolio.npv_many(self.data_set, per_instrument=True)
+        self.assertEqual(position_pvs.shape, (5, 50))
+        self.assertTrue(np.allclose(position_pvs.sum(axis=0), ret))
+        self.assertTrue(np.allclose(position_pvs[3], 0), 'Expect expired option at zero.')
+
+
+if __name__ == '__main__':
+    unittest.main()
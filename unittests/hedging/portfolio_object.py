@@ -0,0 +1,62 @@
+import unittest
+import datetime
+from hedging.portfolio_object import Portfolio
+
+
+class TestDealBook(unittest.TestCase):
+
+    def setUp(self):
+        self.start = datetime.datetime(2024, 1, 1)
+        self.portfolio = Portfolio()
+        for day, instrument, counterparty, quantity in [
+            (3, 'AAPL', 'BankA', 10),
+            (1, 'GOOG', 'BankB', 5),
+            (2, 'AAPL', 'BankB', -3),
+            (5, 'GOOG', 'BankA', 7),
+            (4, 'AAPL', 'BankC', 0),
+        ]:
+            self.portfolio.create_deal(
+                instrument=instrument,
+                quantity=quantity,
+                counterparty=counterparty,
+                creation_time=self.start + datetime.timedelta(days=day)
+            )
+
+    def test_zero_quantity_deal_removed(self):
+        """create_deal drops zero quantity deals from the book and indexes."""
+        self.assertEqual(len(self.portfolio.deals), 4)
+        self.assertEqual(self.portfolio.deals_with_counterparty('BankC'), [])
+        self.assertEqual(len(self.portfolio.deals_created_between()), 4)
+
+    def test_index_lookups(self):
+        """Counterparty and instrument lookups return the matching deals."""
+        ret = self.portfolio.deals_with_counterparty('BankB')
+        self.assertEqual([deal.quantity for deal in ret], [5, -3])
+        ret = self.portfolio.deals_on_instrument('AAPL')
+        self.assertEqual([deal.quantity for deal in ret], [10, -3])
+
+    def test_creation_time_range(self):
+        """Range queries are half open and ordered by creation time."""
+        ret = self.portfolio.deals_created_between(
+            self.start + datetime.timedelta(days=2),
+            self.start + datetime.timedelta(days=5)
+        )
+        self.assertEqual([deal.quantity for deal in ret], [-3, 10])
+
+    def test_remove_keeps_indexes_consistent(self):
+        """Removing by id updates every index."""
+        deal = self.portfolio.deals_with_counterparty('BankA')[0]
+        self.portfolio.remove_deal(deal_id=deal.deal_id)
+        self.assertEqual(
+            [d.quantity for d in self.portfolio.deals_with_counterparty('BankA')], [7]
+        )
+        self.assertEqual(
+            [d.quantity for d in self.portfolio.deals_on_instrument('AAPL')], [-3]
+        )
+        self.assertNotIn(deal, self.portfolio.deals_created_between())
+        with self.assertRaises(KeyError):
+            self.portfolio.remove_deal(deal=deal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import datetime
+import numpy as np
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+from hedging.options import EuropeanPutOption
+from hedging.pricing_grid import CHEBYSHEV
+from hedging.pricing_grid import PCHIP
+from hedging.pricing_grid import PricingGrid
+
+
+class TestPricingGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.option = EuropeanPutOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+        self.spots = np.linspace(60, 150, 200)
+
+    def test_chebyshev_spot_grid(self):
+        """Chebyshev grid prices within its reported error bound."""
+        grid = self.option.pricing_grid(
+            (50, 160), vol=0.2, method=CHEBYSHEV, tolerance=1e-6
+        )
+        ret = grid.price_many(self.spots)
+        expected_ret = self.option.price_many(self.spots, 0.2, 0.02, 0)
+        self.assertLess(grid.error_bound, 1e-6)
+        self.assertLess(np.max(np.abs(ret - expected_ret)), grid.error_bound)
+
+    def test_spot_vol_grid(self):
+        """Two dimensional grids interpolate over vol as well."""
+        vols = np.linspace(0.15, 0.35, 200)
+        expected_ret = self.option.price_many(self.spots, vols, 0.02, 0)
+        for method in [CHEBYSHEV, PCHIP]:
+            grid = self.option.pricing_grid(
+                (50, 160), vol_range=(0.15, 0.35), method=method,
+                max_nodes=33
+            )
+            ret = grid.price_many(self.spots, vols)
+            self.assertTrue(
+                np.allclose(ret, expected_ret, atol=0.01),
+                f'Expect {method} grid prices close to the engine.'
+            )
+
+    def test_pchip_is_monotone(self):
+        """PCHIP keeps a call's price increasing in spot."""
+        call = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=30),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+        grid = call.pricing_grid((50, 160), vol=0.05, method=PCHIP, max_nodes=17)
+        ret = grid.price_many(np.linspace(50, 160, 2000))
+        self.assertTrue(np.all(np.diff(ret) >= 0))
+
+    def test_refinement_reuses_nodes(self):
+        """Doubling the grid only prices the new nodes."""
+        grid = PricingGrid(
+            self.option, (50, 160), vol=0.2, initial_nodes=9, max_nodes=17,
+            tolerance=0
+        )
+        self.assertEqual(grid.n_evaluations, 17)
+        self.assertEqual(len(grid.spot_nodes), 17)
+
+    def test_outside_grid(self):
+        """Scenarios outside the grid are rejected rather than extrapolated."""
+        grid = self.option.pricing_grid((80, 120), vol=0.2, max_nodes=9)
+        with self.assertRaises(ValueError):
+            grid.price_many([70, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import datetime
+import numpy as np
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+from hedging.pricing_session import PricingSession
+
+
+class TestPricingSession(unittest.TestCase):
+
+    def setUp(self):
+        self.option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=180),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+
+    def test_session_matches_price(self):
+        """Repricing by mutating quotes matches a freshly built process."""
+        session = PricingSession(self.option)
+        scenarios = [(90, 0.1, 0.01, 0), (100, 0.2, 0.03, 0.01), (120, 0.3, 0, 0.02)]
+        for spot, vol, rfr, div in scenarios:
+            self.assertAlmostEqual(
+                session.price(spot, vol, rfr, div),
+                self.option._price(spot=spot, vol=vol, rfr=rfr, div=div),
+                places=10
+            )
+
+    def test_session_price_many_shape(self):
+        """price_many broadcasts scalar inputs against spot arrays."""
+        session = self.option.pricing_session()
+        spots = np.array([[90., 100.], [110., 120.]])
+        ret = session.price_many(spots, 0.2, 0.02, 0)
+        self.assertEqual(ret.shape, (2, 2), 'Expect broadcast output shape.')
+        self.assertTrue(
+            np.allclose(ret, self.option.price_many(spots, 0.2, 0.02, 0))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import datetime
+import numpy as np
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+from hedging import scenario_executor
+from hedging.options import PricingCache
+from hedging.scenario_executor import ScenarioExecutor
+
+
+class TestScenarioExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.MONTE_CARLO,
+            mc_params={'steps': 5, 'num_paths': 500, 'rng': 'pseudorandom'}
+        )
+        self.spots = np.linspace(80, 120, 23)
+
+    def test_parallel_matches_serial(self):
+        """Per scenario seeds make results independent of workers and batching."""
+        serial = ScenarioExecutor(self.option, n_workers=1, batch_size=23)
+        expected_ret = serial.revalue(self.spots, 0.2, 0.02, 0)
+        with ScenarioExecutor(self.option, n_workers=2, batch_size=4) as executor:
+            ret = executor.revalue(self.spots, 0.2, 0.02, 0)
+        self.assertTrue(np.array_equal(ret, expected_ret), 'Expect equal prices.')
+
+    def test_option_not_mutated(self):
+        """Reseeding happens on the executor's copy of the option."""
+        ScenarioExecutor(self.option, n_workers=1).revalue(self.spots, 0.2, 0.02, 0)
+        self.assertNotIn('seed', self.option.mc_params)
+
+    def test_serial_session_kept_on_executor(self):
+        """Serial revaluation reuses the executor's session, not a global."""
+        executor = ScenarioExecutor(self.option, n_workers=1)
+        executor.revalue(self.spots, 0.2, 0.02, 0)
+        session = executor._session
+        executor.revalue(self.spots, 0.2, 0.02, 0)
+        self.assertIs(executor._session, session)
+        self.assertIsNone(scenario_executor._worker_session)
+
+    def test_deterministic_engine_not_rebuilt(self):
+        """Only Monte Carlo engines are reseeded and rebuilt per scenario."""
+        option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.ANALYTICAL,
+            pricing_cache=PricingCache()
+        )
+        executor = ScenarioExecutor(option, n_workers=1)
+        self.assertIsNone(executor.option.pricing_cache)
+        executor.revalue(self.spots, 0.2, 0.02, 0)
+        engine = executor._session.engine
+        executor.revalue(self.spots, 0.2, 0.02, 0)
+        self.assertIs(executor._session.engine, engine)
+        self.assertNotIn('seed', executor.option.mc_params)
+        self.assertIsNotNone(option.pricing_cache)
+
+    def test_numpy_monte_carlo(self):
+        """NumPy MC options revalue through the session's vectorised path."""
+        option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.NUMPY_MONTE_CARLO,
+            mc_params={'steps': 1, 'num_paths': 2000, 'rng': 'pseudorandom', 'seed': 7}
+        )
+        expected_ret = option.price_many(self.spots, 0.2, 0.02, 0)
+        session_ret = option.pricing_session().price_many(self.spots, 0.2, 0.02, 0)
+        ret = ScenarioExecutor(option, n_workers=1, batch_size=5).revalue(
+            self.spots, 0.2, 0.02, 0
+        )
+        np.testing.assert_allclose(session_ret, expected_ret)
+        np.testing.assert_allclose(ret, expected_ret)
+
+    def test_unseeded_numpy_monte_carlo_workers_share_normals(self):
+        """Workers price an unseeded NumPy MC option off the same normals."""
+        option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.NUMPY_MONTE_CARLO,
+            mc_params={'steps': 1, 'num_paths': 2000, 'rng': 'pseudorandom'}
+        )
+        spots = np.full(16, 100.0)
+        expected_ret = ScenarioExecutor(option, n_workers=1).revalue(
+            spots, 0.2, 0.02, 0
+        )
+        with ScenarioExecutor(option, n_workers=4, batch_size=4) as executor:
+            ret = executor.revalue(spots, 0.2, 0.02, 0)
+        self.assertTrue(np.array_equal(ret, expected_ret), 'Expect equal prices.')
+        with ScenarioExecutor(
+                option, n_workers=4, batch_size=4, base_seed=None
+        ) as executor:
+            ret = executor.revalue(spots, 0.2, 0.02, 0)
+        self.assertTrue(np.all(ret == ret[0]), 'Expect common random numbers.')
+        self.assertNotIn('seed', option.mc_params)
+
+
+if __name__ == '__main__':
+    unittest.main()
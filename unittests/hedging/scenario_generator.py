@@ -2,6 +2,10 @@ import unittest
 from unittest import mock
 import numpy as np
 from hedging.scenario_generator import generate_log_normal_shocks
+from hedging.scenario_generator import generate_correlated_log_normal_shocks
+from hedging.scenario_generator import SHOCK_METHODS, ANTITHETIC, LATIN_HYPERCUBE
+from hedging.scenario_generator import generate_gbm_paths, iter_gbm_paths
+from scipy.special import ndtr
 
 
 class TestScenarioGeneration(unittest.TestCase):
@@ -50,7 +54,123 @@ class TestScenarioGeneration(unittest.TestCase):
             np.allclose(ret, expected_ret), "Expect equal numpy arrays."
         )
 
+    def test_seeded_pseudorandom_shocks_repeat(self):
+        """A seed makes pseudorandom shocks reproducible."""
+        ret = generate_log_normal_shocks(vol=0.2, num_shocks=50, seed=7)
+        expected_ret = generate_log_normal_shocks(vol=0.2, num_shocks=50, seed=7)
+        self.assertTrue(np.array_equal(ret, expected_ret), 'Expect equal shocks.')
 
+    def test_correlated_shocks_statistics(self):
+        """Log shocks recover the requested vols and correlation."""
+        vols = np.array([0.2, 0.3])
+        corr = np.array([[1, 0.3], [0.3, 1]])
+        ret = generate_correlated_log_normal_shocks(
+            vols, corr, num_shocks=200000, block_size=30000, seed=1
+        )
+        log_ret = np.log(ret)
+        self.assertEqual(ret.shape, (200000, 2), "Expect one column per asset.")
+        self.assertTrue(np.allclose(log_ret.std(axis=0), vols, rtol=0.01))
+        self.assertAlmostEqual(np.corrcoef(log_ret.T)[0, 1], 0.3, places=2)
+
+    def test_correlated_shocks_block_size_invariant(self):
+        """Blocking only bounds memory, it does not change the shocks."""
+        vols = [0.1, 0.2, 0.3]
+        corr = np.eye(3)
+        ret = generate_correlated_log_normal_shocks(
+            vols, corr, num_shocks=1000, block_size=7, seed=5
+        )
+        expected_ret = generate_correlated_log_normal_shocks(
+            vols, corr, num_shocks=1000, block_size=1000, seed=5
+        )
+        self.assertTrue(np.array_equal(ret, expected_ret))
+
+    def test_correlated_shocks_singular_correlation(self):
+        """Perfectly correlated assets are repaired, not rejected."""
+        corr = np.ones((3, 3))
+        ret = generate_correlated_log_normal_shocks(
+            [0.2, 0.2, 0.2], corr, num_shocks=1000, seed=2
+        )
+        self.assertTrue(np.all(np.isfinite(ret)))
+        self.assertTrue(np.allclose(ret[:, 0], ret[:, 2], rtol=1e-3))
+
+    def test_correlated_shocks_bad_inputs(self):
+        """Negative vols and malformed correlations raise."""
+        with self.assertRaises(TypeError):
+            _ = generate_correlated_log_normal_shocks([-0.1, 0.2], np.eye(2))
+        with self.assertRaises(ValueError):
+            _ = generate_correlated_log_normal_shocks(
+                [0.1, 0.2], [[1, 0.5], [0.2, 1]]
+            )
+
+    def test_generate_log_normal_shocks_methods(self):
+        """Every sampling method produces the requested number of shocks with
+        the right vol."""
+        for method in SHOCK_METHODS:
+            ret = generate_log_normal_shocks(
+                vol=0.2, num_shocks=4096, method=method, seed=11
+            )
+            self.assertEqual(len(ret), 4096, f"Expect 4096 shocks for {method}.")
+            self.assertAlmostEqual(np.log(ret).std(), 0.2, delta=0.01)
+
+    def test_no_shocks(self):
+        """Zero shocks give an empty vector for every method and seed."""
+        for method in SHOCK_METHODS:
+            for seed in [None, 5]:
+                ret = generate_log_normal_shocks(
+                    vol=0.2, num_shocks=0, method=method, seed=seed
+                )
+                self.assertEqual(ret.shape, (0,), f"Expect no shocks for {method}.")
+
+    def test_antithetic_shocks_are_paired(self):
+        """Antithetic log shocks cancel exactly in pairs."""
+        ret = generate_log_normal_shocks(vol=0.3, num_shocks=100, method=ANTITHETIC)
+        log_ret = np.log(ret)
+        self.assertTrue(np.allclose(log_ret[:50], -log_ret[50:]))
+
+    def test_latin_hypercube_shocks_are_stratified(self):
+        """Exactly one shock falls in each equal probability stratum."""
+        ret = generate_log_normal_shocks(
+            vol=1, num_shocks=500, method=LATIN_HYPERCUBE, seed=3
+        )
+        strata = np.floor(ndtr(np.log(ret)) * 500).astype(int)
+        self.assertTrue(np.array_equal(np.sort(strata), np.arange(500)))
+
+    def test_unknown_shock_method(self):
+        """Unknown sampling methods are not implemented."""
+        with self.assertRaises(NotImplementedError):
+            _ = generate_log_normal_shocks(vol=0.1, method='Test')
+
+    def test_gbm_paths_zero_vol(self):
+        """Without vol paths grow deterministically at the drift."""
+        ret = generate_gbm_paths(
+            spot=100, vol=0, n_paths=3, n_steps=4, drift=0.05, dt=0.25
+        )
+        expected_ret = 100 * np.exp(0.05 * 0.25 * np.arange(1, 5))
+        self.assertEqual(ret.shape, (3, 4), "Expect (n_paths, n_steps) paths.")
+        self.assertTrue(np.allclose(ret, np.tile(expected_ret, (3, 1))))
+
+    def test_gbm_paths_martingale(self):
+        """Discounted terminal prices average to the spot."""
+        ret = generate_gbm_paths(
+            spot=100, vol=0.3, n_paths=100000, n_steps=12, drift=0.02,
+            dt=1 / 12, seed=4
+        )
+        self.assertAlmostEqual(
+            np.exp(-0.02) * ret[:, -1].mean(), 100, delta=0.5
+        )
+
+    def test_gbm_paths_float32_chunks(self):
+        """Chunked float32 output matches the float64 paths."""
+        expected_ret = generate_gbm_paths(
+            spot=100, vol=0.2, n_paths=1000, n_steps=50, seed=9
+        )
+        chunks = list(iter_gbm_paths(
+            spot=100, vol=0.2, n_paths=1000, n_steps=50, dtype=np.float32,
+            chunk_size=300, seed=9
+        ))
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+        self.assertEqual(chunks[0].dtype, np.float32)
+        self.assertTrue(np.allclose(np.concatenate(chunks), expected_ret, rtol=1e-6))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,59 @@
+import unittest
+import datetime
+import numpy as np
+from hedging import pla_stats
+from hedging.black_scholes import Greeks
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+from hedging.sensitivity_pnl import SensitivityPnlModel
+from hedging.sensitivity_pnl import explain_error
+
+
+class TestSensitivityPnl(unittest.TestCase):
+
+    def setUp(self):
+        self.option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+        self.spots = 100 * np.exp(
+            0.02 * np.random.default_rng(0).standard_normal(500)
+        )
+
+    def test_taylor_expansion(self):
+        """P&L is the delta-gamma-vega-rho-theta polynomial in the moves."""
+        model = SensitivityPnlModel(
+            Greeks(delta=0.5, gamma=0.02, vega=40, theta=-5, rho=30),
+            spot=100, vol=0.2, rfr=0.03, quantity=2
+        )
+        ret = model.pnl([110, 90], vols=[0.25, 0.2], rfrs=0.03, horizon=0.1)
+        expected_ret = 2 * np.array([
+            0.5 * 10 + 0.01 * 100 + 40 * 0.05 - 0.5,
+            -0.5 * 10 + 0.01 * 100 - 0.5
+        ])
+        self.assertTrue(np.allclose(ret, expected_ret))
+
+    def test_explains_small_moves(self):
+        """Delta-gamma P&L explains nearly all of a full revaluation."""
+        model = SensitivityPnlModel.from_option(self.option, 100, 0.2, 0.03, 0)
+        full_pnl = (
+            self.option.price_many(self.spots, 0.2, 0.03, 0)
+            - self.option._price(100, 0.2, 0.03, 0)
+        )
+        ret = model.explain(full_pnl, self.spots)
+        self.assertLess(ret.unexplained_fraction, 1e-4)
+        self.assertLess(ret.max_abs_error, 0.05)
+
+        results = pla_stats.pla_stats(full_pnl, model.pnl(self.spots))
+        self.assertGreater(results.spearman_value, 0.999)
+
+    def test_explain_shape_mismatch(self):
+        """P&L vectors of different lengths are rejected."""
+        with self.assertRaises(ValueError):
+            explain_error(np.zeros(3), np.zeros(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
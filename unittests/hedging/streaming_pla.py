@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+from scipy.stats import ks_2samp, spearmanr
+from hedging.streaming_pla import PlaAccumulator
+from hedging.streaming_pla import streaming_pla_stats
+
+
+def chunked(fo_pnl, risk_pnl, chunk_size):
+    def source():
+        for start in range(0, len(fo_pnl), chunk_size):
+            yield fo_pnl[start:start + chunk_size], risk_pnl[start:start + chunk_size]
+    return source
+
+
+class TestStreamingPla(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.fo_pnl = np.round(rng.normal(size=20000), 2)
+        self.risk_pnl = np.round(
+            self.fo_pnl + rng.normal(scale=0.3, size=20000), 2
+        )
+
+    def test_exact_when_sketch_not_compacted(self):
+        """With enough capacity the streamed stats equal the scipy stats."""
+        ret = streaming_pla_stats(
+            chunked(self.fo_pnl, self.risk_pnl, 3000), capacity=50000
+        )
+        ks_result = ks_2samp(self.fo_pnl, self.risk_pnl, method='asymp')
+        sp_result = spearmanr(self.fo_pnl, self.risk_pnl)
+        self.assertEqual(ret.ks_error_bound, 0, 'Expect exact KS.')
+        self.assertAlmostEqual(ret.ks_value, ks_result.statistic, places=12)
+        self.assertAlmostEqual(ret.ks_pvalue, ks_result.pvalue, places=10)
+        self.assertAlmostEqual(ret.spearman_value, sp_result.correlation, places=10)
+
+    def test_compacted_within_error_bound(self):
+        """Small sketches stay within their reported error bounds."""
+        ret = streaming_pla_stats(
+            chunked(self.fo_pnl, self.risk_pnl, 1000), capacity=256, seed=1
+        )
+        ks_result = ks_2samp(self.fo_pnl, self.risk_pnl)
+        sp_result = spearmanr(self.fo_pnl, self.risk_pnl)
+        self.assertGreater(ret.ks_error_bound, 0, 'Expect sketch compaction.')
+        self.assertLessEqual(
+            abs(ret.ks_value - ks_result.statistic), ret.ks_error_bound
+        )
+        self.assertLess(
+            abs(ret.spearman_value - sp_result.correlation),
+            6 * ret.rank_error_bound
+        )
+
+    def test_merge_matches_single_accumulator(self):
+        """Accumulators from two workers merge into the single stream result."""
+        single = PlaAccumulator(capacity=50000)
+        single.update(self.fo_pnl, self.risk_pnl)
+        first = PlaAccumulator(capacity=50000)
+        first.update(self.fo_pnl[:7000], self.risk_pnl[:7000])
+        second = PlaAccumulator(capacity=50000)
+        second.update(self.fo_pnl[7000:], self.risk_pnl[7000:])
+        merged = first.merge(second)
+        self.assertEqual(merged.ks(), single.ks())
+
+    def test_two_pass_merge_matches_scipy(self):
+        """Workers merge sketches, rank against them and merge the ranks."""
+        halves = [slice(0, 7000), slice(7000, None)]
+        workers = []
+        for half in halves:
+            accumulator = PlaAccumulator(capacity=50000)
+            accumulator.update(self.fo_pnl[half], self.risk_pnl[half])
+            workers.append(accumulator)
+        merged = workers[0].merge(workers[1])
+        rank_accumulators = []
+        for half in halves:
+            rank_accumulator = merged.rank_accumulator()
+            rank_accumulator.update(self.fo_pnl[half], self.risk_pnl[half])
+            rank_accumulators.append(rank_accumulator)
+        rho, _ = rank_accumulators[0].merge(rank_accumulators[1]).spearman()
+        sp_result = spearmanr(self.fo_pnl, self.risk_pnl)
+        self.assertAlmostEqual(rho, sp_result.correlation, places=10)
+
+    def test_source_must_replay(self):
+        """One-shot generators and empty sources are rejected."""
+        chunks = chunked(self.fo_pnl, self.risk_pnl, 1000)()
+        with self.assertRaises(TypeError):
+            streaming_pla_stats(chunks)
+        with self.assertRaises(ValueError):
+            streaming_pla_stats(lambda: chunks)
+        with self.assertRaises(ValueError):
+            streaming_pla_stats(lambda: iter([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import datetime
+import os
+import subprocess
+import sys
+import time
+import unittest
+import numpy as np
+from hedging import tracing
+from hedging.options import EuropeanCallOption
+from hedging.options import EuropeanOption
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@tracing.traced()
+def inner():
+    time.sleep(0.01)
+
+
+@tracing.traced('outer')
+def outer():
+    inner()
+    inner()
+
+
+class TestTracing(unittest.TestCase):
+
+    def tearDown(self):
+        tracing.disable()
+        tracing.reset()
+
+    def test_nested_spans(self):
+        """Spans nest by path and self time excludes the child spans."""
+        with tracing.tracing():
+            outer()
+        stats = {s.path: s for s in tracing.span_stats()}
+
+        self.assertEqual(set(stats), {('outer',), ('outer', 'inner')})
+        self.assertEqual(stats[('outer',)].count, 1)
+        self.assertEqual(stats[('outer', 'inner')].count, 2)
+        self.assertGreaterEqual(stats[('outer', 'inner')].total, 0.02)
+        self.assertLess(stats[('outer',)].self_time, 0.01)
+        self.assertAlmostEqual(
+            stats[('outer',)].total,
+            stats[('outer',)].self_time + stats[('outer', 'inner')].total,
+            places=9
+        )
+
+    def test_disabled_records_nothing(self):
+        """With tracing off nothing is recorded and span is the no-op."""
+        outer()
+        with tracing.span('block'):
+            pass
+        self.assertEqual(tracing.span_stats(), [])
+        self.assertIs(tracing.span('a'), tracing.span('b'))
+
+    def test_span_closed_on_error(self):
+        """A span raising an exception is still recorded and popped."""
+        with tracing.tracing():
+            with self.assertRaises(RuntimeError):
+                with tracing.span('failing'):
+                    raise RuntimeError('boom')
+            with tracing.span('after'):
+                pass
+        paths = [s.path for s in tracing.span_stats()]
+        self.assertEqual(paths, [('after',), ('failing',)])
+
+    def test_collapsed_stacks(self):
+        """Collapsed lines are semicolon joined paths with integer weights."""
+        with tracing.tracing():
+            outer()
+        lines = tracing.collapsed_stacks()
+        self.assertEqual(len(lines), 2)
+        stack, weight = lines[1].rsplit(' ', 1)
+        self.assertEqual(stack, 'outer;inner')
+        self.assertGreaterEqual(int(weight), 20000)
+
+    def test_environment_variable(self):
+        """HEDGING_TRACE switches tracing on only for true values."""
+        script = 'from hedging import tracing; print(tracing.is_enabled())'
+        for value, expected_ret in [
+            ('1', 'True'), ('TRUE', 'True'), ('yes', 'True'),
+            ('0', 'False'), ('false', 'False'), ('', 'False')
+        ]:
+            output = subprocess.run(
+                [sys.executable, '-c', script], cwd=ROOT, check=True,
+                capture_output=True, text=True,
+                env=dict(os.environ, HEDGING_TRACE=value)
+            ).stdout.strip()
+            self.assertEqual(output, expected_ret, f'HEDGING_TRACE={value!r}')
+
+    def test_percentiles_from_bounded_histogram(self):
+        """Percentiles come from fixed size buckets within their width."""
+        durations = np.random.default_rng(0).lognormal(np.log(1e-3), 1.0, 100000)
+        record = tracing._SpanRecord()
+        for duration in durations:
+            record.add(duration, duration)
+
+        self.assertEqual(len(record.buckets), tracing.N_BUCKETS)
+        self.assertEqual(record.count, durations.size)
+        self.assertAlmostEqual(record.total, durations.sum(), places=9)
+        for q in tracing.PERCENTILES:
+            expected_ret = np.percentile(durations, q)
+            self.assertAlmostEqual(
+                record.percentile(q) / expected_ret, 1, delta=0.07
+            )
+
+    def test_option_pricing_spans(self):
+        """Pricing an option records the process, engine and NPV spans."""
+        option = EuropeanCallOption(
+            asset_name='Asset',
+            strike=100,
+            maturity=datetime.date.today() + datetime.timedelta(days=365),
+            pricing_engine=EuropeanOption.ANALYTICAL
+        )
+        with tracing.tracing():
+            option._price(spot=100, vol=0.2, rfr=0.02, div=0)
+        paths = {s.path for s in tracing.span_stats()}
+        self.assertEqual(paths, {
+            ('price',),
+            ('price', 'bsm_process'),
+            ('price', 'option_model'),
+            ('price', 'NPV')
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()